@@ -3,6 +3,7 @@ import pandas as pd
 import os
 
 from risk_allocator.apply_allocator import apply_risk_allocator
+from scripts.returns_panel import return_matrix
 
 
 # =====================================================
@@ -18,17 +19,7 @@ def run_portfolio_backtest(returns_df, portfolio_stocks):
     # -----------------------------------
     # Create return matrix
     # -----------------------------------
-    portfolio_df = (
-        returns_df[
-            returns_df["Ticker"].isin(portfolio_stocks)
-        ]
-        .pivot(
-            index="Date",
-            columns="Ticker",
-            values="log_return"
-        )
-        .dropna()
-    )
+    portfolio_df = return_matrix(returns_df, portfolio_stocks).dropna()
 
     # -----------------------------------
     # Rolling volatility (proxy for GARCH)
@@ -174,9 +165,13 @@ def save_portfolio_outputs(metrics_dict, output_dir="phase4_outputs"):
 # RUN AS SCRIPT (PIPELINE SUPPORT)
 # =====================================================
 
-if __name__ == "__main__":
+def main(returns_df=None):
+    """
+    Baseline portfolio run (saves performance + equity CSVs).
+    The pipeline passes the loaded returns in; standalone runs load them.
+    """
 
-    from scripts.preprocess import load_returns_data
+    from scripts.returns_panel import load_returns_matrix
 
     portfolio_stocks = [
         "INFY.NS", "TCS.NS", "RELIANCE.NS", "HDFCBANK.NS",
@@ -184,7 +179,8 @@ if __name__ == "__main__":
         "AXISBANK.NS", "HINDUNILVR.NS"
     ]
 
-    returns_df = load_returns_data()
+    if returns_df is None:
+        returns_df = load_returns_matrix(portfolio_stocks)
 
     portfolio_df, port_ret, port_eq, risk_summary = run_portfolio_backtest(
         returns_df,
@@ -225,3 +221,8 @@ if __name__ == "__main__":
 
     print("Baseline portfolio equity saved → outputs/final/portfolio_equity.csv")
 
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@ import numpy as np
 import pandas as pd
 import os
 
-from regime.volatility_regime import detect_volatility_regime
-from regime.regime_rules import regime_position_multiplier
+from regime.volatility_regime import detect_volatility_regime_panel
+from regime.regime_rules import regime_multiplier
+from scripts.returns_panel import return_matrix
 
 
 # =====================================================
@@ -23,12 +24,7 @@ def run_portfolio_regime_backtest(
     # -----------------------------------
     # STEP 1: Return matrix
     # -----------------------------------
-    ret_df = (
-        returns_df
-        .loc[returns_df["Ticker"].isin(portfolio_stocks)]
-        .pivot(index="Date", columns="Ticker", values="log_return")
-        .sort_index()
-    )
+    ret_df = return_matrix(returns_df, portfolio_stocks)
 
     # -----------------------------------
     # STEP 2: Rolling volatility (lagged)
@@ -43,10 +39,12 @@ def run_portfolio_regime_backtest(
     # -----------------------------------
     # STEP 3: Volatility regime
     # -----------------------------------
-    regime_df = vol_df.apply(detect_volatility_regime)
+    regime_df = detect_volatility_regime_panel(vol_df)
 
-    multiplier_df = regime_df.apply(
-        lambda col: col.map(regime_position_multiplier)
+    multiplier_df = pd.DataFrame(
+        regime_multiplier(regime_df.to_numpy()),
+        index=regime_df.index,
+        columns=regime_df.columns
     )
 
     # -----------------------------------
@@ -65,36 +63,7 @@ def run_portfolio_regime_backtest(
     # -----------------------------------
     # STEP 5: DAILY FALLBACK LOGIC (KEY FIX)
     # -----------------------------------
-    portfolio_returns = []
-
-    for date in ret_df.index:
-        returns_today = ret_df.loc[date]
-        weights_today = weights.loc[date]
-
-        # valid assets today
-        valid = (~returns_today.isna()) & (~weights_today.isna())
-
-        if valid.sum() >= 2:
-            # use regime-aware weights
-            w = weights_today[valid]
-            r = returns_today[valid]
-            w = w / w.sum()
-            port_ret = (w * r).sum()
-        else:
-            # FALLBACK: equal weight
-            r = returns_today.dropna()
-            if len(r) == 0:
-                continue
-            port_ret = r.mean()
-
-        portfolio_returns.append((date, port_ret))
-
-    # -----------------------------------
-    # STEP 6: Portfolio series
-    # -----------------------------------
-    port_ret = pd.Series(
-        dict(portfolio_returns)
-    ).sort_index()
+    port_ret = _daily_portfolio_returns(ret_df, weights)
 
     # ================================
     # RISK-CONSTRAINED ALLOCATOR
@@ -126,6 +95,45 @@ def run_portfolio_regime_backtest(
 
 
 
+def _daily_portfolio_returns(ret_df, weights):
+    """
+    Portfolio return per date: regime-aware weights renormalised over
+    the assets with both a return and a weight, or an equal-weight
+    fallback on dates with fewer than two such assets. Dates without
+    any return are dropped.
+    """
+
+    returns = ret_df.to_numpy(dtype=np.float64)
+    weights = (
+        weights
+        .reindex(index=ret_df.index, columns=ret_df.columns)
+        .to_numpy(dtype=np.float64)
+    )
+
+    has_return = ~np.isnan(returns)
+    valid = has_return & ~np.isnan(weights)
+
+    returns = np.where(has_return, returns, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # use regime-aware weights
+        w = np.where(valid, weights, 0.0)
+        w = w / w.sum(axis=1, keepdims=True)
+        weighted = (w * np.where(valid, returns, 0.0)).sum(axis=1)
+
+        # FALLBACK: equal weight
+        n_returns = has_return.sum(axis=1)
+        equal = returns.sum(axis=1) / n_returns
+
+    port_ret = np.where(valid.sum(axis=1) >= 2, weighted, equal)
+    keep = n_returns > 0
+
+    return pd.Series(
+        port_ret[keep],
+        index=ret_df.index[keep].rename(None)
+    ).sort_index()
+
+
 # =====================================================
 # PERFORMANCE METRICS
 # =====================================================
@@ -162,11 +170,13 @@ def portfolio_metrics(portfolio_returns, portfolio_equity):
 # RUN SCRIPT
 # =====================================================
 
-if __name__ == "__main__":
-
-    from scripts.preprocess import load_returns_data
+def main(returns_df=None):
+    """
+    Regime-aware portfolio run (saves equity, metrics and
+    risk allocator CSVs).
+    """
 
-    returns_df = load_returns_data()
+    from scripts.returns_panel import load_returns_matrix
 
     portfolio_stocks = [
         "INFY.NS", "TCS.NS", "RELIANCE.NS", "HDFCBANK.NS",
@@ -174,6 +184,9 @@ if __name__ == "__main__":
         "AXISBANK.NS", "HINDUNILVR.NS"
     ]
 
+    if returns_df is None:
+        returns_df = load_returns_matrix(portfolio_stocks)
+
     port_ret, port_eq, risk_summary = run_portfolio_regime_backtest(
         returns_df,
         portfolio_stocks
@@ -227,3 +240,9 @@ if __name__ == "__main__":
     )
 
     print(" Risk allocator summary saved → outputs/final/portfolio_regime_risk_allocator.csv")
+
+    return metrics, risk_summary
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
-from regime.volatility_regime import detect_volatility_regime
-from regime.regime_rules import regime_position_multiplier
-from strategy.return_vol_signal import compute_return_vol_signal
+from regime.volatility_regime import (
+    detect_volatility_regime,
+    detect_volatility_regime_panel,
+    regime_categorical
+)
+from regime.regime_rules import regime_multiplier
+from strategy.return_vol_signal import (
+    compute_return_vol_signal,
+    return_vol_signal_panel
+)
+from scripts.returns_universe import ticker_frame
 
 
 # -------------------------------------------------
@@ -24,16 +32,15 @@ def run_single_asset_backtest(
     """
     Volatility + Regime + Return/Vol based strategy
     (NO look-ahead, production safe)
+
+    returns_df may also be a ReturnsUniverse.
     """
 
     # -----------------------------------
     # STEP 1: Prepare returns
     # -----------------------------------
     backtest_df = (
-        returns_df.loc[
-            returns_df["Ticker"] == stock,
-            ["Date", "log_return"]
-        ]
+        ticker_frame(returns_df, stock)[["Date", "log_return"]]
         .dropna()
         .reset_index(drop=True)
     )
@@ -68,8 +75,8 @@ def run_single_asset_backtest(
         backtest_df["Vol_Lag"]
     )
 
-    backtest_df["Regime_Multiplier"] = backtest_df["Vol_Regime"].apply(
-        regime_position_multiplier
+    backtest_df["Regime_Multiplier"] = regime_multiplier(
+        backtest_df["Vol_Regime"]
     )
 
     backtest_df["Position_Size"] *= backtest_df["Regime_Multiplier"]
@@ -112,6 +119,171 @@ def run_single_asset_backtest(
     return backtest_df
 
 
+# -------------------------------------------------
+# PANEL BACKTEST (ALL TICKERS AT ONCE)
+# -------------------------------------------------
+#
+# run_single_asset_backtest drops a ticker's missing returns before
+# shifting / rolling, so here every column's observed rows are first
+# packed to the top (stable, NaN padding below). Shifts, rolling
+# windows and cumprods along the packed axis then see exactly the
+# per-ticker series; results are scattered back to their dates.
+
+PANEL_FIELDS = (
+    "log_return",
+    "Forecasted_Volatility",
+    "Vol_Lag",
+    "Position_Size",
+    "Vol_Regime",
+    "Regime_Multiplier",
+    "Exp_Return",
+    "RV_Signal",
+    "Signal",
+    "Strategy_Return",
+    "Buy_Hold_Return",
+    "Strategy_Equity",
+    "Buy_Hold_Equity"
+)
+
+
+def _shift(values):
+    shifted = np.full_like(values, np.nan)
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _cumprod(values):
+    # pandas' cumprod: NaN rows stay NaN and are skipped
+    equity = np.nancumprod(values, axis=0)
+    equity[np.isnan(values)] = np.nan
+    return equity
+
+
+def run_single_asset_panel_backtest(
+    returns,
+    forecasted_vol,
+    target_vol=0.01
+):
+    """
+    run_single_asset_backtest for every ticker of a (dates x
+    tickers) returns frame in one vectorised pass.
+
+    Parameters
+    ----------
+    returns : pd.DataFrame
+        Log returns, NaN where a ticker has no return.
+    forecasted_vol : pd.DataFrame
+        Forecasted volatility on the same dates and tickers.
+
+    Returns
+    -------
+    pd.DataFrame
+        (field, ticker) columns, one field per column of the single
+        asset backtest (PANEL_FIELDS); rows that backtest drops are
+        NaN.
+    """
+
+    tickers = returns.columns
+    forecasted_vol = forecasted_vol.reindex_like(returns)
+
+    observed = returns.notna().to_numpy()
+
+    # -----------------------------------
+    # Pack each ticker's observed rows
+    # -----------------------------------
+    order = np.argsort(~observed, axis=0, kind="stable")
+
+    def pack(frame):
+        return np.take_along_axis(
+            frame.to_numpy(dtype=np.float64), order, axis=0
+        )
+
+    log_return = pack(returns)
+    vol = pack(forecasted_vol)
+
+    # -----------------------------------
+    # Position sizing and regimes (lagged)
+    # -----------------------------------
+    vol_lag = _shift(vol)
+
+    position = np.clip(target_vol / vol_lag, 0.1, 2.0)
+
+    regimes = detect_volatility_regime_panel(vol_lag).to_numpy()
+    multiplier = regime_multiplier(regimes)
+
+    position = position * multiplier
+
+    # -----------------------------------
+    # Return / Volatility signal (lagged)
+    # -----------------------------------
+    exp_return, rv_signal = return_vol_signal_panel(
+        pd.DataFrame(log_return), pd.DataFrame(vol)
+    )
+    exp_return = exp_return.to_numpy()
+    rv_signal = rv_signal.to_numpy()
+
+    signal = np.where(_shift(rv_signal) > 0, 1, 0)
+
+    # -----------------------------------
+    # Strategy returns and equity
+    # -----------------------------------
+    strategy_return = signal * position * log_return
+
+    fields = {
+        "log_return": log_return,
+        "Forecasted_Volatility": vol,
+        "Vol_Lag": vol_lag,
+        "Position_Size": position,
+        "Vol_Regime": regimes,
+        "Regime_Multiplier": multiplier,
+        "Exp_Return": exp_return,
+        "RV_Signal": rv_signal,
+        "Signal": signal,
+        "Strategy_Return": strategy_return,
+        "Buy_Hold_Return": log_return,
+        "Strategy_Equity": _cumprod(1 + strategy_return),
+        "Buy_Hold_Equity": _cumprod(1 + log_return)
+    }
+
+    # rows the single asset backtest keeps (its final dropna)
+    packed_rows = np.sort(observed, axis=0)[::-1]
+    kept = packed_rows.copy()
+    for values in fields.values():
+        if values.dtype.kind == "f":
+            kept &= ~np.isnan(values)
+
+    # -----------------------------------
+    # Scatter back to dates
+    # -----------------------------------
+    def unpack(values, missing):
+        values = np.where(kept, values, missing)
+        out = np.empty_like(values)
+        np.put_along_axis(out, order, values, axis=0)
+        return out
+
+    frames = {}
+
+    for field, values in fields.items():
+        if field == "Vol_Regime":
+            codes = unpack(regimes, -1)
+            frames[field] = pd.DataFrame(
+                {
+                    ticker: regime_categorical(codes[:, i])
+                    for i, ticker in enumerate(tickers)
+                },
+                index=returns.index
+            )
+            continue
+
+        frames[field] = pd.DataFrame(
+            unpack(values.astype(np.float64), np.nan),
+            index=returns.index,
+            columns=tickers
+        )
+
+    return pd.concat(frames, axis=1, names=["Field", "Ticker"])
+
+
 # -------------------------------------------------
 # PERFORMANCE METRICS
 # -------------------------------------------------
@@ -153,6 +325,39 @@ def compute_performance_metrics(backtest_df):
     })
 
 
+def compute_panel_metrics(panel):
+    """
+    compute_performance_metrics for every ticker of a
+    run_single_asset_panel_backtest panel; one row per ticker.
+    """
+
+    trading_days = 252
+    eps = 1e-8
+
+    equity = panel["Strategy_Equity"]
+    strategy_return = panel["Strategy_Return"]
+
+    last = equity.ffill().iloc[-1]
+
+    ann_return = last ** (trading_days / equity.count()) - 1
+
+    ann_vol = strategy_return.std() * np.sqrt(trading_days)
+
+    sharpe = ann_return / (ann_vol + eps)
+
+    max_dd = (equity / equity.cummax() - 1).min()
+
+    metrics = pd.DataFrame({
+        "Annual Return": ann_return,
+        "Annual Volatility": ann_vol,
+        "Sharpe Ratio": sharpe,
+        "Max Drawdown": max_dd
+    })
+    metrics.index.name = "Ticker"
+
+    return metrics
+
+
 # -------------------------------------------------
 # PLOT
 # -------------------------------------------------
@@ -200,24 +405,24 @@ def plot_equity_curve(backtest_df, stock="INFY.NS"):
 # RUN SCRIPT
 # -------------------------------------------------
 
-if __name__ == "__main__":
+def main(returns_df=None, egarch_result=None, stock="INFY.NS"):
+    """
+    Single-asset run: backtest, summary prints and equity plot.
+    Loaded returns / a fitted EGARCH can be passed in (pipeline).
+    """
 
     from models.egarch import fit_egarch
-    from scripts.preprocess import load_returns_data
+    from scripts.returns_universe import ReturnsUniverse
 
-    returns_df = load_returns_data()
-    stock = "INFY.NS"
-
-    series = (
-        returns_df.loc[
-            returns_df["Ticker"] == stock,
-            "log_return"
-        ]
-        .dropna()
-        .values
-    )
+    if returns_df is None:
+        returns_df = ReturnsUniverse.from_returns_data(
+            tickers=[stock],
+            columns=["log_return"]
+        )
 
-    egarch_result = fit_egarch(series)
+    if egarch_result is None:
+        series = ticker_frame(returns_df, stock)["log_return"]
+        egarch_result = fit_egarch(series.dropna().values)
 
     backtest_df = run_single_asset_backtest(
         returns_df,
@@ -248,3 +453,9 @@ if __name__ == "__main__":
     print(performance)
 
     plot_equity_curve(backtest_df, stock)
+
+    return backtest_df
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 
+from regime.volatility_regime import REGIME_DTYPE
+
+
 def regime_performance(backtest_df):
     results = []
 
-    for regime, df in backtest_df.groupby("Vol_Regime"):
+    # categorical: grouped on the int8 codes, in LOW / MEDIUM / HIGH order
+    regimes = backtest_df["Vol_Regime"].astype(REGIME_DTYPE)
+
+    for regime, df in backtest_df.groupby(regimes, observed=True):
         if len(df) < 50:
             continue
 
@@ -41,6 +47,7 @@ def plot_regime_distribution(backtest_df):
 
     regime_counts = (
         backtest_df["Vol_Regime"]
+        .astype(REGIME_DTYPE)
         .value_counts()
         .sort_index()
     )
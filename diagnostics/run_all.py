@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from diagnostics.regime_performance import regime_performance
@@ -6,33 +7,37 @@ from diagnostics.crisis_analysis import crisis_window
 
 from backtest.single_asset import run_single_asset_backtest
 from models.egarch import fit_egarch
-from scripts.preprocess import load_returns_data
+from scripts.returns_universe import ReturnsUniverse
 
 from diagnostics.crisis_analysis import plot_crisis_equity
 
-def main():
+def main(backtest_df=None):
+    """
+    Runs all diagnostics. A finished single-asset backtest
+    can be passed in (pipeline); otherwise it is rebuilt here.
+    """
     print("\n RUNNING FULL DIAGNOSTICS SUITE\n")
 
     # -----------------------------------
     # Load data & run base backtest
     # -----------------------------------
-    returns_df = load_returns_data()
-
     stock = "INFY.NS"
-    series = (
-        returns_df
-        .loc[returns_df["Ticker"] == stock, "log_return"]
-        .dropna()
-        .values
-    )
 
-    model = fit_egarch(series)
+    if backtest_df is None:
+        returns_df = ReturnsUniverse.from_returns_data(
+            tickers=[stock],
+            columns=["log_return"]
+        )
+        series = returns_df.returns(stock)
+        series = series[~np.isnan(series)]
+
+        model = fit_egarch(series)
 
-    backtest_df = run_single_asset_backtest(
-        returns_df,
-        model,
-        stock
-    )
+        backtest_df = run_single_asset_backtest(
+            returns_df,
+            model,
+            stock
+        )
 
     # -----------------------------------
     # Diagnostic 1: Regime Performance
@@ -1,33 +1,209 @@
+import time
+import signal
+import warnings
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import numpy as np
 import pandas as pd
+from arch.utility.exceptions import StartingValueWarning
+
 from model_switching.registry import fit_model
+from models.fit_summary import FitSummary
 
 MODELS = ["GARCH", "EGARCH", "GJR", "FIGARCH"]
 
-def refit_all_models(series):
+# Extra seconds the parent waits beyond every fit's own timeout before
+# giving up on a worker that could not be interrupted
+REFIT_GRACE = 30
+
+
+def fit_warm(series, model_name, starting_values=None):
+    """
+    Fits one model, warm-started from starting_values when given.
+
+    Falls back to a cold start if arch rejects the starting values
+    or the warm fit does not converge.
+
+    Returns (result, start) with start in
+    {"cold", "warm", "cold_fallback"}.
+    """
+
+    if starting_values is None:
+        return fit_model(series, model_name), "cold"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", StartingValueWarning)
+        try:
+            res = fit_model(series, model_name, starting_values)
+        except StartingValueWarning:
+            res = None
+
+    if res is not None and res.convergence_flag == 0:
+        return res, "warm"
+
+    return fit_model(series, model_name), "cold_fallback"
+
+
+def fit_summary(series, model_name, starting_values=None):
+    """
+    fit_warm, reduced to a FitSummary (what refit_all_models keeps,
+    and all a worker process sends back).
+    """
+
+    res, start = fit_warm(series, model_name, starting_values)
+    return FitSummary.from_result(model_name, res), start
+
+
+def _fit_summary_within(timeout, series, model_name, starting_values=None):
+    """
+    Worker: fit_summary, interrupted with TimeoutError once it has
+    run `timeout` seconds. The clock starts here, when a worker picks
+    the fit up (not at submission), and an interrupted fit frees its
+    worker for the next one.
+
+    Needs SIGALRM in the worker's main thread (process pools on
+    POSIX); elsewhere the fit runs unbounded.
+    """
+
+    if (
+        timeout is None
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return fit_summary(series, model_name, starting_values)
+
+    def expire(signum, frame):
+        raise TimeoutError(f"> {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, max(timeout, 1e-6))
+
+    try:
+        return fit_summary(series, model_name, starting_values)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _model_row(model_name, summary, start):
+    return {
+        "Model": model_name,
+        "AIC": summary.aic,
+        "BIC": summary.bic,
+        "Persistence": summary.persistence,
+        "Start": start,
+        "Iterations": summary.nit,
+        "Result": summary,
+        "Error": None
+    }
+
+
+def _failed_row(model_name, error):
+    return {
+        "Model": model_name,
+        "AIC": np.nan,
+        "BIC": np.nan,
+        "Persistence": None,
+        "Start": None,
+        "Iterations": np.nan,
+        "Result": None,
+        "Error": error
+    }
+
+
+def refit_all_models(series, starting_values=None, executor=None,
+                     timeout=None):
     """
     Fits all models and returns AIC/BIC + stability metrics.
+    Result holds each fit as a models.fit_summary.FitSummary.
+
+    starting_values: optional {model name: params} from the
+    previous window; those models are warm-started.
+
+    executor: optional concurrent.futures executor (normally a
+    ProcessPoolExecutor). The candidate models are then fitted
+    concurrently, each allowed `timeout` seconds from when a worker
+    starts it (time queued behind other fits does not count). A
+    model that fails or times out gets a row with Result=None and
+    the reason in Error.
+
+    A fit that overruns is interrupted inside its worker (see
+    _fit_summary_within). Should a worker not respond, the parent
+    stops waiting once every fit could have used its full timeout
+    one after another, plus REFIT_GRACE seconds.
     """
 
+    starting_values = starting_values or {}
+
+    if executor is None:
+        results = []
+
+        for model_name in MODELS:
+            try:
+                res, start = fit_summary(
+                    series,
+                    model_name,
+                    starting_values.get(model_name)
+                )
+                results.append(_model_row(model_name, res, start))
+
+            except Exception as e:
+                results.append(_failed_row(model_name, repr(e)))
+
+        return pd.DataFrame(results)
+
+    # -----------------------------------
+    # Concurrent candidate fits
+    # -----------------------------------
+    futures = {
+        model_name: executor.submit(
+            _fit_summary_within,
+            timeout,
+            series,
+            model_name,
+            starting_values.get(model_name)
+        )
+        for model_name in MODELS
+    }
+
+    # backstop only: each fit enforces its own timeout in the worker
+    deadline = (
+        None if timeout is None
+        else time.monotonic() + timeout * len(futures) + REFIT_GRACE
+    )
+
     results = []
 
-    for model_name in MODELS:
-        try:
-            res = fit_model(series, model_name)
+    for model_name, future in futures.items():
+        remaining = (
+            None if deadline is None
+            else max(0.0, deadline - time.monotonic())
+        )
 
-            # Stability filter
-            persistence = None
-            if "alpha[1]" in res.params and "beta[1]" in res.params:
-                persistence = res.params["alpha[1]"] + res.params["beta[1]"]
+        try:
+            res, start = future.result(timeout=remaining)
+            results.append(_model_row(model_name, res, start))
 
-            results.append({
-                "Model": model_name,
-                "AIC": res.aic,
-                "BIC": res.bic,
-                "Persistence": persistence,
-                "Result": res
-            })
+        except (TimeoutError, FutureTimeoutError):
+            future.cancel()
+            results.append(
+                _failed_row(model_name, f"TimeoutError: > {timeout}s")
+            )
 
-        except Exception:
-            continue
+        except Exception as e:
+            results.append(_failed_row(model_name, repr(e)))
 
     return pd.DataFrame(results)
+
+
+def previous_params(model_df):
+    """
+    {model name: fitted params} for warm-starting the next refit.
+    """
+
+    return {
+        row["Model"]: np.asarray(row["Result"].params)
+        for _, row in model_df.iterrows()
+        if row["Result"] is not None
+    }
@@ -1,51 +1,57 @@
-from arch import arch_model
+from models.fit_cache import cached_fit
+from models.garch import GARCH_SPEC
+from models.egarch import EGARCH_SPEC
+from models.gjr_garch import GJR_GARCH_SPEC
+from models.figarch import FIGARCH_SPEC
 
-def fit_model(series, model_type):
+MODEL_SPECS = {
+    "GARCH": GARCH_SPEC,
+    "EGARCH": EGARCH_SPEC,
+    "GJR": GJR_GARCH_SPEC,
+    "FIGARCH": FIGARCH_SPEC
+}
+
+# Estimation backends:
+#   "arch"      arch_model(...).fit (numerical gradients), cached
+#   "analytic"  closed-form score + Newton (models.garch_batch) for
+#               the models below; other models still use arch
+BACKENDS = ("arch", "analytic")
+FIT_BACKEND = "arch"
+
+# model → GJR order o of models.garch_batch.fit_garch_analytic
+ANALYTIC_MODELS = {
+    "GARCH": 0,
+    "GJR": 1
+}
+
+
+def fit_model(series, model_type, starting_values=None, backend=None):
     """
     Fits a volatility model and returns fitted result.
+
+    starting_values (e.g. the params of a previous fit of the
+    same model) are passed straight to arch's optimiser.
+    Repeated fits of the same data are served from the
+    on-disk fit cache (models.fit_cache).
+
+    backend defaults to FIT_BACKEND (see BACKENDS).
     """
 
-    if model_type == "GARCH":
-        model = arch_model(
-            series,
-            mean="Constant",
-            vol="GARCH",
-            p=1, q=1,
-            dist="normal",
-            rescale=False
-        )
+    if model_type not in MODEL_SPECS:
+        raise ValueError("Unknown model type")
 
-    elif model_type == "EGARCH":
-        model = arch_model(
-            series,
-            mean="Constant",
-            vol="EGARCH",
-            p=1, o=1, q=1,
-            dist="normal",
-            rescale=False
-        )
+    backend = backend or FIT_BACKEND
 
-    elif model_type == "GJR":
-        model = arch_model(
-            series,
-            mean="Constant",
-            vol="GARCH",
-            p=1, o=1, q=1,
-            dist="normal",
-            rescale=False
-        )
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown fit backend: {backend}")
+
+    if backend == "analytic" and model_type in ANALYTIC_MODELS:
+        from models.garch_batch import fit_garch_analytic
 
-    elif model_type == "FIGARCH":
-        model = arch_model(
+        return fit_garch_analytic(
             series,
-            mean="Constant",
-            vol="FIGARCH",
-            p=1, q=1,
-            dist="normal",
-            rescale=False
+            o=ANALYTIC_MODELS[model_type],
+            starting_values=starting_values
         )
 
-    else:
-        raise ValueError("Unknown model type")
-
-    return model.fit(disp="off")
+    return cached_fit(series, MODEL_SPECS[model_type], starting_values)
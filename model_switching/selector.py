@@ -5,6 +5,12 @@ def select_best_model(model_df):
     2️⃣ Stability filter (persistence < 0.98)
     """
 
+    # Drop models that failed / timed out
+    model_df = model_df[model_df["Result"].notna()]
+
+    if model_df.empty:
+        raise ValueError("No candidate model could be fitted")
+
     # Drop unstable models
     stable_df = model_df.copy()
 
@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from model_switching.registry import fit_model
+from models.fit_cache import fit_cache_settings, use_fit_cache
+from models.garch import extract_garch_params
+from models.egarch import extract_egarch_params
+from models.gjr_garch import extract_gjr_params
+from models.figarch import extract_figarch_params
+
+# -------------------------------------------------
+# (TICKER × MODEL) BATCH FITTING
+# -------------------------------------------------
+#
+# Data is loaded once; every (ticker, model) pair becomes one job
+# for a process pool. Finished jobs are appended to a single
+# long-format table (one row per ticker × model) as they arrive,
+# and the AIC/BIC comparison is computed from that table directly.
+
+BATCH_MODELS = ["GARCH", "EGARCH", "GJR"]
+
+EXTRACTORS = {
+    "GARCH": extract_garch_params,
+    "EGARCH": extract_egarch_params,
+    "GJR": extract_gjr_params,
+    "FIGARCH": extract_figarch_params
+}
+
+
+def _fit_job(ticker, model_name, values):
+    """
+    Worker: one (ticker, model) fit → one long-table row.
+    """
+
+    row = {"Ticker": ticker, "Model": model_name}
+
+    try:
+        result = fit_model(values, model_name)
+        row.update(EXTRACTORS[model_name](result))
+        row["Converged"] = result.convergence_flag == 0
+        row["Error"] = None
+
+    except Exception as e:
+        row["Converged"] = False
+        row["Error"] = f"{type(e).__name__}: {e}"
+
+    return row
+
+
+def _batch_garch_rows(series_by_ticker):
+    """
+    GARCH rows from the cross-sectional estimator
+    (models.garch_batch) instead of per-ticker arch fits.
+    """
+    from models.garch_batch import MIN_OBS, fit_garch_batch
+
+    tickers = list(series_by_ticker)
+    length = max(len(v) for v in series_by_ticker.values())
+
+    panel = np.full((length, len(tickers)), np.nan)
+    for i, ticker in enumerate(tickers):
+        values = series_by_ticker[ticker]
+        panel[:len(values), i] = values
+
+    fit = fit_garch_batch(panel, tickers=tickers)
+    fit["Model"] = "GARCH"
+    fit["Error"] = np.where(
+        fit["nobs"] < MIN_OBS,
+        f"ValueError: fewer than {MIN_OBS} observations",
+        None
+    )
+
+    return fit.drop(columns=["mu", "loglik", "nobs"]).to_dict("records")
+
+
+def fit_universe(series_by_ticker, models=BATCH_MODELS, max_workers=None,
+                 batch_garch=False, progress=True):
+    """
+    Fits every model to every ticker.
+
+    Parameters
+    ----------
+    series_by_ticker : dict
+        {ticker: 1-D array of returns}.
+    models : list of str
+        model_switching.registry names.
+    max_workers : int, optional
+        Worker processes (default: CPU count). 1 runs in-process.
+    batch_garch : bool
+        Fit GARCH with the vectorised cross-sectional estimator.
+
+    Returns
+    -------
+    pd.DataFrame
+        Long format: one row per (Ticker, Model) with that model's
+        extract_*_params columns, Converged and Error.
+    """
+
+    rows = []
+    jobs = [
+        (ticker, model_name, values)
+        for ticker, values in series_by_ticker.items()
+        for model_name in models
+        if not (batch_garch and model_name == "GARCH")
+    ]
+
+    if batch_garch and "GARCH" in models:
+        rows.extend(_batch_garch_rows(series_by_ticker))
+
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1:
+        for job in tqdm(jobs, disable=not progress):
+            rows.append(_fit_job(*job))
+
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=use_fit_cache,
+            initargs=(fit_cache_settings(),)
+        ) as pool:
+            futures = [pool.submit(_fit_job, *job) for job in jobs]
+
+            for future in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                disable=not progress
+            ):
+                rows.append(future.result())
+
+    # deterministic order (rows and columns) regardless of
+    # completion order
+    order = {name: i for i, name in enumerate(models)}
+    rows.sort(key=lambda row: (row["Ticker"], order[row["Model"]]))
+
+    long_df = pd.DataFrame(rows)
+
+    first = ["Ticker", "Model"]
+    last = ["Converged", "Error"]
+    params = [c for c in long_df.columns if c not in first + last]
+
+    return long_df[first + params + last]
+
+
+def load_series_by_ticker(tickers=None):
+    """
+    {ticker: returns} from one read of the returns store.
+    """
+    from scripts.returns_universe import ReturnsUniverse
+
+    universe = ReturnsUniverse.from_returns_data(
+        tickers=tickers,
+        columns=["log_return"]
+    )
+
+    series = {}
+    for ticker in universe.tickers:
+        values = universe.returns(ticker)
+        series[ticker] = values[np.isfinite(values)]
+
+    return series
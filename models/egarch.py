@@ -1,22 +1,23 @@
 import numpy as np
-from arch import arch_model
+
+from models.fit_cache import cached_fit
+
+EGARCH_SPEC = dict(
+    mean="Constant",
+    vol="EGARCH",
+    p=1,
+    o=1,
+    q=1,
+    dist="normal",
+    rescale=False
+)
 
 
 def fit_egarch(series):
     """
     Fit EGARCH(1,1) model on return series
     """
-    model = arch_model(
-        series,
-        mean="Constant",
-        vol="EGARCH",
-        p=1,
-        o=1,
-        q=1,
-        dist="normal",
-        rescale=False
-    )
-    return model.fit(disp="off")
+    return cached_fit(series, EGARCH_SPEC)
 
 
 def extract_egarch_params(result):
@@ -1,17 +1,92 @@
-from arch import arch_model
+import numpy as np
+from scipy import fft
+from arch.univariate import ConstantMean, FIGARCH, Normal
+from arch.univariate.recursions import figarch_weights
 
+from models.fit_cache import cached_fit
 
-def fit_figarch(series):
-    model = arch_model(
+# ARCH(∞) lags kept by the FIGARCH variance (arch's default)
+FIGARCH_TRUNCATION = 1000
+
+FIGARCH_SPEC = dict(
+    mean="Constant",
+    vol="FIGARCH",
+    p=1,
+    q=1,
+    dist="normal",
+    rescale=False,
+    truncation=FIGARCH_TRUNCATION,
+    variance_filter="fft"     # or "recursive" (arch's own)
+)
+
+
+# -----------------------------------
+# FFT variance filter
+# -----------------------------------
+class FFTFIGARCH(FIGARCH):
+    """
+    arch's FIGARCH with the ARCH(∞) sum computed as one FFT
+    convolution: O(T log T) per likelihood evaluation instead of
+    O(T · truncation). Same variances as arch's recursion.
+    """
+
+    def compute_variance(self, parameters, resids, sigma2, backcast,
+                         var_bounds):
+        p, q, power, truncation = self.p, self.q, self.power, self.truncation
+
+        fresids = np.absolute(resids) ** power
+        nobs = fresids.shape[0]
+
+        omega = parameters[0]
+        beta = parameters[1 + p + q] if q else 0.0
+        lam = figarch_weights(parameters[1:], p, q, truncation)
+
+        # sigma2_t = omega / (1 - beta)
+        #            + sum_{i >= t} lam_i · backcast       (pre-sample)
+        #            + sum_{i < t}  lam_i · fresids_{t-1-i}
+        lags = min(truncation, nobs)
+        size = fft.next_fast_len(nobs - 1 + lags, real=True)
+        conv = fft.irfft(
+            fft.rfft(fresids[:-1], size) * fft.rfft(lam[:lags], size), size
+        )
+
+        tail = np.append(np.cumsum(lam[::-1])[::-1], 0.0)
+
+        sigma2[0] = 0.0
+        sigma2[1:] = conv[:nobs - 1]
+        sigma2 += omega / (1 - beta)
+        sigma2 += tail[np.minimum(np.arange(nobs), truncation)] * backcast
+
+        # arch's bounds_check (no feedback, so it applies afterwards)
+        lower, upper = var_bounds[:, 0], var_bounds[:, 1]
+        np.maximum(sigma2, lower, out=sigma2)
+        over = sigma2 > upper
+        sigma2[over] = upper[over] + np.log(sigma2[over] / upper[over])
+
+        sigma2 **= 2.0 / power
+
+        return sigma2
+
+
+def figarch_model(series, p=1, q=1, truncation=FIGARCH_TRUNCATION,
+                  variance_filter="fft", rescale=False, **spec):
+    """
+    arch model for a FIGARCH_SPEC-style spec (constant mean,
+    normal errors).
+    """
+
+    volatility = {"fft": FFTFIGARCH, "recursive": FIGARCH}[variance_filter]
+
+    return ConstantMean(
         series,
-        mean="Constant",
-        vol="FIGARCH",
-        p=1,
-        q=1,
-        dist="normal",
-        rescale=False
+        volatility=volatility(p=p, q=q, truncation=truncation),
+        distribution=Normal(),
+        rescale=rescale
     )
-    return model.fit(disp="off")
+
+
+def fit_figarch(series):
+    return cached_fit(series, FIGARCH_SPEC)
 
 
 def extract_figarch_params(result):
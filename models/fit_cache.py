@@ -0,0 +1,285 @@
+import os
+import uuid
+import hashlib
+
+import numpy as np
+import arch
+from arch import arch_model
+from arch.univariate.base import ARCHModelResult
+from scipy.optimize import OptimizeResult
+
+# -------------------------------------------------
+# PERSISTENT CACHE OF arch FITS
+# -------------------------------------------------
+#
+# Key   sha256(input values, arch_model spec, starting values,
+#             arch version)
+# Entry <root>/<key[:2]>/<key>.npz holding the fitted params, their
+#       names and the optimiser status (a few hundred bytes)
+#
+# A hit rebuilds arch's own result from the params with one
+# model.fix pass (no optimisation), so callers get the same
+# ARCHModelResult (forecast, resid, std_resid, model, ...) on a hit
+# as on a miss.
+#
+# Entries are touched on every hit; once the cache grows past
+# max_bytes the least recently used entries are deleted.
+
+FIT_CACHE_DIR = "outputs/.fit_cache"
+FIT_CACHE_MAX_BYTES = 256 * 2 ** 20
+
+# optimization_result.message of results rebuilt from the cache
+FIT_CACHE_MESSAGE = "Restored from fit cache"
+
+
+def restore_result(series, spec, params, convergence_flag=0, nit=-1,
+                   nfev=-1, rsquared=0.0, message=FIT_CACHE_MESSAGE):
+    """
+    arch's ARCHModelResult of build_model(series, spec) at the given
+    params, without optimising: resid, volatility and loglikelihood
+    come from one model.fix pass, the optimiser status from the
+    arguments.
+    """
+
+    fixed = build_model(series, spec).fix(np.asarray(params, dtype=np.float64))
+
+    optim = OptimizeResult(
+        x=np.asarray(fixed.params),
+        fun=-fixed.loglikelihood,
+        status=int(convergence_flag),
+        success=convergence_flag == 0,
+        nit=int(nit),
+        nfev=int(nfev),
+        message=message
+    )
+
+    return ARCHModelResult(
+        np.asarray(fixed.params),
+        None,                           # param_cov: computed on demand
+        float(rsquared),
+        np.asarray(fixed.resid, dtype=np.float64),
+        np.asarray(fixed.conditional_volatility, dtype=np.float64),
+        "robust",
+        fixed._dep_var,
+        list(fixed.params.index),
+        fixed.loglikelihood,
+        fixed._is_pandas,
+        optim,
+        0,
+        fixed.nobs,
+        fixed.model
+    )
+
+
+class FitCache:
+    """
+    On-disk, size-bounded LRU cache of arch fits.
+    """
+
+    def __init__(self, root=FIT_CACHE_DIR, max_bytes=FIT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    # -----------------------------------
+    # Keys
+    # -----------------------------------
+
+    @staticmethod
+    def key(values, spec, starting_values=None):
+        h = hashlib.sha256()
+
+        h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        h.update(repr(sorted(spec.items())).encode())
+
+        if starting_values is not None:
+            h.update(b"start")
+            h.update(
+                np.ascontiguousarray(starting_values, dtype=np.float64).tobytes()
+            )
+
+        h.update(arch.__version__.encode())
+
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.npz")
+
+    # -----------------------------------
+    # Load / save
+    # -----------------------------------
+
+    def load(self, key, series, spec):
+        """
+        Returns the cached fit as an arch result, or None on a miss.
+        """
+
+        path = self._path(key)
+
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                params = entry["params"]
+                flag, nit, nfev, rsquared = entry["stats"]
+            os.utime(path)   # most-recently-used
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return restore_result(
+            series,
+            spec,
+            params,
+            convergence_flag=int(flag),
+            nit=int(nit),
+            nfev=int(nfev),
+            rsquared=rsquared
+        )
+
+    def save(self, key, result):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        optim = result.optimization_result
+        stats = np.array([
+            result.convergence_flag,
+            getattr(optim, "nit", -1),
+            getattr(optim, "nfev", -1),
+            result.rsquared
+        ], dtype=np.float64)
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp.npz"
+        np.savez(
+            tmp,
+            params=np.asarray(result.params, dtype=np.float64),
+            names=np.asarray(result.params.index, dtype=str),
+            stats=stats
+        )
+        os.replace(tmp, path)
+
+        self._evict()
+
+    def clear(self):
+        for entry in self._entries():
+            _remove(entry.path)
+
+    # -----------------------------------
+    # LRU eviction
+    # -----------------------------------
+
+    def _entries(self):
+        if not os.path.isdir(self.root):
+            return []
+
+        entries = []
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                entries.extend(
+                    e for e in os.scandir(shard.path)
+                    if e.name.endswith(".npz") and ".tmp" not in e.name
+                )
+        return entries
+
+    def size(self):
+        return sum(_stat(e).st_size for e in self._entries() if _stat(e))
+
+    def _evict(self):
+        stats = [(e.path, _stat(e)) for e in self._entries()]
+        stats = [(path, st) for path, st in stats if st is not None]
+
+        total = sum(st.st_size for _, st in stats)
+        if total <= self.max_bytes:
+            return
+
+        for path, st in sorted(stats, key=lambda x: x[1].st_mtime):
+            _remove(path)
+            total -= st.st_size
+            if total <= self.max_bytes:
+                break
+
+
+def _stat(entry):
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# -------------------------------------------------
+# ENTRY POINT FOR models.* / model_switching
+# -------------------------------------------------
+
+# Set to None to disable caching (or replace, e.g. in tests)
+FIT_CACHE = FitCache()
+
+
+def fit_cache_settings():
+    """
+    (root, max_bytes) of FIT_CACHE, or None when caching is off.
+    """
+
+    cache = FIT_CACHE
+    return None if cache is None else (cache.root, cache.max_bytes)
+
+
+def use_fit_cache(settings):
+    """
+    Points FIT_CACHE at fit_cache_settings() of another process.
+
+    Initializer of worker pools: spawned workers re-import this
+    module, so without it they would use the default cache
+    whatever the parent had set.
+    """
+
+    global FIT_CACHE
+    FIT_CACHE = None if settings is None else FitCache(*settings)
+
+
+def build_model(series, spec):
+    """
+    Unfitted arch model for a models.* spec: arch_model(series,
+    **spec), except FIGARCH specs (truncation / variance filter),
+    see models.figarch.figarch_model.
+    """
+
+    if spec.get("vol") == "FIGARCH":
+        from models.figarch import figarch_model
+
+        return figarch_model(series, **spec)
+
+    return arch_model(series, **spec)
+
+
+def cached_fit(series, spec, starting_values=None):
+    """
+    build_model(series, spec).fit(disp="off"), served from
+    FIT_CACHE when the same values were fitted with the same spec.
+
+    Hit or miss, the result is arch's ARCHModelResult (a hit is
+    rebuilt with restore_result).
+    """
+
+    cache = FIT_CACHE
+
+    def fit():
+        model = build_model(series, spec)
+        return model.fit(disp="off", starting_values=starting_values)
+
+    if cache is None:
+        return fit()
+
+    key = cache.key(np.asarray(series), spec, starting_values)
+
+    result = cache.load(key, series, spec)
+    if result is not None:
+        return result
+
+    result = fit()
+    cache.save(key, result)
+
+    return result
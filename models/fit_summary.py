@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+class FitSummary:
+    """
+    Compact record of one model fit, kept instead of arch's
+    ARCHModelResult (which holds the data, the covariance matrix
+    and a model reference).
+
+    Exposes params, loglikelihood, aic, bic, persistence,
+    convergence_flag, nit and conditional_volatility (float32, or
+    None once dropped with drop_volatility()).
+    """
+
+    __slots__ = (
+        "model", "param_names", "param_values", "loglikelihood",
+        "aic", "bic", "persistence", "convergence_flag", "nit",
+        "conditional_volatility"
+    )
+
+    def __init__(self, model, param_names, param_values, loglikelihood,
+                 aic, bic, persistence, convergence_flag, nit,
+                 conditional_volatility):
+        self.model = model
+        self.param_names = tuple(param_names)
+        self.param_values = np.asarray(param_values, dtype=np.float64)
+        self.loglikelihood = float(loglikelihood)
+        self.aic = float(aic)
+        self.bic = float(bic)
+        self.persistence = persistence
+        self.convergence_flag = int(convergence_flag)
+        self.nit = nit
+        self.conditional_volatility = conditional_volatility
+
+    @classmethod
+    def from_result(cls, model, result):
+        params = result.params
+
+        # Stability filter input (GARCH-type models only)
+        persistence = None
+        if "alpha[1]" in params and "beta[1]" in params:
+            persistence = float(params["alpha[1]"] + params["beta[1]"])
+
+        return cls(
+            model=model,
+            param_names=params.index,
+            param_values=params.values,
+            loglikelihood=result.loglikelihood,
+            aic=result.aic,
+            bic=result.bic,
+            persistence=persistence,
+            convergence_flag=result.convergence_flag,
+            nit=result.optimization_result.nit,
+            conditional_volatility=np.asarray(
+                result.conditional_volatility, dtype=np.float32
+            )
+        )
+
+    @property
+    def params(self):
+        return pd.Series(
+            self.param_values,
+            index=list(self.param_names),
+            name="params"
+        )
+
+    def drop_volatility(self):
+        self.conditional_volatility = None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return (
+            f"FitSummary({self.model}, AIC={self.aic:.4f}, "
+            f"converged={self.convergence_flag == 0})"
+        )
@@ -1,20 +1,21 @@
-from arch import arch_model
 import numpy as np
 
+from models.fit_cache import cached_fit
+
+GARCH_SPEC = dict(
+    mean="Constant",
+    vol="GARCH",
+    p=1,
+    q=1,
+    dist="normal",
+    rescale=False
+)
+
 # -----------------------------------
 # Fit GARCH(1,1)
 # -----------------------------------
 def fit_garch(series):
-    model = arch_model(
-        series,
-        mean="Constant",
-        vol="GARCH",
-        p=1,
-        q=1,
-        dist="normal",
-        rescale=False
-    )
-    return model.fit(disp="off")
+    return cached_fit(series, GARCH_SPEC)
 
 
 # -----------------------------------
@@ -0,0 +1,497 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# -----------------------------------
+# Cross-sectional GARCH(1,1) / GJR(1,1,1)
+# -----------------------------------
+#
+# Same models as models.garch.fit_garch / models.gjr_garch.fit_gjr_garch
+# (constant mean, normal errors, arch's 75-obs exponential backcast),
+# estimated for every column of a (T × N) returns panel at once:
+#   - the variance recursion and its score run as one vectorised
+#     pass over time, each step updating all N tickers together
+#   - every optimiser iteration (Newton step + step-halving line
+#     search) updates all tickers' parameters together
+#
+# Each series is standardised before fitting and the parameters are
+# mapped back, which keeps omega well-conditioned for the optimiser.
+#
+# Parameters are stacked as theta = (mu, omega, alpha, [gamma,] beta),
+# arch's order; o = 1 adds GJR's gamma on negative residuals.
+
+LOG_2PI = np.log(2 * np.pi)
+BACKCAST_OBS = 75
+MAX_PERSISTENCE = 1 - 1e-6
+MIN_OMEGA = 1e-8
+MAX_HALVINGS = 30
+
+START_ALPHA = 0.08
+START_GAMMA = 0.05
+START_BETA = 0.90
+
+# Fewest observations a series is fitted on
+MIN_OBS = 2
+
+
+def _compact_panel(returns):
+    """
+    Moves each column's non-NaN values to the top.
+    Returns (values, mask, nobs) with padding masked out.
+    """
+
+    returns = np.asarray(returns, dtype=np.float64)
+    valid = np.isfinite(returns)
+
+    nobs = valid.sum(axis=0)
+    order = np.argsort(~valid, axis=0, kind="stable")
+
+    values = np.take_along_axis(returns, order, axis=0)
+    mask = np.arange(returns.shape[0])[:, None] < nobs[None, :]
+
+    values = np.where(mask, values, 0.0)
+    return values, mask, nobs
+
+
+def _backcast(resids, nobs):
+    tau = np.minimum(BACKCAST_OBS, nobs)
+    weights = 0.94 ** np.arange(BACKCAST_OBS)[:, None]
+    weights = np.where(np.arange(BACKCAST_OBS)[:, None] < tau, weights, 0.0)
+    weights = weights / weights.sum(axis=0)
+
+    return (resids[:BACKCAST_OBS] ** 2 * weights).sum(axis=0)
+
+
+def _linear_filter(x, beta):
+    """
+    Runs x_t += beta · x_{t-1} in place down a (T, ..., N) array:
+    turns a drive c_t into the recursion x_t = c_t + beta · x_{t-1}
+    with one beta per ticker.
+
+    Each time step updates every ticker (and every stacked
+    recursion) at once. A single ticker (one beta) goes through
+    scipy's lfilter instead, which runs the loop in C.
+    """
+
+    if np.size(beta) == 1:
+        b = float(np.ravel(beta)[0])
+        x[:] = lfilter([1.0], [1.0, -b], x, axis=0)
+        return x
+
+    for t in range(1, x.shape[0]):
+        x[t] += beta * x[t - 1]
+
+    return x
+
+
+def _unpack(theta):
+    """
+    (mu, omega, alpha, gamma, beta); gamma = 0 for GARCH.
+    """
+
+    if len(theta) == 4:
+        mu, omega, alpha, beta = theta
+        return mu, omega, alpha, np.zeros_like(alpha), beta
+
+    return tuple(theta)
+
+
+def garch_variance(resids, omega, alpha, beta, backcast, gamma=None):
+    """
+    Conditional variance of a (T × N) residual panel
+    (GJR when gamma is given).
+    """
+
+    drive = np.empty_like(resids)
+    np.square(resids[:-1], out=drive[1:])
+
+    if gamma is None:
+        drive[0] = omega + (alpha + beta) * backcast
+        drive[1:] *= alpha
+    else:
+        drive[0] = omega + (alpha + 0.5 * gamma + beta) * backcast
+        drive[1:] *= alpha + gamma * (resids[:-1] < 0)
+
+    drive[1:] += omega
+
+    return _linear_filter(drive, beta)
+
+
+def _variance_and_score(eps, theta, backcast):
+    """
+    sigma2 and d sigma2 / d theta for every t, as one
+    (T, 1 + k, N) array for k parameters.
+
+    Each is a linear recursion x_t = c_t + beta · x_{t-1}: sigma2
+    and the derivatives up to gamma are filtered together, then
+    d / d beta (whose drive is sigma2_{t-1}).
+    """
+
+    mu, omega, alpha, gamma, beta = _unpack(theta)
+    k = len(theta)
+
+    T, n = eps.shape
+    eps2 = eps ** 2
+    neg = eps < 0
+    arch_term = alpha + gamma * neg[:-1]
+
+    state = np.empty((T, 1 + k, n))
+    drive = state[:, :k]
+    drive[0, 0] = omega + (alpha + 0.5 * gamma + beta) * backcast
+    drive[0, 1] = 0.0
+    drive[0, 2] = 1.0
+    drive[0, 3] = backcast
+    drive[1:, 0] = omega + arch_term * eps2[:-1]   # sigma2
+    drive[1:, 1] = -2.0 * arch_term * eps[:-1]     # d mu
+    drive[1:, 2] = 1.0                             # d omega
+    drive[1:, 3] = eps2[:-1]                       # d alpha
+
+    if k == 5:
+        drive[0, 4] = 0.5 * backcast
+        drive[1:, 4] = eps2[:-1] * neg[:-1]        # d gamma
+
+    _linear_filter(drive, beta)
+
+    drive_beta = state[:, k]                       # d beta
+    drive_beta[0] = backcast
+    drive_beta[1:] = state[:-1, 0]
+    _linear_filter(drive_beta, beta)
+
+    return state
+
+
+def _sigma2(eps, theta, backcast):
+    mu, omega, alpha, gamma, beta = _unpack(theta)
+
+    if len(theta) == 4:
+        return garch_variance(eps, omega, alpha, beta, backcast)
+
+    return garch_variance(eps, omega, alpha, beta, backcast, gamma)
+
+
+def _loglik(y, mask, theta, backcast):
+    """
+    Per-ticker log-likelihood, theta = (mu, omega, alpha, [gamma,]
+    beta) × N.
+    """
+
+    eps = y - theta[0]
+    sigma2 = _sigma2(eps, theta, backcast)
+
+    ll = -0.5 * (LOG_2PI + np.log(sigma2) + eps ** 2 / sigma2)
+    return np.where(mask, ll, 0.0).sum(axis=0)
+
+
+def _gradient(y, mask, theta, backcast):
+    """
+    Analytic gradient (k, N) of every ticker's log-likelihood.
+    """
+
+    eps = y - theta[0]
+    state = _variance_and_score(eps, theta, backcast)
+
+    inv = np.where(mask, 1.0 / state[:, 0], 0.0)
+    dl_ds2 = -0.5 * inv * (1.0 - eps ** 2 * inv)
+
+    grad = np.einsum("tn,tkn->kn", dl_ds2, state[:, 1:])
+    grad[0] += (eps * inv).sum(axis=0)
+
+    return grad
+
+
+def _hessian(y, mask, theta, backcast, grad):
+    """
+    Forward-difference Hessian of every ticker's log-likelihood.
+
+    Tickers are independent, so bumping parameter k for all of
+    them at once gives column k of all N Hessians: one extra
+    gradient pass per parameter regardless of N.
+    """
+
+    n_params = len(theta)
+    hess = np.empty((theta.shape[1], n_params, n_params))
+
+    for k in range(n_params):
+        h = 1e-6 * np.maximum(np.abs(theta[k]), 1e-2)
+        bumped = theta.copy()
+        bumped[k] += h
+        hess[:, :, k] = ((_gradient(y, mask, bumped, backcast) - grad) / h).T
+
+    return 0.5 * (hess + hess.transpose(0, 2, 1))
+
+
+def _project(theta):
+    """
+    Clips onto omega > 0, alpha, beta >= 0, alpha + gamma >= 0,
+    alpha + gamma / 2 + beta < 1.
+    """
+
+    mu, omega, alpha, gamma, beta = _unpack(theta)
+
+    omega = np.maximum(omega, MIN_OMEGA)
+    alpha = np.maximum(alpha, 0.0)
+    gamma = np.maximum(gamma, -alpha)
+    beta = np.maximum(beta, 0.0)
+
+    persistence = alpha + 0.5 * gamma + beta
+    shrink = np.where(
+        persistence > MAX_PERSISTENCE,
+        MAX_PERSISTENCE / np.maximum(persistence, MAX_PERSISTENCE),
+        1.0
+    )
+
+    if len(theta) == 4:
+        return np.stack([mu, omega, alpha * shrink, beta * shrink])
+
+    return np.stack(
+        [mu, omega, alpha * shrink, gamma * shrink, beta * shrink]
+    )
+
+
+def _newton(y, mask, nobs, theta, backcast, maxiter, tol):
+    """
+    Projected Newton ascent run for all tickers at once.
+
+    Each iteration takes one Newton step per ticker, using the
+    absolute eigenvalues of the Hessian so the step still climbs
+    where the likelihood is not locally concave, then halves the
+    step for tickers whose likelihood did not improve. Tickers
+    drop out once their Newton decrement g'H⁻¹g / nobs < tol.
+
+    Returns (theta, loglik, converged, iterations, evaluations),
+    the last two per ticker; evaluations counts likelihood and
+    gradient passes.
+    """
+
+    n = y.shape[1]
+    active = np.ones(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+    evaluations = np.ones(n, dtype=int)
+
+    ll = _loglik(y, mask, theta, backcast)
+
+    for _ in range(maxiter):
+        idx = np.flatnonzero(active)
+        y_a, mask_a, bc_a = y[:, idx], mask[:, idx], backcast[idx]
+        theta_a, ll_a = theta[:, idx], ll[idx]
+
+        grad = _gradient(y_a, mask_a, theta_a, bc_a)
+        hess = _hessian(y_a, mask_a, theta_a, bc_a, grad)
+
+        iterations[idx] += 1
+        evaluations[idx] += 1 + len(theta)
+
+        eigval, eigvec = np.linalg.eigh(-hess)
+        eigval = np.abs(eigval)
+        eigval = np.maximum(eigval, 1e-8 * eigval.max(axis=1, keepdims=True))
+
+        step = np.einsum(
+            "nkj,nj,nlj,ln->kn", eigvec, 1.0 / eigval, eigvec, grad
+        )
+
+        decrement = (grad * step).sum(axis=0) / nobs[idx]
+        moving = decrement > tol
+
+        pending = moving.copy()
+        size = 1.0
+
+        for _ in range(MAX_HALVINGS):
+            if not pending.any():
+                break
+
+            trial = _project(theta_a + size * step)
+            trial_ll = _loglik(y_a, mask_a, trial, bc_a)
+            evaluations[idx[pending]] += 1
+
+            accept = pending & (trial_ll >= ll_a)
+            theta_a[:, accept] = trial[:, accept]
+            ll_a[accept] = trial_ll[accept]
+
+            pending &= ~accept
+            size *= 0.5
+
+        theta[:, idx] = theta_a
+        ll[idx] = ll_a
+
+        # converged, or no ascent along the step
+        active[idx[~moving | pending]] = False
+        if not active.any():
+            break
+
+    return theta, ll, ~active, iterations, evaluations
+
+
+def _estimate(returns, o, maxiter, tol, starting_values=None):
+    """
+    Standardise, fit, map back. Returns (theta on the return scale,
+    loglik, converged, iterations, evaluations, nobs, sigma2 panel).
+    """
+
+    values, mask, nobs = _compact_panel(returns)
+
+    if (nobs < MIN_OBS).any():
+        raise ValueError(
+            f"Every ticker needs at least {MIN_OBS} observations"
+        )
+
+    # -----------------------------------
+    # Standardise each series
+    # -----------------------------------
+    mean = np.where(mask, values, 0.0).sum(axis=0) / nobs
+    scale = np.sqrt(
+        (np.where(mask, values - mean, 0.0) ** 2).sum(axis=0) / nobs
+    )
+    y = np.where(mask, values / scale, 0.0)
+    mu0 = mean / scale
+
+    # arch: backcast from residuals at the starting (sample-mean) mean
+    backcast = _backcast(np.where(mask, y - mu0, 0.0), nobs)
+
+    # -----------------------------------
+    # Starting values
+    # -----------------------------------
+    n = y.shape[1]
+
+    if starting_values is not None:
+        theta0 = np.asarray(starting_values, dtype=np.float64).reshape(-1, 1)
+        theta0 = np.repeat(theta0, n, axis=1)
+        theta0[0] = theta0[0] / scale
+        theta0[1] = theta0[1] / scale ** 2
+        theta0 = _project(theta0)
+
+    else:
+        # unit variance: alpha + gamma / 2 = START_ALPHA
+        rows = [
+            mu0,
+            np.full(n, 1.0 - START_ALPHA - START_BETA),
+            np.full(n, START_ALPHA - 0.5 * START_GAMMA * o)
+        ]
+        if o:
+            rows.append(np.full(n, START_GAMMA))
+        rows.append(np.full(n, START_BETA))
+
+        theta0 = np.stack(rows)
+
+    # -----------------------------------
+    # Joint estimation
+    # -----------------------------------
+    theta, loglik, converged, iterations, evaluations = _newton(
+        y, mask, nobs, theta0, backcast, maxiter, tol
+    )
+
+    sigma2 = np.where(
+        mask, _sigma2(y - theta[0], theta, backcast), np.nan
+    ) * scale ** 2
+
+    # -----------------------------------
+    # Map back to the return scale
+    # -----------------------------------
+    theta = theta.copy()
+    theta[0] = theta[0] * scale
+    theta[1] = theta[1] * scale ** 2
+    loglik = loglik - nobs * np.log(scale)
+
+    return theta, loglik, converged, iterations, evaluations, nobs, sigma2
+
+
+def fit_garch_batch(returns, tickers=None, o=0, maxiter=100, tol=1e-10):
+    """
+    Fits GARCH(1,1) (o=1: GJR(1,1,1)) to every column of a
+    (T × N) returns panel.
+
+    Parameters
+    ----------
+    returns : pd.DataFrame or ndarray
+        Date × Ticker log returns; NaN marks missing days
+        (each column is fitted on its own non-NaN values).
+    tickers : list of str, optional
+        Column names when returns is an ndarray.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker with the models.garch.extract_garch_params
+        columns (omega, alpha, beta, persistence, long_run_vol, AIC,
+        BIC) plus mu, loglik, nobs and a per-ticker Converged flag.
+        Tickers with fewer than MIN_OBS observations get NaN
+        parameters and Converged False.
+        With o=1 there is a gamma column and persistence is
+        alpha + gamma / 2 + beta, as in extract_gjr_params.
+    """
+
+    if isinstance(returns, pd.DataFrame):
+        tickers = list(returns.columns)
+    elif tickers is None:
+        tickers = list(range(np.shape(returns)[1]))
+
+    returns = np.asarray(returns, dtype=np.float64)
+
+    # too-short columns stay out of the joint fit: NaN parameters,
+    # Converged False, as a failed per-ticker fit
+    nobs = np.isfinite(returns).sum(axis=0)
+    fitted = nobs >= MIN_OBS
+
+    k = 4 + o
+    theta = np.full((k, len(tickers)), np.nan)
+    loglik = np.full(len(tickers), np.nan)
+    converged = np.zeros(len(tickers), dtype=bool)
+
+    if fitted.any():
+        theta[:, fitted], loglik[fitted], converged[fitted], _, _, _, _ = (
+            _estimate(returns[:, fitted], o, maxiter, tol)
+        )
+
+    mu, omega, alpha, gamma, beta = _unpack(theta)
+
+    persistence = alpha + 0.5 * gamma + beta
+
+    fit = pd.DataFrame({
+        "Ticker": tickers,
+        "mu": mu,
+        "omega": omega,
+        "alpha": alpha,
+        "beta": beta,
+        "persistence": persistence,
+        "long_run_vol": np.sqrt(omega / (1 - persistence)),
+        "loglik": loglik,
+        "AIC": -2 * loglik + 2 * k,
+        "BIC": -2 * loglik + k * np.log(np.maximum(nobs, 1)),
+        "nobs": nobs,
+        "Converged": converged
+    })
+
+    if o:
+        fit.insert(4, "gamma", gamma)
+
+    return fit
+
+
+def fit_garch_analytic(series, o=0, starting_values=None, maxiter=100,
+                       tol=1e-10):
+    """
+    Single-series fit with the analytic-score estimator, returned
+    as arch's result of the same model (models.fit_cache.restore_result).
+
+    model_switching.registry.fit_model(..., backend="analytic")
+    routes GARCH (o=0) and GJR (o=1) here.
+    """
+    from models.fit_cache import restore_result
+    from models.garch import GARCH_SPEC
+    from models.gjr_garch import GJR_GARCH_SPEC
+
+    values = np.asarray(series, dtype=np.float64)
+
+    theta, _, converged, iterations, evaluations, _, _ = _estimate(
+        values[:, None], o, maxiter, tol, starting_values
+    )
+
+    return restore_result(
+        series,
+        GJR_GARCH_SPEC if o else GARCH_SPEC,
+        theta[:, 0],
+        convergence_flag=0 if converged[0] else 1,
+        nit=int(iterations[0]),
+        nfev=int(evaluations[0]),
+        rsquared=0.0,                   # constant mean
+        message="Analytic-score Newton (models.garch_batch)"
+    )
@@ -1,21 +1,22 @@
-from arch import arch_model
 import numpy as np
 
+from models.fit_cache import cached_fit
+
+GJR_GARCH_SPEC = dict(
+    mean="Constant",
+    vol="GARCH",
+    p=1,
+    o=1,   # GJR asymmetry term
+    q=1,
+    dist="normal",
+    rescale=False
+)
+
 # -----------------------------------
 # Fit GJR-GARCH(1,1)
 # -----------------------------------
 def fit_gjr_garch(series):
-    model = arch_model(
-        series,
-        mean="Constant",
-        vol="GARCH",
-        p=1,
-        o=1,   # GJR asymmetry term
-        q=1,
-        dist="normal",
-        rescale=False
-    )
-    return model.fit(disp="off")
+    return cached_fit(series, GJR_GARCH_SPEC)
 
 
 # -----------------------------------
@@ -1,83 +1,64 @@
 import pandas as pd
-import numpy as np
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
 
-GARCH_PATH  = "outputs/garch_results_50stocks.csv"
-EGARCH_PATH = "outputs/egarch_results_50stocks.csv"
-GJR_PATH    = "outputs/gjr_garch_results_50stocks.csv"
-
 OUTPUT_PATH = "outputs/model_comparison_summary.csv"
 
-# --------------------------------------------------
-# LOAD DATA
-# --------------------------------------------------
 
-garch_df  = pd.read_csv(GARCH_PATH)
-egarch_df = pd.read_csv(EGARCH_PATH)
-gjr_df    = pd.read_csv(GJR_PATH)
+def compare_models(long_df):
+    """
+    AIC/BIC comparison from the long (Ticker, Model) fit table
+    produced by models.batch_fit.fit_universe.
 
-# --------------------------------------------------
-# KEEP ONLY COMPARISON COLUMNS
-# --------------------------------------------------
+    One row per ticker with AIC_<MODEL> / BIC_<MODEL> columns,
+    Best_Model (lowest AIC) and Best_Model_BIC.
+    """
 
-garch_df = garch_df[["Ticker", "AIC", "BIC"]].rename(
-    columns={"AIC": "AIC_GARCH", "BIC": "BIC_GARCH"}
-)
-
-egarch_df = egarch_df[["Ticker", "AIC", "BIC"]].rename(
-    columns={"AIC": "AIC_EGARCH", "BIC": "BIC_EGARCH"}
-)
-
-gjr_df = gjr_df[["Ticker", "AIC", "BIC"]].rename(
-    columns={"AIC": "AIC_GJR", "BIC": "BIC_GJR"}
-)
-
-# --------------------------------------------------
-# MERGE ALL MODELS
-# --------------------------------------------------
+    # --------------------------------------------------
+    # KEEP ONLY COMPARISON COLUMNS (ONE ROW PER TICKER)
+    # --------------------------------------------------
+    ok = long_df[long_df["AIC"].notna()]
 
-compare_df = (
-    garch_df
-    .merge(egarch_df, on="Ticker")
-    .merge(gjr_df, on="Ticker")
-)
+    wide = ok.pivot(index="Ticker", columns="Model", values=["AIC", "BIC"])
 
-# --------------------------------------------------
-# SELECT BEST MODEL (LOWEST AIC)
-# --------------------------------------------------
+    # models that failed for every ticker drop out of the comparison
+    fitted = set(ok["Model"])
+    models = [m for m in dict.fromkeys(long_df["Model"]) if m in fitted]
 
-aic_cols = ["AIC_GARCH", "AIC_EGARCH", "AIC_GJR"]
+    # tickers fitted by every model, as the old merge kept
+    wide = wide.dropna()
 
-compare_df["Best_Model"] = compare_df[aic_cols].idxmin(axis=1)
-compare_df["Best_Model"] = compare_df["Best_Model"].str.replace("AIC_", "")
+    compare_df = pd.DataFrame(index=wide.index)
+    for model_name in models:
+        compare_df[f"AIC_{model_name}"] = wide[("AIC", model_name)]
+        compare_df[f"BIC_{model_name}"] = wide[("BIC", model_name)]
 
-# --------------------------------------------------
-# OPTIONAL: SECONDARY CHECK USING BIC
-# --------------------------------------------------
+    compare_df = compare_df.reset_index()
 
-bic_cols = ["BIC_GARCH", "BIC_EGARCH", "BIC_GJR"]
+    # --------------------------------------------------
+    # SELECT BEST MODEL (LOWEST AIC)
+    # --------------------------------------------------
+    aic_cols = [f"AIC_{m}" for m in models]
 
-compare_df["Best_Model_BIC"] = compare_df[bic_cols].idxmin(axis=1)
-compare_df["Best_Model_BIC"] = compare_df["Best_Model_BIC"].str.replace("BIC_", "")
+    compare_df["Best_Model"] = compare_df[aic_cols].idxmin(axis=1)
+    compare_df["Best_Model"] = compare_df["Best_Model"].str.replace("AIC_", "")
 
-# --------------------------------------------------
-# SAVE OUTPUT
-# --------------------------------------------------
+    # --------------------------------------------------
+    # OPTIONAL: SECONDARY CHECK USING BIC
+    # --------------------------------------------------
+    bic_cols = [f"BIC_{m}" for m in models]
 
-compare_df.to_csv(OUTPUT_PATH, index=False)
+    compare_df["Best_Model_BIC"] = compare_df[bic_cols].idxmin(axis=1)
+    compare_df["Best_Model_BIC"] = compare_df["Best_Model_BIC"].str.replace("BIC_", "")
 
-print("\n Model comparison completed")
-print(f" Output saved to: {OUTPUT_PATH}")
+    return compare_df
 
-# --------------------------------------------------
-# QUICK SUMMARY
-# --------------------------------------------------
 
-print("\n Best model count (AIC-based):")
-print(compare_df["Best_Model"].value_counts())
+def print_comparison(compare_df):
+    print("\n Best model count (AIC-based):")
+    print(compare_df["Best_Model"].value_counts())
 
-print("\n Best model count (BIC-based):")
-print(compare_df["Best_Model_BIC"].value_counts())
+    print("\n Best model count (BIC-based):")
+    print(compare_df["Best_Model_BIC"].value_counts())
@@ -0,0 +1,162 @@
+import json
+
+import numpy as np
+
+# -------------------------------------------------
+# STREAMING VOLATILITY UPDATES
+# -------------------------------------------------
+#
+# Runs a fitted model's variance recursion forward one return at a
+# time with the parameters held fixed (no optimiser calls). The
+# state is the last conditional variance and residual, so each
+# update is O(1) and the filter round-trips through a small dict /
+# JSON file between jobs.
+#
+# Recursions (arch's parameterisation, constant mean mu):
+#   GARCH   s2' = omega + alpha e^2 + beta s2
+#   GJR     s2' = omega + (alpha + gamma 1[e < 0]) e^2 + beta s2
+#   EGARCH  ln s2' = omega + alpha (|z| - sqrt(2/pi)) + gamma z
+#                    + beta ln s2,          z = e / sqrt(s2)
+
+FILTER_MODELS = ("GARCH", "GJR", "EGARCH")
+
+SQRT_2_OVER_PI = np.sqrt(2 / np.pi)
+
+
+class VolatilityFilter:
+    """
+    Fixed-parameter GARCH / GJR / EGARCH variance filter.
+
+    sigma2 and resid are the conditional variance and residual of
+    the last observed return; forecast_variance() is the variance
+    for the next one.
+    """
+
+    __slots__ = (
+        "model", "mu", "omega", "alpha", "beta", "gamma",
+        "sigma2", "resid", "nobs"
+    )
+
+    def __init__(self, model, mu, omega, alpha, beta, gamma=0.0,
+                 sigma2=np.nan, resid=0.0, nobs=0):
+        if model not in FILTER_MODELS:
+            raise ValueError(f"No volatility filter for {model}")
+
+        self.model = model
+        self.mu = float(mu)
+        self.omega = float(omega)
+        self.alpha = float(alpha)
+        self.beta = float(beta)
+        self.gamma = float(gamma)
+        self.sigma2 = float(sigma2)
+        self.resid = float(resid)
+        self.nobs = int(nobs)
+
+    @classmethod
+    def from_result(cls, result, model, returns):
+        """
+        Filter positioned at the end of a fit.
+
+        result is an arch result of the registry model `model`,
+        fitted on `returns`.
+        """
+
+        params = result.params
+        vol = np.asarray(result.conditional_volatility, dtype=np.float64)
+        returns = np.asarray(returns, dtype=np.float64)
+
+        vol = vol[np.isfinite(vol)]
+        returns = returns[np.isfinite(returns)]
+
+        return cls(
+            model=model,
+            mu=params["mu"],
+            omega=params["omega"],
+            alpha=params["alpha[1]"],
+            beta=params["beta[1]"],
+            gamma=params.get("gamma[1]", 0.0),
+            sigma2=vol[-1] ** 2,
+            resid=returns[-1] - params["mu"],
+            nobs=len(returns)
+        )
+
+    # -----------------------------------
+    # Filtering
+    # -----------------------------------
+
+    def forecast_variance(self):
+        """
+        One-step-ahead conditional variance.
+        """
+
+        e, s2 = self.resid, self.sigma2
+
+        if self.model == "EGARCH":
+            z = e / np.sqrt(s2)
+            return float(np.exp(
+                self.omega
+                + self.alpha * (abs(z) - SQRT_2_OVER_PI)
+                + self.gamma * z
+                + self.beta * np.log(s2)
+            ))
+
+        arch_term = self.alpha
+        if self.model == "GJR" and e < 0:
+            arch_term += self.gamma
+
+        return self.omega + arch_term * e * e + self.beta * s2
+
+    def forecast_volatility(self):
+        return float(np.sqrt(self.forecast_variance()))
+
+    def update(self, value):
+        """
+        Adds one return; returns its conditional variance
+        (the forecast made before seeing it).
+        """
+
+        self.sigma2 = self.forecast_variance()
+        self.resid = float(value) - self.mu
+        self.nobs += 1
+
+        return self.sigma2
+
+    def update_many(self, values):
+        """
+        update() over a sequence; returns the conditional
+        variances as an array.
+        """
+
+        return np.array([self.update(v) for v in values])
+
+    # -----------------------------------
+    # Serialisation
+    # -----------------------------------
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return (
+            f"VolatilityFilter({self.model}, nobs={self.nobs}, "
+            f"next_vol={self.forecast_volatility():.6g})"
+        )
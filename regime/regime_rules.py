@@ -1,13 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from regime.volatility_regime import REGIME_LABELS
+
+# Position multiplier per regime code (LOW, MEDIUM, HIGH); the extra
+# last entry is what code -1 (missing / UNKNOWN) picks up
+REGIME_MULTIPLIERS = np.array([
+    1.2,    # LOW: slightly aggressive
+    1.0,    # MEDIUM: normal
+    0.5,    # HIGH: defensive
+    0.0     # UNKNOWN → no trade
+])
+
+
+def regime_multiplier(regimes):
+    """
+    Position multipliers of regime codes (int array, or categorical
+    regimes) as one table lookup.
+    """
+
+    if isinstance(regimes, pd.Series) and isinstance(
+        regimes.dtype, pd.CategoricalDtype
+    ):
+        regimes = regimes.cat.codes
+    elif isinstance(regimes, pd.Categorical):
+        regimes = regimes.codes
+
+    return REGIME_MULTIPLIERS[np.asarray(regimes)]
+
+
 def regime_position_multiplier(regime):
     """
-    Position control based on volatility regime
+    Position control based on volatility regime (one label)
     """
 
-    if regime == "LOW":
-        return 1.2     # slightly aggressive
-    elif regime == "MEDIUM":
-        return 1.0     # normal
-    elif regime == "HIGH":
-        return 0.5     # defensive
-    else:
-        return 0.0     # UNKNOWN → no trade
+    code = {label: code for code, label in enumerate(REGIME_LABELS)}
+
+    return REGIME_MULTIPLIERS[code.get(regime, -1)]
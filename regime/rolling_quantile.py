@@ -0,0 +1,152 @@
+import bisect
+from collections import deque
+
+import numpy as np
+from scipy import ndimage
+
+# -------------------------------------------------
+# ROLLING QUANTILES
+# -------------------------------------------------
+#
+# Trailing-window quantiles with pandas' rolling(window).quantile(q)
+# semantics: linear interpolation between order statistics, NaN
+# until a full window of non-missing values is available.
+#
+#   RollingQuantiles      sorted buffer of the current window; push()
+#                         adds one observation and returns every
+#                         quantile at once, for live regime updates.
+#                         Binary search finds the slots, but inserting
+#                         into / deleting from the list shifts its tail:
+#                         O(window) per push (a memmove, cheap for
+#                         regime-sized windows).
+#   rolling_quantiles     a whole series or (dates x tickers) panel in
+#                         one call: each order statistic the quantiles
+#                         need is one compiled sliding rank filter
+#                         over all columns.
+
+
+def _ranks(quantile, window):
+    """
+    (lower rank, upper rank, fraction) of a quantile of `window`
+    sorted values.
+    """
+
+    position = quantile * (window - 1)
+    lower = int(position)
+
+    if position == lower:
+        return lower, lower, 0.0
+
+    return lower, lower + 1, position - lower
+
+
+class RollingQuantiles:
+    """
+    Several quantiles of the last `window` observations, updated
+    one observation at a time.
+    """
+
+    __slots__ = ("window", "quantiles", "_ranks", "_values", "_sorted")
+
+    def __init__(self, window, quantiles):
+        if window < 1:
+            raise ValueError("window must be positive")
+
+        self.window = int(window)
+        self.quantiles = tuple(quantiles)
+        self._ranks = [_ranks(q, self.window) for q in self.quantiles]
+
+        self._values = deque()      # window in arrival order (with NaN)
+        self._sorted = []           # its non-missing values, sorted
+
+    def push(self, value):
+        """
+        Adds one observation; returns the window's quantiles (NaN
+        while it holds fewer than `window` non-missing values).
+        O(window): the sorted list shifts on insert / delete.
+        """
+
+        value = float(value)
+
+        self._values.append(value)
+        if value == value:
+            bisect.insort(self._sorted, value)
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if old == old:
+                del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+        return self.current()
+
+    def current(self):
+        if len(self._sorted) < self.window:
+            return np.full(len(self.quantiles), np.nan)
+
+        s = self._sorted
+
+        return np.array([
+            s[lower] if lower == upper
+            else s[lower] + (s[upper] - s[lower]) * fraction
+            for lower, upper, fraction in self._ranks
+        ])
+
+    def update_many(self, values):
+        """
+        push() for each value; (len(values), len(quantiles)) array.
+        """
+
+        return np.array(
+            [self.push(value) for value in values],
+            dtype=np.float64
+        ).reshape(-1, len(self.quantiles))
+
+
+def rolling_quantiles(values, window, quantiles):
+    """
+    Trailing-window quantiles of a series or (dates x tickers) panel
+    (rolling along the first axis).
+
+    Returns one array shaped like `values` per quantile.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    shape = values.shape
+    window = int(window)
+
+    # columns back to back; windows straddling two columns only
+    # cover a column's first window - 1 rows, which are NaN anyway
+    panel = values.reshape(shape[0], -1).T
+    missing = np.isnan(panel)
+    flat = np.where(missing, 0.0, panel).ravel()
+
+    # NaN until a full window without missing values
+    counts = np.cumsum(missing, axis=1)
+    counts[:, window:] -= counts[:, :-window]
+    invalid = counts > 0
+    invalid[:, :window - 1] = True
+
+    # each order statistic once, shared between quantiles
+    ranks = [_ranks(q, window) for q in quantiles]
+    order_stats = {
+        rank: ndimage.rank_filter(
+            flat, rank, size=window, origin=(window - 1) // 2
+        ).reshape(panel.shape)
+        for lower, upper, _ in ranks
+        for rank in (lower, upper)
+    }
+
+    results = []
+
+    for lower, upper, fraction in ranks:
+        low = order_stats[lower]
+
+        if lower == upper:
+            q = low.copy()
+        else:
+            q = low + (order_stats[upper] - low) * fraction
+
+        q[invalid] = np.nan
+        results.append(q.T.reshape(shape))
+
+    return tuple(results)
@@ -1,5 +1,60 @@
+import numpy as np
 import pandas as pd
 
+from regime.rolling_quantile import RollingQuantiles, rolling_quantiles
+
+# Regime codes (int8) and their labels
+LOW, MEDIUM, HIGH = 0, 1, 2
+REGIME_LABELS = np.array(["LOW", "MEDIUM", "HIGH"])
+
+# Regimes in frames: categorical over the int8 codes
+REGIME_DTYPE = pd.CategoricalDtype(REGIME_LABELS, ordered=True)
+
+REGIME_QUANTILES = (0.33, 0.66)
+
+
+def classify_volatility_regimes(vol, low_q, high_q):
+    """
+    int8 regime codes of vol against its low / high quantile
+    thresholds (arrays of one shape). MEDIUM where a threshold
+    is missing.
+    """
+
+    vol = np.asarray(vol, dtype=np.float64)
+    low_q = np.asarray(low_q, dtype=np.float64)
+    high_q = np.asarray(high_q, dtype=np.float64)
+
+    return np.select(
+        [
+            np.isnan(low_q) | np.isnan(high_q),   # FIX: no UNKNOWN
+            vol < low_q,
+            vol < high_q
+        ],
+        [MEDIUM, LOW, MEDIUM],
+        default=HIGH
+    ).astype(np.int8)
+
+
+def detect_volatility_regime_panel(vol_df, window=60):
+    """
+    LOW / MEDIUM / HIGH regime codes for every column of a
+    (dates x tickers) volatility panel at once, from rolling
+    quantiles (NO look-ahead).
+    """
+
+    vol_df = pd.DataFrame(vol_df)
+
+    low_q, high_q = rolling_quantiles(
+        vol_df.to_numpy(dtype=np.float64), window, REGIME_QUANTILES
+    )
+
+    return pd.DataFrame(
+        classify_volatility_regimes(vol_df, low_q, high_q),
+        index=vol_df.index,
+        columns=vol_df.columns
+    )
+
+
 def detect_volatility_regime(vol_series, window=60):
     """
     Detect LOW / MEDIUM / HIGH volatility regimes
@@ -8,19 +63,37 @@ def detect_volatility_regime(vol_series, window=60):
 
     vol = pd.Series(vol_series).reset_index(drop=True)
 
-    low_q  = vol.rolling(window).quantile(0.33)
-    high_q = vol.rolling(window).quantile(0.66)
+    codes = detect_volatility_regime_panel(vol.to_frame(), window).iloc[:, 0]
+
+    return pd.Series(
+        regime_categorical(codes.to_numpy()),
+        index=vol.index,
+        name="Vol_Regime"
+    )
+
+
+def regime_categorical(codes):
+    """
+    Regime codes as a LOW / MEDIUM / HIGH categorical (no copy of
+    the labels per element).
+    """
+
+    return pd.Categorical.from_codes(codes, dtype=REGIME_DTYPE)
+
+
+class VolatilityRegimeTracker:
+    """
+    Live regime of one volatility series: push() each new value
+    (O(window), see RollingQuantiles) for its regime code, as
+    detect_volatility_regime_panel would assign it.
+    """
+
+    __slots__ = ("quantiles",)
 
-    regimes = []
+    def __init__(self, window=60):
+        self.quantiles = RollingQuantiles(window, REGIME_QUANTILES)
 
-    for v, l, h in zip(vol, low_q, high_q):
-        if pd.isna(l) or pd.isna(h):
-            regimes.append("MEDIUM")  # FIX: no UNKNOWN
-        elif v < l:
-            regimes.append("LOW")
-        elif v < h:
-            regimes.append("MEDIUM")
-        else:
-            regimes.append("HIGH")
+    def push(self, vol):
+        low_q, high_q = self.quantiles.push(vol)
 
-    return pd.Series(regimes, index=vol.index, name="Vol_Regime")
+        return classify_volatility_regimes(vol, low_q, high_q)[()]
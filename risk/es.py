@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 from scipy.stats import norm
 
+from scripts.returns_universe import ticker_frame
+
 # -------------------------------------------------
 # EXPECTED SHORTFALL (ES / CVaR)
 # SINGLE ASSET — GARCH BASED
@@ -16,15 +18,14 @@ def compute_es(
     """
     Computes Historical, Parametric and GARCH-based ES.
     Logic EXACTLY SAME as Code 13.
+
+    returns_df may also be a ReturnsUniverse.
     """
 
     # -----------------------------------
     # STEP 1: Prepare returns
     # -----------------------------------
-    returns = returns_df.loc[
-        returns_df["Ticker"] == stock,
-        "log_return"
-    ].values
+    returns = ticker_frame(returns_df, stock)["log_return"].values
 
     # -----------------------------------
     # STEP 2: Align with GARCH volatility
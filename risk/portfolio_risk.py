@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from scripts.returns_panel import return_matrix
+
 # -------------------------------------------------
 # PORTFOLIO-LEVEL RISK
 # VaR, ES & Diversification
@@ -25,17 +27,7 @@ def compute_portfolio_risk(
     # -----------------------------------
     # STEP 1: Prepare aligned return matrix
     # -----------------------------------
-    portfolio_df = (
-        returns_df[
-            returns_df["Ticker"].isin(portfolio_stocks)
-        ]
-        .pivot(
-            index="Date",
-            columns="Ticker",
-            values="log_return"
-        )
-        .dropna()
-    )
+    portfolio_df = return_matrix(returns_df, portfolio_stocks).dropna()
 
     # -----------------------------------
     # STEP 2: Equal-weight portfolio
@@ -86,15 +78,9 @@ def compute_portfolio_risk(
     # -----------------------------------
     # STEP 4: Diversification Benefit (aligned universe)
     # -----------------------------------
-    aligned_returns = returns_df[
-        returns_df["Date"].isin(portfolio_df.index)
-        & returns_df["Ticker"].isin(portfolio_stocks)
-    ]
-
-    individual_var = (
-        aligned_returns
-        .groupby("Ticker")["log_return"]
-        .apply(lambda x: abs(np.percentile(x, 5)))
+    # portfolio_df already holds every stock on the aligned dates
+    individual_var = portfolio_df.apply(
+        lambda x: abs(np.percentile(x, 5))
     )
 
     portfolio_var_95 = risk_df.loc[
@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 from scipy.stats import norm
 
+from scripts.returns_universe import ticker_frame
+
 # -------------------------------------------------
 # VALUE AT RISK (VaR)
 # SINGLE ASSET — GARCH BASED
@@ -19,15 +21,18 @@ def compute_var(
     """
     Computes Historical, Parametric and GARCH-based VaR.
     Logic EXACTLY SAME as your Code 13.
+
+    returns_df may also be a ReturnsUniverse.
     """
 
     # -----------------------------------
     # Prepare returns (NO NaN, NO mismatch)
     # -----------------------------------
-    returns = returns_df.loc[
-        returns_df["Ticker"] == stock,
-        "log_return"
-    ].dropna().values
+    returns = (
+        ticker_frame(returns_df, stock)["log_return"]
+        .dropna()
+        .values
+    )
 
     garch_vol = np.asarray(
         garch_result.conditional_volatility
@@ -0,0 +1,575 @@
+# =========================================================
+# IN-PROCESS PIPELINE ENGINE
+# Stages declare inputs / outputs → run as a DAG
+# =========================================================
+
+import os
+import sys
+import ast
+import time
+import shutil
+import pickle
+import hashlib
+import inspect
+import textwrap
+import importlib
+import importlib.util
+import importlib.metadata
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    func receives its declared inputs as keyword arguments and
+    returns a dict holding its declared outputs (or None if it
+    has none). serial=True stages never overlap another stage
+    (used for anything touching matplotlib's global state).
+
+    Cache fingerprint (see StageCache):
+    code      extra modules whose source the stage depends on
+              (modules its function imports, directly or through
+              other repo modules, are found automatically)
+    config    config modules whose UPPERCASE values it reads
+    files     input files / directories read from disk
+    artifacts files / directories it writes (restored on a hit)
+    """
+
+    name: str
+    func: callable
+    title: str = ""
+    inputs: tuple = ()
+    outputs: tuple = ()
+    serial: bool = False
+    after: tuple = field(default=())   # ordering-only dependencies
+    code: tuple = ()
+    config: tuple = ()
+    files: tuple = ()
+    artifacts: tuple = ()
+    cache: bool = True
+
+
+# =========================================================
+# CONTENT-ADDRESSED STAGE CACHE
+# =========================================================
+
+def _hash_path(path, h):
+    """
+    Feeds a file's bytes (or every file under a directory,
+    in sorted order) into the hash.
+    """
+
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                h.update(os.path.relpath(full, path).encode())
+                _hash_path(full, h)
+
+    elif os.path.exists(path):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+    else:
+        h.update(b"<missing>")
+
+
+# Modules under this directory are part of a stage's code fingerprint
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _repo_source(module_name):
+    """
+    Source file of a module living under SOURCE_ROOT, else None
+    (third-party / stdlib modules, namespace packages, attributes).
+    """
+
+    top, *parts = module_name.split(".")
+
+    try:
+        spec = importlib.util.find_spec(top)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None:
+        return None
+
+    root = os.path.abspath(SOURCE_ROOT) + os.sep
+    origin = spec.origin if (spec.origin or "").endswith(".py") else None
+    locations = list(spec.submodule_search_locations or [])
+
+    if not any(
+        os.path.abspath(loc).startswith(root)
+        for loc in locations + ([origin] if origin else [])
+    ):
+        return None
+
+    # Resolve submodules on disk (find_spec would import parents)
+    for part in parts:
+        if not locations:
+            return None     # attribute of a module, not a submodule
+
+        origin, found = None, []
+        for loc in locations:
+            if os.path.isfile(os.path.join(loc, part + ".py")):
+                origin = os.path.join(loc, part + ".py")
+                break
+            if os.path.isdir(os.path.join(loc, part)):
+                found.append(os.path.join(loc, part))
+
+        locations = [] if origin else found
+
+        if origin is None:
+            if not found:
+                return None
+            init = os.path.join(found[0], "__init__.py")
+            origin = init if os.path.isfile(init) else None
+
+    return origin
+
+
+def _imported_names(source, package=None):
+    """
+    Every module name an import statement in `source` may refer to,
+    including imports inside functions (the repo imports lazily).
+    `from a import b` yields both a and a.b.
+    """
+
+    names = set()
+
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                if package is None:
+                    continue
+                base = importlib.util.resolve_name(
+                    "." * node.level + base, package
+                )
+
+            names.add(base)
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+
+    return names
+
+
+def stage_modules(stage):
+    """
+    Repo modules a stage's code depends on: those its function
+    imports, its declared code modules, and everything they import
+    in turn (with their parent packages), as sorted module names.
+    """
+
+    try:
+        queue = _imported_names(
+            textwrap.dedent(inspect.getsource(stage.func))
+        )
+    except (OSError, TypeError, SyntaxError):
+        queue = set()
+
+    queue.update(stage.code)
+    found = {}
+
+    while queue:
+        name = queue.pop()
+        if name in found:
+            continue
+
+        parts = name.split(".")
+        queue.update(
+            ".".join(parts[:i]) for i in range(1, len(parts))
+        )
+
+        path = _repo_source(name)
+        found[name] = path
+
+        if path is None:
+            continue
+
+        if path.endswith("__init__.py"):
+            package = name
+        else:
+            package = name.rpartition(".")[0] or None
+
+        with open(path, encoding="utf-8") as f:
+            queue.update(_imported_names(f.read(), package))
+
+    missing = [m for m in stage.code if found.get(m) is None]
+    if missing:
+        raise ValueError(f"Cannot locate module source: {missing}")
+
+    return sorted(name for name, path in found.items() if path is not None)
+
+
+def _config_values(module_name):
+    module = importlib.import_module(module_name)
+    return sorted(
+        (k, repr(v)) for k, v in vars(module).items() if k.isupper()
+    )
+
+
+def _library_versions():
+    versions = [sys.version]
+    for name in ("numpy", "pandas", "scipy", "arch"):
+        try:
+            versions.append(f"{name}={importlib.metadata.version(name)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{name}=<missing>")
+    return versions
+
+
+class StageCache:
+    """
+    On-disk cache of stage results, keyed by a hash of:
+    - the keys of the stages it depends on (so any upstream
+      change propagates downstream)
+    - its own source plus every repo module it imports (directly
+      or indirectly) and its declared code modules
+    - declared config values and input files
+    - interpreter / numpy / pandas / scipy / arch versions
+
+    Layout: <root>/<stage>/<key>/outputs.pkl + artifacts/
+    """
+
+    def __init__(self, root, max_entries=3):
+        self.root = root
+        self.max_entries = max_entries
+
+    # -----------------------------------
+    # Keys
+    # -----------------------------------
+
+    def key(self, stage, upstream_keys):
+        h = hashlib.sha256()
+
+        h.update(stage.name.encode())
+
+        for name, key in sorted(upstream_keys.items()):
+            h.update(f"{name}:{key}".encode())
+
+        try:
+            h.update(inspect.getsource(stage.func).encode())
+        except (OSError, TypeError):
+            h.update(repr(stage.func).encode())
+
+        for module_name in stage_modules(stage):
+            h.update(module_name.encode())
+            _hash_path(_repo_source(module_name), h)
+
+        for module_name in sorted(stage.config):
+            h.update(repr(_config_values(module_name)).encode())
+
+        for path in sorted(stage.files):
+            h.update(path.encode())
+            _hash_path(path, h)
+
+        h.update(repr(_library_versions()).encode())
+
+        return h.hexdigest()[:24]
+
+    # -----------------------------------
+    # Load / save
+    # -----------------------------------
+
+    def _entry(self, stage_name, key):
+        return os.path.join(self.root, stage_name, key)
+
+    def load(self, stage, key):
+        """
+        Returns cached outputs (restoring artifacts), or None on a miss.
+        """
+
+        entry = self._entry(stage.name, key)
+        outputs_path = os.path.join(entry, "outputs.pkl")
+
+        if not os.path.exists(outputs_path):
+            return None
+
+        for path in stage.artifacts:
+            cached = os.path.join(entry, "artifacts", path)
+            if not os.path.exists(cached):
+                return None
+
+        for path in stage.artifacts:
+            self._copy(os.path.join(entry, "artifacts", path), path)
+
+        with open(outputs_path, "rb") as f:
+            outputs = pickle.load(f)
+
+        os.utime(entry)   # most-recently-used
+        return outputs
+
+    def save(self, stage, key, outputs):
+        entry = self._entry(stage.name, key)
+        tmp = entry + ".tmp"
+
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp)
+        os.makedirs(tmp)
+
+        for path in stage.artifacts:
+            if os.path.exists(path):
+                self._copy(path, os.path.join(tmp, "artifacts", path))
+
+        with open(os.path.join(tmp, "outputs.pkl"), "wb") as f:
+            pickle.dump(
+                {name: outputs[name] for name in stage.outputs},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+        if os.path.isdir(entry):
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+
+        self._prune(stage.name)
+
+    def invalidate(self, stage_name=None):
+        """
+        Drops cached entries for one stage (or all stages).
+        """
+
+        path = (
+            os.path.join(self.root, stage_name)
+            if stage_name is not None
+            else self.root
+        )
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+
+    def _prune(self, stage_name):
+        stage_dir = os.path.join(self.root, stage_name)
+
+        entries = sorted(
+            (os.path.join(stage_dir, e) for e in os.listdir(stage_dir)),
+            key=os.path.getmtime,
+            reverse=True
+        )
+
+        for old in entries[self.max_entries:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    @staticmethod
+    def _copy(src, dst):
+        parent = os.path.dirname(dst)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        if os.path.isdir(src):
+            if os.path.isdir(dst):
+                shutil.rmtree(dst)
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+
+
+# =========================================================
+# PIPELINE
+# =========================================================
+
+class Pipeline:
+    """
+    Runs stages in dependency order inside one process.
+
+    Outputs are kept in memory and handed to downstream stages;
+    stages whose dependencies are met run concurrently on a
+    thread pool. With a StageCache, stages whose key is unchanged
+    are served from disk instead of being run.
+    """
+
+    def __init__(self, stages, cache=None):
+        self.stages = list(stages)
+        self.cache = cache
+        self.deps = self._resolve_dependencies()
+
+    # -----------------------------------
+    # Graph
+    # -----------------------------------
+
+    def _resolve_dependencies(self):
+        producers = {}
+
+        for stage in self.stages:
+            for out in stage.outputs:
+                if out in producers:
+                    raise ValueError(
+                        f"Output '{out}' produced by both "
+                        f"'{producers[out]}' and '{stage.name}'"
+                    )
+                producers[out] = stage.name
+
+        names = {stage.name for stage in self.stages}
+        deps = {}
+
+        for stage in self.stages:
+            missing = [i for i in stage.inputs if i not in producers]
+            if missing:
+                raise ValueError(
+                    f"Stage '{stage.name}' needs unknown inputs: {missing}"
+                )
+
+            unknown = [a for a in stage.after if a not in names]
+            if unknown:
+                raise ValueError(
+                    f"Stage '{stage.name}' runs after unknown stages: {unknown}"
+                )
+
+            deps[stage.name] = (
+                {producers[i] for i in stage.inputs} | set(stage.after)
+            )
+
+        self._check_acyclic(deps)
+        return deps
+
+    @staticmethod
+    def _check_acyclic(deps):
+        done = set()
+        remaining = dict(deps)
+
+        while remaining:
+            ready = [n for n, d in remaining.items() if d <= done]
+            if not ready:
+                raise ValueError(
+                    f"Dependency cycle between stages: {sorted(remaining)}"
+                )
+            for name in ready:
+                done.add(name)
+                del remaining[name]
+
+    # -----------------------------------
+    # Execution
+    # -----------------------------------
+
+    def run(self, max_workers=4, context=None, force=False, invalidate=()):
+        """
+        Executes every stage; returns the context dict of all outputs.
+
+        force=True recomputes every stage (and refreshes the cache);
+        invalidate lists stage names whose cached results are dropped.
+        """
+
+        context = dict(context or {})
+        pending = list(self.stages)
+        running = {}
+        done = set()
+        keys = {}
+        timings = {}
+        self.cached = []
+
+        if self.cache is not None:
+            for name in invalidate:
+                if name not in self.deps:
+                    raise ValueError(f"Unknown stage to invalidate: {name}")
+                self.cache.invalidate(name)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+            while pending or running:
+
+                # ---- serve from cache / submit everything ready ----
+                for stage in list(pending):
+                    if not self.deps[stage.name] <= done:
+                        continue
+
+                    serial_running = any(s.serial for s in running.values())
+                    if serial_running or (stage.serial and running):
+                        break
+
+                    pending.remove(stage)
+                    keys[stage.name] = self._stage_key(stage, keys)
+
+                    outputs = self._load_cached(stage, keys, force)
+                    if outputs is not None:
+                        self._store_outputs(stage, outputs, context)
+                        done.add(stage.name)
+                        timings[stage.name] = 0.0
+                        self.cached.append(stage.name)
+                        print(f" CACHED: {stage.title or stage.name}")
+                        continue
+
+                    running[self._submit(pool, stage, context)] = stage
+
+                    if stage.serial:
+                        break
+
+                if not running:
+                    continue
+
+                # ---- collect finished stages ----
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    stage = running.pop(future)
+
+                    try:
+                        outputs, elapsed = future.result()
+                    except Exception as exc:
+                        for other in running:
+                            other.cancel()
+                        raise RuntimeError(
+                            f"FAILED: {stage.title or stage.name}"
+                        ) from exc
+
+                    self._store_outputs(stage, outputs, context)
+                    done.add(stage.name)
+                    timings[stage.name] = elapsed
+
+                    if self.cache is not None and stage.cache:
+                        self.cache.save(stage, keys[stage.name], context)
+
+                    print(
+                        f" DONE: {stage.title or stage.name} "
+                        f"({elapsed:.1f}s)"
+                    )
+
+        self.timings = timings
+        self.keys = keys
+        return context
+
+    def _stage_key(self, stage, keys):
+        if self.cache is None:
+            return None
+
+        upstream = {name: keys[name] for name in self.deps[stage.name]}
+        return self.cache.key(stage, upstream)
+
+    def _load_cached(self, stage, keys, force):
+        if self.cache is None or force or not stage.cache:
+            return None
+
+        return self.cache.load(stage, keys[stage.name])
+
+    def _submit(self, pool, stage, context):
+        print("\n" + "=" * 60)
+        print(f"▶ {stage.title or stage.name}")
+        print("=" * 60)
+
+        kwargs = {name: context[name] for name in stage.inputs}
+        return pool.submit(self._timed_call, stage.func, kwargs)
+
+    @staticmethod
+    def _timed_call(func, kwargs):
+        start = time.perf_counter()
+        outputs = func(**kwargs)
+        return outputs, time.perf_counter() - start
+
+    @staticmethod
+    def _store_outputs(stage, outputs, context):
+        outputs = outputs or {}
+
+        missing = [o for o in stage.outputs if o not in outputs]
+        if missing:
+            raise RuntimeError(
+                f"Stage '{stage.name}' did not return outputs: {missing}"
+            )
+
+        for name in stage.outputs:
+            context[name] = outputs[name]
@@ -4,8 +4,11 @@
 # =========================================================
 
 import os
+import argparse
+import numpy as np
 import pandas as pd
-import subprocess
+
+from run.pipeline import Stage, Pipeline, StageCache
 
 # =========================================================
 # CONFIG
@@ -22,118 +25,336 @@ PORTFOLIO_STOCKS = [
 OUTPUT_DIR = "outputs/final"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# =========================================================
-# SAFE COMMAND RUNNER
-# =========================================================
+CHART_DIR = "outputs/charts"
 
-def run_cmd(cmd, title):
-    print("\n" + "="*60)
-    print(f"▶ {title}")
-    print("="*60)
-    result = subprocess.run(cmd, shell=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"FAILED: {title}")
-    print(f" DONE: {title}")
+# Content-addressed stage results (see run.pipeline.StageCache)
+CACHE_DIR = f"{OUTPUT_DIR}/.stage_cache"
 
 # =========================================================
-# PIPELINE START
+# STAGES
+# Each stage takes its inputs as keyword arguments and
+# returns its outputs as a dict (kept in memory).
 # =========================================================
 
-def main():
+def stage_preprocess():
+    from scripts.preprocess import preprocess_data
 
-    print("\n STARTING FULL QUANT PIPELINE (ONE COMMAND MODE)\n")
+    preprocess_data()
 
-    # -----------------------------------------------------
-    # 1️⃣ DATA PREPROCESSING
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m scripts.preprocess",
-        "Data preprocessing"
-    )
 
-    # -----------------------------------------------------
-    # 2️⃣ WALK-FORWARD + MODEL SWITCHING
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m walkforward.run_walkforward",
-        "Rolling walk-forward & model re-fitting"
-    )
+def stage_load_data():
+    from scripts.returns_universe import ReturnsUniverse
+    from scripts.returns_panel import load_returns_matrix
 
-    run_cmd(
-        "python -m walkforward.evaluation",
-        "Walk-forward evaluation"
-    )
+    return {
+        "universe": ReturnsUniverse.from_returns_data(
+            columns=["log_return"]
+        ),
+        "portfolio_returns": load_returns_matrix(PORTFOLIO_STOCKS)
+    }
 
-    # -----------------------------------------------------
-    # 3️⃣ SINGLE ASSET STRATEGY
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m backtest.single_asset",
-        "Single asset backtest (regime + return/vol)"
-    )
 
-    # -----------------------------------------------------
-    # 4️⃣ PORTFOLIO (BASELINE)
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m backtest.portfolio",
-        "Baseline portfolio backtest"
-    )
+def stage_fit_egarch(universe):
+    from models.egarch import fit_egarch
 
+    series = universe.returns(STOCK)
+    series = series[~np.isnan(series)]
 
-    # -----------------------------------------------------
-    # 5️⃣ PORTFOLIO (REGIME + RISK ALLOCATOR)
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m backtest.portfolio_regime",
-        "Regime-aware portfolio + risk allocator"
-    )
+    return {"egarch_result": fit_egarch(series)}
 
-    # -----------------------------------------------------
-    # 6️⃣ PORTFOLIO COMPARISON
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m backtest.portfolio_compare",
-        "Baseline vs Regime portfolio comparison"
-    )
 
-    # -----------------------------------------------------
-    # 7️⃣ RISK MODULES (SINGLE ASSET)
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m risk.var",
-        "Value-at-Risk (VaR)"
-    )
+def stage_walkforward(universe):
+    from walkforward.run_walkforward import run_walkforward
+
+    return {"walkforward_df": run_walkforward(universe)}
+
+
+def stage_walkforward_evaluation(walkforward_df):
+    from walkforward.evaluation import main as evaluate
+
+    evaluate(wf_df=walkforward_df)
+
+
+def stage_single_asset(universe, egarch_result):
+    from backtest.single_asset import main as single_asset
+
+    return {
+        "backtest_df": single_asset(
+            returns_df=universe,
+            egarch_result=egarch_result,
+            stock=STOCK
+        )
+    }
+
+
+def stage_portfolio(portfolio_returns):
+    from backtest.portfolio import main as portfolio
+
+    portfolio(returns_df=portfolio_returns)
+
+
+def stage_portfolio_regime(portfolio_returns):
+    from backtest.portfolio_regime import main as portfolio_regime
+
+    portfolio_regime(returns_df=portfolio_returns)
+
+
+def stage_portfolio_compare():
+    from backtest.portfolio_compare import compare_portfolios
+
+    compare_portfolios()
+
+
+def stage_var(universe, egarch_result):
+    from risk.var import compute_var
+
+    var = compute_var(universe, egarch_result, stock=STOCK)
+    var["VaR_Summary"].to_csv(f"{OUTPUT_DIR}/var_summary.csv", index=False)
+
+    return {"var": var}
 
-    run_cmd(
-        "python -m risk.es",
-        "Expected Shortfall (ES)"
+
+def stage_es(universe, egarch_result):
+    from risk.es import compute_es
+
+    es = compute_es(universe, egarch_result, stock=STOCK)
+    es["ES_Summary"].to_csv(f"{OUTPUT_DIR}/es_summary.csv", index=False)
+
+    return {"es": es}
+
+
+def stage_stress(universe, egarch_result):
+    from risk.stress_testing import run_stress_testing
+
+    stress = run_stress_testing(
+        universe.returns(STOCK),
+        egarch_result.conditional_volatility
     )
+    stress.to_csv(f"{OUTPUT_DIR}/stress_summary.csv", index=False)
+
+    return {"stress": stress}
+
+
+def stage_capital_allocation(var, es, stress):
+    from risk.capital_allocation import capital_allocation_analysis
 
-    run_cmd(
-        "python -m risk.stress_testing",
-        "Stress testing"
+    var_summary = var["VaR_Summary"].set_index("Method")
+    es_summary = es["ES_Summary"].set_index("Method")
+
+    capital = capital_allocation_analysis(
+        var_95=abs(var_summary.loc["Historical", "VaR (95%)"]),
+        es_95=abs(es_summary.loc["Historical", "Expected Shortfall (95%)"]),
+        stress_5d=stress["Estimated Loss"].iloc[-1]
     )
+    capital.to_csv(f"{OUTPUT_DIR}/capital_allocation.csv", index=False)
+
+    print(capital)
+
+
+def stage_diagnostics(backtest_df):
+    from diagnostics.run_all import main as diagnostics
 
-    run_cmd(
-        "python -m risk.capital_allocation",
-        "Capital allocation check"
+    diagnostics(backtest_df=backtest_df)
+
+
+def build_pipeline(cache=None):
+    from scripts.preprocess import (
+        COMBINED_PATH,
+        RAW_RETURNS_PATH,
+        CLEAN_RETURNS_PATH,
+        RETURNS_STORE_PATH
     )
+    from scripts.returns_panel import RETURNS_PANEL_PATH
 
-    # -----------------------------------------------------
-    # 8️⃣ DIAGNOSTICS
-    # -----------------------------------------------------
-    run_cmd(
-        "python -m diagnostics.run_all",
-        "Full diagnostics suite"
+    return Pipeline([
+        Stage(
+            "preprocess", stage_preprocess,
+            title="Data preprocessing",
+            outputs=(),
+            files=(COMBINED_PATH,),
+            artifacts=(
+                RAW_RETURNS_PATH,
+                CLEAN_RETURNS_PATH,
+                RETURNS_STORE_PATH,
+                RETURNS_PANEL_PATH
+            )
+        ),
+        Stage(
+            "load_data", stage_load_data,
+            title="Load returns (universe + portfolio panel)",
+            outputs=("universe", "portfolio_returns"),
+            after=("preprocess",),
+            cache=False   # re-reading the store is as cheap as unpickling
+        ),
+        Stage(
+            "fit_egarch", stage_fit_egarch,
+            title=f"EGARCH fit ({STOCK})",
+            inputs=("universe",),
+            outputs=("egarch_result",)
+        ),
+        Stage(
+            "walkforward", stage_walkforward,
+            title="Rolling walk-forward & model re-fitting",
+            inputs=("universe",),
+            outputs=("walkforward_df",),
+            config=("walkforward.config",)
+        ),
+        Stage(
+            "walkforward_evaluation", stage_walkforward_evaluation,
+            title="Walk-forward evaluation",
+            inputs=("walkforward_df",),
+            serial=True,
+            artifacts=(
+                f"{OUTPUT_DIR}/walkforward_metrics.csv",
+                f"{CHART_DIR}/walkforward_equity.png"
+            )
+        ),
+        Stage(
+            "single_asset", stage_single_asset,
+            title="Single asset backtest (regime + return/vol)",
+            inputs=("universe", "egarch_result"),
+            outputs=("backtest_df",),
+            serial=True,
+            artifacts=(f"{CHART_DIR}/{STOCK}_single_asset_equity.png",)
+        ),
+        Stage(
+            "portfolio", stage_portfolio,
+            title="Baseline portfolio backtest",
+            inputs=("portfolio_returns",),
+            config=("risk_allocator.config",),
+            artifacts=(
+                f"{OUTPUT_DIR}/portfolio_performance.csv",
+                f"{OUTPUT_DIR}/portfolio_equity.csv"
+            )
+        ),
+        Stage(
+            "portfolio_regime", stage_portfolio_regime,
+            title="Regime-aware portfolio + risk allocator",
+            inputs=("portfolio_returns",),
+            config=("risk_allocator.config",),
+            artifacts=(
+                f"{OUTPUT_DIR}/portfolio_regime_equity.csv",
+                f"{OUTPUT_DIR}/portfolio_regime_metrics.csv",
+                f"{OUTPUT_DIR}/portfolio_regime_risk_allocator.csv"
+            )
+        ),
+        Stage(
+            "portfolio_compare", stage_portfolio_compare,
+            title="Baseline vs Regime portfolio comparison",
+            after=("portfolio", "portfolio_regime"),
+            serial=True,
+            artifacts=(
+                f"{OUTPUT_DIR}/portfolio_comparison.csv",
+                f"{CHART_DIR}/portfolio_equity_comparison.png"
+            )
+        ),
+        Stage(
+            "var", stage_var,
+            title="Value-at-Risk (VaR)",
+            inputs=("universe", "egarch_result"),
+            outputs=("var",),
+            artifacts=(f"{OUTPUT_DIR}/var_summary.csv",)
+        ),
+        Stage(
+            "es", stage_es,
+            title="Expected Shortfall (ES)",
+            inputs=("universe", "egarch_result"),
+            outputs=("es",),
+            artifacts=(f"{OUTPUT_DIR}/es_summary.csv",)
+        ),
+        Stage(
+            "stress", stage_stress,
+            title="Stress testing",
+            inputs=("universe", "egarch_result"),
+            outputs=("stress",),
+            artifacts=(f"{OUTPUT_DIR}/stress_summary.csv",)
+        ),
+        Stage(
+            "capital_allocation", stage_capital_allocation,
+            title="Capital allocation check",
+            inputs=("var", "es", "stress"),
+            artifacts=(f"{OUTPUT_DIR}/capital_allocation.csv",)
+        ),
+        Stage(
+            "diagnostics", stage_diagnostics,
+            title="Full diagnostics suite",
+            inputs=("backtest_df",),
+            after=("portfolio_regime",),
+            serial=True,
+            artifacts=(
+                f"{OUTPUT_DIR}/diagnostic_regime_performance.csv",
+                f"{OUTPUT_DIR}/diagnostic_allocator_stats.csv",
+                f"{OUTPUT_DIR}/diagnostic_crisis_analysis.csv",
+                f"{CHART_DIR}/regime_distribution.png",
+                f"{CHART_DIR}/crisis_covid-19.png",
+                f"{CHART_DIR}/crisis_rate_hikes.png"
+            )
+        ),
+    ], cache=cache)
+
+# =========================================================
+# PIPELINE START
+# =========================================================
+
+def main(max_workers=4, use_cache=True, force=False, invalidate=()):
+
+    print("\n STARTING FULL QUANT PIPELINE (ONE COMMAND MODE)\n")
+
+    cache = StageCache(CACHE_DIR) if use_cache else None
+
+    pipeline = build_pipeline(cache=cache)
+    pipeline.run(
+        max_workers=max_workers,
+        force=force,
+        invalidate=invalidate
     )
 
     print("\n FULL PIPELINE COMPLETED SUCCESSFULLY")
     print(f" All results saved in → {OUTPUT_DIR}\n")
 
+    timings = pd.Series(pipeline.timings, name="Seconds").sort_values(
+        ascending=False
+    )
+    print(" Stage timings:\n")
+    print(timings.round(2).to_string())
+
+    if pipeline.cached:
+        print(f"\n Served from cache: {', '.join(pipeline.cached)}")
+
 # =========================================================
 # ENTRY POINT
 # =========================================================
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Stages allowed to run concurrently"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute every stage (cache is refreshed)"
+    )
+    parser.add_argument(
+        "--invalidate",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="Drop cached results of a stage (repeatable)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run without reading or writing the stage cache"
+    )
+    args = parser.parse_args()
+
+    main(
+        max_workers=args.workers,
+        use_cache=not args.no_cache,
+        force=args.force,
+        invalidate=args.invalidate
+    )
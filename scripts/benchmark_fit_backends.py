@@ -0,0 +1,108 @@
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import models.fit_cache
+from models.batch_fit import load_series_by_ticker
+from model_switching.registry import ANALYTIC_MODELS, fit_model
+
+# --------------------------------------------------
+# arch vs analytic-score backend
+# (model_switching.registry.fit_model)
+# --------------------------------------------------
+#
+# Fits GARCH and GJR to every stock with both backends (fit cache
+# off) and reports wall time, likelihood evaluations and how far the
+# estimates are apart. Evaluations: arch's nfev (each numerical
+# gradient costs one per parameter); analytic: likelihood plus
+# gradient passes.
+
+OUTPUT_PATH = "outputs/fit_backend_benchmark.csv"
+
+
+def _timed_fit(series, model_name, backend):
+    start = time.perf_counter()
+    result = fit_model(series, model_name, backend=backend)
+    return result, time.perf_counter() - start
+
+
+def benchmark(series_by_ticker, model_names=tuple(ANALYTIC_MODELS),
+              scale=1.0):
+    rows = []
+
+    cache = models.fit_cache.FIT_CACHE
+    models.fit_cache.FIT_CACHE = None
+
+    try:
+        for ticker, values in series_by_ticker.items():
+            values = values * scale
+
+            for model_name in model_names:
+                arch_res, arch_sec = _timed_fit(values, model_name, "arch")
+                fast_res, fast_sec = _timed_fit(values, model_name, "analytic")
+
+                rows.append({
+                    "Ticker": ticker,
+                    "Model": model_name,
+                    "arch_sec": arch_sec,
+                    "analytic_sec": fast_sec,
+                    "arch_evals": arch_res.optimization_result.nfev,
+                    "analytic_evals": fast_res.optimization_result.nfev,
+                    "loglik_gain": fast_res.loglikelihood - arch_res.loglikelihood,
+                    "max_param_diff": np.abs(
+                        fast_res.params - arch_res.params
+                    ).max()
+                })
+    finally:
+        models.fit_cache.FIT_CACHE = cache
+
+    return pd.DataFrame(rows)
+
+
+def main(tickers=None, scale=100.0):
+
+    series_by_ticker = load_series_by_ticker(tickers)
+
+    print(
+        f"\nBenchmarking fit backends on {len(series_by_ticker)} stocks "
+        f"(returns × {scale:g})...\n"
+    )
+
+    df = benchmark(series_by_ticker, scale=scale)
+    df.to_csv(OUTPUT_PATH, index=False)
+
+    summary = df.groupby("Model").agg(
+        arch_sec=("arch_sec", "sum"),
+        analytic_sec=("analytic_sec", "sum"),
+        arch_evals=("arch_evals", "median"),
+        analytic_evals=("analytic_evals", "median"),
+        loglik_gain_min=("loglik_gain", "min"),
+        max_param_diff=("max_param_diff", "median")
+    )
+    summary["speedup"] = summary["arch_sec"] / summary["analytic_sec"]
+
+    print(summary.round(4).to_string())
+    print(f"\n Per-fit results saved to: {OUTPUT_PATH}")
+
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--tickers",
+        nargs="+",
+        default=None,
+        help="Stocks to benchmark (default: all)"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=100.0,
+        help="Multiply returns (100 = percent, where arch converges well)"
+    )
+    args = parser.parse_args()
+
+    main(tickers=args.tickers, scale=args.scale)
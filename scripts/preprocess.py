@@ -1,16 +1,53 @@
+import os
+import shutil
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from scripts.returns_panel import (
+    append_returns_panel,
+    build_returns_panel,
+    RETURNS_PANEL_PATH
+)
+
+# -------------------------------------------------
+# PATHS
+# -------------------------------------------------
+
+COMBINED_PATH = "nifty50_history_with_adj/nifty50_combined_2015_2025.csv"
+
+RAW_RETURNS_PATH = "nifty50_history_with_adj/nifty50_log_returns_adjclose.csv"
+
+CLEAN_RETURNS_PATH = "nifty50_history_with_adj/nifty50_log_returns_clean.csv"
+
+# Columnar copy of the raw returns file, one Parquet partition per ticker
+RETURNS_STORE_PATH = "nifty50_history_with_adj/returns_store"
+
+# Last processed row per ticker (leading "_" keeps it out of the dataset)
+STORE_STATE_FILE = "_last_rows.parquet"
+
+CLEAN_COLUMNS = ["Date", "Ticker", "Adj Close", "Volume", "log_return"]
+
 # -------------------------------------------------
 # CORE PREPROCESSING LOGIC
 # -------------------------------------------------
 
-def preprocess_data():
+def preprocess_data(incremental=False):
+    """
+    Builds the log-return files from the combined price CSV.
+
+    incremental=True only processes rows newer than the last
+    processed date of each ticker and appends them to the
+    existing outputs (see preprocess_incremental).
+    """
+
+    if incremental and os.path.exists(_store_state_path()):
+        return preprocess_incremental()
 
     # Load combined CSV
     df = pd.read_csv(
-        "nifty50_history_with_adj/nifty50_combined_2015_2025.csv",
+        COMBINED_PATH,
         parse_dates=["Date"]
     )
 
@@ -26,36 +63,321 @@ def preprocess_data():
     )
 
     # Save raw returns
-    raw_path = "nifty50_history_with_adj/nifty50_log_returns_adjclose.csv"
+    raw_path = RAW_RETURNS_PATH
     df.to_csv(raw_path, index=False)
 
     print("Daily log-return file created (Adj Close only):")
     print(raw_path)
 
+    # Columnar store (read by load_returns_data)
+    write_returns_store(df)
+
+    print("Ticker-partitioned returns store created:")
+    print(RETURNS_STORE_PATH)
+
+    # Dense Date × Ticker panel (read by portfolio modules)
+    build_returns_panel(df)
+
+    print("Memory-mapped returns panel created:")
+    print(RETURNS_PANEL_PATH)
+
     # Clean data
     df = df.dropna(subset=["log_return"]).reset_index(drop=True)
     df.index = df.index + 1
     df["Date"] = pd.to_datetime(df["Date"]).dt.date
 
-    returns_df = df[["Date", "Ticker", "Adj Close", "Volume", "log_return"]]
+    returns_df = df[CLEAN_COLUMNS]
 
-    clean_path = "nifty50_history_with_adj/nifty50_log_returns_clean.csv"
+    clean_path = CLEAN_RETURNS_PATH
     returns_df.to_csv(clean_path, index=False)
 
     return returns_df
 
 
+def preprocess_incremental():
+    """
+    Append-only update of the processed returns.
+
+    Keeps rows of the combined CSV dated after the last processed
+    row of their ticker, seeds the first new log return from the
+    stored Adj Close, then appends to the store and both CSVs.
+    Return computation and writes scale with the new rows only.
+
+    The CSVs are appended to, so after an update they are no longer
+    sorted by Ticker / Date (load_returns_data sorts on read).
+    """
+
+    last_rows = _read_store_state()
+
+    df = pd.read_csv(
+        COMBINED_PATH,
+        parse_dates=["Date"]
+    )
+
+    if "Adj Close" not in df.columns:
+        raise ValueError("Adj Close column missing in combined CSV!")
+
+    # -----------------------------------
+    # Keep only rows after the last processed date
+    # -----------------------------------
+    last_rows = last_rows.set_index("Ticker")
+
+    last_date = df["Ticker"].map(last_rows["Date"])
+
+    new_df = df[last_date.isna() | (df["Date"] > last_date)]
+
+    if new_df.empty:
+        print("Returns already up to date, nothing to append.")
+        return pd.DataFrame(columns=CLEAN_COLUMNS)
+
+    new_df = new_df.sort_values(["Ticker", "Date"]).reset_index(drop=True)
+
+    # -----------------------------------
+    # Seed log returns from the previous Adj Close
+    # -----------------------------------
+    prev_close = new_df.groupby("Ticker")["Adj Close"].shift(1)
+    prev_close = prev_close.fillna(
+        new_df["Ticker"].map(last_rows["Adj Close"])
+    )
+
+    new_df["log_return"] = np.log(new_df["Adj Close"] / prev_close)
+
+    # -----------------------------------
+    # Append to processed outputs
+    # -----------------------------------
+    new_df.to_csv(RAW_RETURNS_PATH, mode="a", header=False, index=False)
+
+    append_returns_store(new_df)
+
+    # New dates / tickers grow the panel in place
+    append_returns_panel(new_df)
+
+    clean_df = new_df.dropna(subset=["log_return"]).reset_index(drop=True)
+    clean_df["Date"] = pd.to_datetime(clean_df["Date"]).dt.date
+    clean_df = clean_df[CLEAN_COLUMNS]
+
+    clean_df.to_csv(CLEAN_RETURNS_PATH, mode="a", header=False, index=False)
+
+    print(
+        f"Appended {len(new_df)} new rows for "
+        f"{new_df['Ticker'].nunique()} tickers."
+    )
+
+    return clean_df
+
+
+# -------------------------------------------------
+# COLUMNAR RETURNS STORE
+# -------------------------------------------------
+
+def write_returns_store(df, path=None):
+    """
+    Writes the raw returns frame as a Parquet dataset
+    partitioned by Ticker (hive layout: Ticker=INFY.NS/).
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    path = path or RETURNS_STORE_PATH
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=_store_partitioning(),
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+    _write_store_state(df, path)
+
+
+def append_returns_store(new_df, path=None):
+    """
+    Adds new rows to the store as extra Parquet files
+    (existing partitions are never rewritten).
+    """
+    import uuid
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    path = path or RETURNS_STORE_PATH
+
+    table = pa.Table.from_pandas(new_df, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=_store_partitioning(),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+    last_rows = pd.concat(
+        [_read_store_state(path), new_df[["Ticker", "Date", "Adj Close"]]],
+        ignore_index=True
+    )
+    _write_store_state(last_rows, path)
+
+
+def _store_state_path(path=None):
+    return os.path.join(path or RETURNS_STORE_PATH, STORE_STATE_FILE)
+
+
+def _write_store_state(df, path=None):
+    last_rows = (
+        df[["Ticker", "Date", "Adj Close"]]
+        .sort_values(["Ticker", "Date"])
+        .groupby("Ticker")
+        .tail(1)
+        .reset_index(drop=True)
+    )
+    last_rows.to_parquet(_store_state_path(path), index=False)
+
+
+def _read_store_state(path=None):
+    return pd.read_parquet(_store_state_path(path))
+
+
+def _store_partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(
+        pa.schema([("Ticker", pa.string())]),
+        flavor="hive"
+    )
+
+
+def _to_store_timestamp(value, arrow_type):
+    """
+    Converts a user bound (str / datetime / Timestamp) into an
+    Arrow scalar with the same unit and timezone as the Date column.
+    """
+    import pyarrow as pa
+
+    ts = pd.Timestamp(value)
+
+    if arrow_type.tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(arrow_type.tz)
+    elif arrow_type.tz is None and ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+
+    return pa.scalar(ts, type=arrow_type)
+
+
+def _read_returns_store(path, tickers, start, end, columns):
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        path,
+        format="parquet",
+        partitioning=_store_partitioning()
+    )
+
+    # Predicate pushdown: Ticker prunes partitions, Date uses row-group stats
+    predicate = None
+
+    if tickers is not None:
+        predicate = ds.field("Ticker").isin(list(tickers))
+
+    date_type = dataset.schema.field("Date").type
+
+    for bound, op in ((start, "ge"), (end, "le")):
+        if bound is None:
+            continue
+        scalar = _to_store_timestamp(bound, date_type)
+        expr = (
+            ds.field("Date") >= scalar
+            if op == "ge"
+            else ds.field("Date") <= scalar
+        )
+        predicate = expr if predicate is None else predicate & expr
+
+    table = dataset.to_table(columns=columns, filter=predicate)
+    table = table.sort_by([("Ticker", "ascending"), ("Date", "ascending")])
+
+    return table.to_pandas()
+
+
+def _read_returns_csv(path, tickers, start, end, columns):
+    df = pd.read_csv(path, usecols=columns, parse_dates=["Date"])
+
+    if tickers is not None:
+        df = df[df["Ticker"].isin(list(tickers))]
+
+    if start is not None:
+        df = df[df["Date"] >= _align_bound(start, df["Date"])]
+
+    if end is not None:
+        df = df[df["Date"] <= _align_bound(end, df["Date"])]
+
+    # Incremental updates append at the end of the file; same
+    # row order as the store reader
+    df = df.sort_values(["Ticker", "Date"], kind="stable")
+
+    return df.reset_index(drop=True)
+
+
+def _align_bound(value, dates):
+    ts = pd.Timestamp(value)
+    tz = getattr(dates.dt, "tz", None)
+
+    if tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+
+    return ts
+
+
 # -------------------------------------------------
 # HELPER FOR OTHER MODULES
 # -------------------------------------------------
 
-def load_returns_data():
+def load_returns_data(tickers=None, start=None, end=None, columns=None):
     """
     Loads preprocessed log-return data.
     Used by backtest & risk modules.
+
+    Reads the ticker-partitioned Parquet store when it exists
+    (falls back to the raw CSV otherwise).
+
+    Parameters
+    ----------
+    tickers : list of str, optional
+        Only load these tickers (partition pruning).
+    start, end : date-like, optional
+        Inclusive Date bounds.
+    columns : list of str, optional
+        Columns to load. "Date" and "Ticker" are always included.
     """
-    path = "nifty50_history_with_adj/nifty50_log_returns_adjclose.csv"
-    return pd.read_csv(path, parse_dates=["Date"])
+
+    if columns is not None:
+        columns = ["Date", "Ticker"] + [
+            c for c in columns if c not in ("Date", "Ticker")
+        ]
+
+    if os.path.isdir(RETURNS_STORE_PATH):
+        df = _read_returns_store(
+            RETURNS_STORE_PATH, tickers, start, end, columns
+        )
+    else:
+        df = _read_returns_csv(
+            RAW_RETURNS_PATH, tickers, start, end, columns
+        )
+
+    if columns is None:
+        # Partition column comes back last; restore the CSV layout
+        columns = ["Date", "Ticker"] + [
+            c for c in df.columns if c not in ("Date", "Ticker")
+        ]
+
+    return df[columns]
 
 
 # -------------------------------------------------
@@ -63,4 +385,14 @@ def load_returns_data():
 # -------------------------------------------------
 
 if __name__ == "__main__":
-    preprocess_data()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process rows newer than the last processed date"
+    )
+    args = parser.parse_args()
+
+    preprocess_data(incremental=args.incremental)
@@ -0,0 +1,416 @@
+import io
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+from numpy.lib import format as npy_format
+
+from scripts.returns_universe import ReturnsUniverse
+
+# -------------------------------------------------
+# DENSE RETURNS PANEL (Date × Ticker)
+# -------------------------------------------------
+#
+# Layout (built by preprocessing, grown by incremental updates):
+#   returns.npy   float64 (R × N), column-major, NaN = missing
+#   observed.npy  bool    (R × N), True where a return exists
+#   dates.npy     datetime64[ns] (T,), UTC instants
+#   tickers.json  ticker order of the N columns + Date timezone
+#
+# Column-major storage keeps every ticker's history contiguous,
+# so whole-universe and per-ticker reads are zero-copy memmap views.
+#
+# The arrays reserve R >= T rows: the first T are the dates, the rest
+# is headroom so new dates are written into the existing files. New
+# tickers are appended as columns at the end of the files, new dates
+# at the end of dates.npy (both in place, .npy headers leave room for
+# that). Readers only see rows / columns listed in the index files,
+# which are updated last.
+
+RETURNS_PANEL_PATH = "nifty50_history_with_adj/returns_panel"
+
+# Spare rows reserved for appended dates (~1 year of sessions)
+PANEL_ROW_HEADROOM = 260
+
+
+def _utc_dates(dates):
+    """
+    (datetime64[ns] UTC instants, timezone name) of a DatetimeIndex.
+    """
+
+    dates = pd.DatetimeIndex(dates)
+
+    if dates.tz is None:
+        return dates.to_numpy("datetime64[ns]"), None
+
+    return (
+        dates.tz_convert("UTC").tz_localize(None).to_numpy("datetime64[ns]"),
+        str(dates.tz)
+    )
+
+
+def _save_panel_array(file, values, fill):
+    """
+    Saves a (T × N) panel array column-major with PANEL_ROW_HEADROOM
+    spare rows of `fill`.
+    """
+
+    rows, cols = values.shape
+
+    out = npy_format.open_memmap(
+        file, mode="w+", dtype=values.dtype,
+        shape=(rows + PANEL_ROW_HEADROOM, cols), fortran_order=True
+    )
+    out[:rows] = values
+    out[rows:] = fill
+    out.flush()
+
+
+def build_returns_panel(returns_df, path=None):
+    """
+    Pivots the long returns frame once and persists the panel.
+    """
+
+    path = path or RETURNS_PANEL_PATH
+
+    wide = returns_df.pivot(
+        index="Date",
+        columns="Ticker",
+        values="log_return"
+    ).sort_index()
+
+    dates, tz = _utc_dates(wide.index)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    values = wide.to_numpy(dtype=np.float64)
+
+    _save_panel_array(os.path.join(path, "returns.npy"), values, np.nan)
+    _save_panel_array(
+        os.path.join(path, "observed.npy"), ~np.isnan(values), False
+    )
+    np.save(os.path.join(path, "dates.npy"), dates)
+
+    with open(os.path.join(path, "tickers.json"), "w") as f:
+        json.dump({"tickers": list(wide.columns), "tz": tz}, f)
+
+    return path
+
+
+def load_returns_panel(tickers=None, path=None, with_mask=False):
+    """
+    Opens the persisted panel as a Date × Ticker DataFrame
+    backed by a read-only memmap (no parsing, no pivot).
+
+    Selecting a subset of tickers copies only those columns, in
+    the order the tickers are given.
+    """
+
+    path = path or RETURNS_PANEL_PATH
+
+    with open(os.path.join(path, "tickers.json")) as f:
+        meta = json.load(f)
+
+    dates = pd.DatetimeIndex(np.load(os.path.join(path, "dates.npy")))
+    if meta["tz"] is not None:
+        dates = dates.tz_localize("UTC").tz_convert(meta["tz"])
+    dates.name = "Date"
+
+    columns = pd.Index(meta["tickers"], name="Ticker")
+
+    # Only the indexed rows / columns (the rest is headroom)
+    shape = (len(dates), len(columns))
+
+    values = np.load(
+        os.path.join(path, "returns.npy"), mmap_mode="r"
+    )[:shape[0], :shape[1]]
+    observed = np.load(
+        os.path.join(path, "observed.npy"), mmap_mode="r"
+    )[:shape[0], :shape[1]]
+
+    if tickers is not None:
+        missing = [t for t in tickers if t not in columns]
+        if missing:
+            raise KeyError(f"Tickers not in returns panel: {missing}")
+
+        pos = columns.get_indexer(list(tickers))
+        columns = columns[pos]
+        values = values[:, pos]
+        observed = observed[:, pos]
+
+    panel = pd.DataFrame(values, index=dates, columns=columns, copy=False)
+
+    if with_mask:
+        mask = pd.DataFrame(observed, index=dates, columns=columns, copy=False)
+        return panel, mask
+
+    return panel
+
+
+# -------------------------------------------------
+# INCREMENTAL UPDATES
+# -------------------------------------------------
+
+def _grow_npy(file, shape, fill):
+    """
+    Grows a saved array along the axis its .npy header leaves room
+    for (columns when column-major, the length when 1-D): appends
+    `fill` values, then rewrites the header in place.
+
+    Returns False (file untouched) if the new header does not fit.
+    """
+
+    with open(file, "r+b") as f:
+        version = npy_format.read_magic(f)
+        read_header = (
+            npy_format.read_array_header_1_0 if version == (1, 0)
+            else npy_format.read_array_header_2_0
+        )
+        old_shape, fortran, dtype = read_header(f)
+        offset = f.tell()
+
+        if tuple(old_shape) == tuple(shape):
+            return True
+
+        header = io.BytesIO()
+        write_header = (
+            npy_format.write_array_header_1_0 if version == (1, 0)
+            else npy_format.write_array_header_2_0
+        )
+        write_header(header, {
+            "descr": npy_format.dtype_to_descr(dtype),
+            "fortran_order": fortran,
+            "shape": tuple(shape)
+        })
+
+        if header.tell() != offset:
+            return False
+
+        f.seek(0, os.SEEK_END)
+        np.full(
+            int(np.prod(shape)) - int(np.prod(old_shape)), fill, dtype=dtype
+        ).tofile(f)
+
+        f.seek(0)
+        f.write(header.getvalue())
+
+    return True
+
+
+def _reserve_rows(file, rows, fill):
+    """
+    Makes room for at least `rows` rows in a column-major panel
+    array, reallocating (copy + atomic replace) with
+    PANEL_ROW_HEADROOM spare rows when the headroom is used up.
+    """
+
+    old = np.load(file, mmap_mode="r")
+
+    if old.shape[0] >= rows:
+        return
+
+    tmp = file[:-len(".npy")] + ".tmp.npy"
+
+    new = npy_format.open_memmap(
+        tmp, mode="w+", dtype=old.dtype,
+        shape=(rows + PANEL_ROW_HEADROOM, old.shape[1]), fortran_order=True
+    )
+    new[:old.shape[0]] = old
+    new[old.shape[0]:] = fill
+    new.flush()
+
+    del new, old
+    os.replace(tmp, file)
+
+
+def append_returns_panel(new_df, path=None):
+    """
+    Adds new rows of the long returns frame to the persisted panel
+    in place: new dates become rows, new tickers columns (appended
+    after the existing ones), and only the appended cells are
+    written.
+
+    New dates must come after the last panel date and cells that
+    already hold a return cannot be rewritten; otherwise (or without
+    a panel) the panel is rebuilt from the returns store.
+    """
+
+    path = path or RETURNS_PANEL_PATH
+
+    if not returns_panel_exists(path):
+        return _rebuild_returns_panel(path)
+
+    wide = new_df.pivot(
+        index="Date",
+        columns="Ticker",
+        values="log_return"
+    ).sort_index()
+
+    # Cells given in new_df (a missing first return included)
+    given = new_df.assign(_given=True).pivot(
+        index="Date",
+        columns="Ticker",
+        values="_given"
+    ).reindex(index=wide.index, columns=wide.columns).notna().to_numpy()
+
+    with open(os.path.join(path, "tickers.json")) as f:
+        meta = json.load(f)
+
+    dates_file = os.path.join(path, "dates.npy")
+    dates = np.load(dates_file)
+    new_dates, tz = _utc_dates(wide.index)
+
+    if tz != meta["tz"]:
+        return _rebuild_returns_panel(path)
+
+    # -----------------------------------
+    # Rows / columns of the new cells
+    # -----------------------------------
+    if not len(new_dates):
+        return path
+
+    rows = np.searchsorted(dates, new_dates)
+    is_new_date = (
+        dates[np.minimum(rows, len(dates) - 1)] != new_dates
+        if len(dates) else np.ones(len(new_dates), dtype=bool)
+    )
+
+    if len(dates) and (new_dates[is_new_date] <= dates[-1]).any():
+        return _rebuild_returns_panel(path)
+
+    rows[is_new_date] = len(dates) + np.arange(is_new_date.sum())
+
+    tickers = list(meta["tickers"])
+    added = [t for t in wide.columns if t not in set(tickers)]
+    cols = pd.Index(tickers + added).get_indexer(wide.columns)
+
+    n_rows = len(dates) + int(is_new_date.sum())
+    n_cols = len(tickers) + len(added)
+
+    returns_file = os.path.join(path, "returns.npy")
+    observed_file = os.path.join(path, "observed.npy")
+
+    observed = np.load(observed_file, mmap_mode="r")
+    old = (~is_new_date)[:, None] & (cols < len(tickers))[None, :]
+    ii, jj = np.nonzero(given & old)
+
+    if observed[rows[ii], cols[jj]].any():
+        del observed
+        return _rebuild_returns_panel(path)
+
+    del observed
+
+    # -----------------------------------
+    # Grow the files, then write the new cells
+    # -----------------------------------
+    for file, fill in ((returns_file, np.nan), (observed_file, False)):
+        _reserve_rows(file, n_rows, fill)
+        capacity = np.load(file, mmap_mode="r").shape[0]
+
+        if not _grow_npy(file, (capacity, n_cols), fill):
+            return _rebuild_returns_panel(path)
+
+    ii, jj = np.nonzero(given)
+    new_values = wide.to_numpy(dtype=np.float64)[ii, jj]
+
+    values = np.load(returns_file, mmap_mode="r+")
+    values[rows[ii], cols[jj]] = new_values
+    values.flush()
+
+    observed = np.load(observed_file, mmap_mode="r+")
+    observed[rows[ii], cols[jj]] = ~np.isnan(new_values)
+    observed.flush()
+
+    del values, observed
+
+    # Index files last: readers see the new cells only from here
+    if not _grow_npy(dates_file, (n_rows,), np.datetime64("NaT", "ns")):
+        return _rebuild_returns_panel(path)
+
+    stored = np.load(dates_file, mmap_mode="r+")
+    stored[len(dates):] = new_dates[is_new_date]
+    stored.flush()
+    del stored
+
+    tmp = os.path.join(path, "tickers.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"tickers": tickers + added, "tz": tz}, f)
+    os.replace(tmp, os.path.join(path, "tickers.json"))
+
+    return path
+
+
+def _rebuild_returns_panel(path):
+    from scripts.preprocess import load_returns_data
+
+    return build_returns_panel(
+        load_returns_data(columns=["log_return"]), path=path
+    )
+
+
+def returns_panel_exists(path=None):
+    return os.path.exists(
+        os.path.join(path or RETURNS_PANEL_PATH, "returns.npy")
+    )
+
+
+def return_matrix(returns_data, tickers):
+    """
+    Date × Ticker log-return matrix for the given tickers.
+
+    Accepts the long returns frame (pivoted here, as before), a
+    ReturnsUniverse (its per-ticker blocks, aligned on dates) or an
+    already-wide panel from load_returns_panel.
+    """
+
+    if isinstance(returns_data, ReturnsUniverse):
+        wanted = set(tickers)
+        columns = {
+            ticker: pd.Series(
+                returns_data.returns(ticker),
+                index=returns_data.dates(ticker)
+            )
+            for ticker in returns_data.tickers
+            if ticker in wanted
+        }
+
+        return (
+            pd.DataFrame(columns)
+            .sort_index()
+            .rename_axis(index="Date", columns="Ticker")
+        )
+
+    if "Ticker" in getattr(returns_data, "columns", []):
+        return (
+            returns_data[returns_data["Ticker"].isin(tickers)]
+            .pivot(index="Date", columns="Ticker", values="log_return")
+            .sort_index()
+        )
+
+    cols = [t for t in returns_data.columns if t in set(tickers)]
+    return returns_data[cols]
+
+
+def load_returns_matrix(tickers=None):
+    """
+    Date × Ticker returns for the given tickers (columns in the
+    order given): memmap panel when it has been built, otherwise
+    pivoted from the store.
+    """
+
+    if returns_panel_exists():
+        return load_returns_panel(tickers=tickers)
+
+    from scripts.preprocess import load_returns_data
+
+    returns_df = load_returns_data(tickers=tickers, columns=["log_return"])
+    matrix = return_matrix(returns_df, returns_df["Ticker"].unique())
+
+    if tickers is None:
+        return matrix
+
+    return matrix[[t for t in tickers if t in matrix.columns]]
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# INDEXED PER-TICKER ACCESS TO THE RETURNS DATA
+# -------------------------------------------------
+
+
+class ReturnsUniverse:
+    """
+    Long returns data laid out as one contiguous block per ticker.
+
+    Built once (a single sort at most); afterwards a ticker's dates
+    and returns are O(1) slice views instead of a boolean scan of
+    the whole frame.
+
+    Can be passed anywhere a returns_df is accepted
+    (compute_var, compute_es, run_single_asset_backtest,
+    run_walkforward, compute_portfolio_risk, the portfolio
+    backtests, ...).
+    """
+
+    def __init__(self, returns_df, columns=("log_return",)):
+
+        tickers = returns_df["Ticker"].to_numpy()
+        codes, uniques = pd.factorize(tickers, sort=True)
+
+        # Reorder only if the rows are not already grouped by ticker
+        # (stable sort keeps each ticker's rows in their date order)
+        if len(codes) > 1 and (np.diff(codes) < 0).any():
+            order = np.argsort(codes, kind="stable")
+            returns_df = returns_df.iloc[order]
+            codes = codes[order]
+
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(codes)]))
+
+        self._offsets = {
+            ticker: (int(start), int(stop))
+            for ticker, start, stop in zip(uniques, starts, stops)
+        }
+
+        self._dates = pd.Index(returns_df["Date"])
+        self._columns = {
+            col: returns_df[col].to_numpy()
+            for col in columns
+        }
+
+    @classmethod
+    def from_returns_data(cls, **kwargs):
+        """
+        Loads via scripts.preprocess.load_returns_data(**kwargs).
+        """
+        from scripts.preprocess import load_returns_data
+
+        return cls(load_returns_data(**kwargs))
+
+    # -----------------------------------
+    # Lookups
+    # -----------------------------------
+
+    @property
+    def tickers(self):
+        return list(self._offsets)
+
+    def __contains__(self, ticker):
+        return ticker in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def offsets(self, ticker):
+        """
+        (start, stop) row offsets of the ticker's block.
+        """
+        try:
+            return self._offsets[ticker]
+        except KeyError:
+            raise KeyError(f"Ticker not in returns universe: {ticker}")
+
+    def dates(self, ticker):
+        start, stop = self.offsets(ticker)
+        return self._dates[start:stop]
+
+    def values(self, ticker, column="log_return"):
+        start, stop = self.offsets(ticker)
+        return self._columns[column][start:stop]
+
+    def returns(self, ticker):
+        return self.values(ticker, "log_return")
+
+    def frame(self, ticker):
+        """
+        Ticker slice as a [Date, Ticker, <columns>] DataFrame,
+        same shape as returns_df[returns_df["Ticker"] == ticker].
+        """
+        start, stop = self.offsets(ticker)
+
+        data = {"Date": self._dates[start:stop], "Ticker": ticker}
+        for col, arr in self._columns.items():
+            data[col] = arr[start:stop]
+
+        return pd.DataFrame(data)
+
+
+# -------------------------------------------------
+# HELPER FOR MODULES TAKING returns_df
+# -------------------------------------------------
+
+def ticker_frame(returns_data, stock):
+    """
+    Rows of one ticker from either a ReturnsUniverse
+    or the long returns DataFrame.
+    """
+
+    if isinstance(returns_data, ReturnsUniverse):
+        return returns_data.frame(stock)
+
+    return returns_data[returns_data["Ticker"] == stock]
@@ -0,0 +1,86 @@
+import os
+import argparse
+
+from models.batch_fit import fit_universe, load_series_by_ticker, BATCH_MODELS
+from models.model_comparison import (
+    compare_models,
+    print_comparison,
+    OUTPUT_PATH as COMPARISON_PATH
+)
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+OUTPUT_PATH = "outputs/model_fits_all_stocks.csv"
+
+# --------------------------------------------------
+# RUN EVERY MODEL FOR ALL STOCKS
+# (replaces run_garch_all / run_egarch_all /
+#  run_gjr_garch_all + model_comparison)
+# --------------------------------------------------
+
+def main(max_workers=None, models=BATCH_MODELS, batch_garch=False):
+
+    series_by_ticker = load_series_by_ticker()
+
+    print(
+        f"\nFitting {', '.join(models)} for "
+        f"{len(series_by_ticker)} stocks...\n"
+    )
+
+    long_df = fit_universe(
+        series_by_ticker,
+        models=models,
+        max_workers=max_workers,
+        batch_garch=batch_garch
+    )
+
+    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    long_df.to_csv(OUTPUT_PATH, index=False)
+
+    compare_df = compare_models(long_df)
+    compare_df.to_csv(COMPARISON_PATH, index=False)
+
+    print("\n Batch run completed")
+    print(f" Fits saved to: {OUTPUT_PATH}")
+    print(f" Comparison saved to: {COMPARISON_PATH}")
+
+    failed = long_df[~long_df["Converged"]]
+    if len(failed):
+        print("\n Failed / not converged:")
+        print(failed[["Ticker", "Model", "Error"]].to_string(index=False))
+    else:
+        print("\n All fits converged")
+
+    print_comparison(compare_df)
+
+    return long_df, compare_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, 1 = in-process)"
+    )
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=BATCH_MODELS,
+        help="Models to fit (model_switching.registry names)"
+    )
+    parser.add_argument(
+        "--batch-garch",
+        action="store_true",
+        help="Fit GARCH with the vectorised cross-sectional estimator"
+    )
+    args = parser.parse_args()
+
+    main(
+        max_workers=args.workers,
+        models=args.models,
+        batch_garch=args.batch_garch
+    )
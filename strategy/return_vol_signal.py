@@ -25,3 +25,18 @@ def compute_return_vol_signal(df, lookback=20):
 
     return df
 
+
+
+def return_vol_signal_panel(returns, forecasted_vol, lookback=20):
+    """
+    compute_return_vol_signal for (dates x tickers) frames of
+    returns and forecasted volatility at once.
+
+    Returns (Exp_Return, RV_Signal) frames.
+    """
+
+    exp_return = returns.rolling(lookback).mean()
+
+    rv_signal = (exp_return / forecasted_vol).clip(-3, 3)
+
+    return exp_return, rv_signal
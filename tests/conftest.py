@@ -0,0 +1,14 @@
+import pytest
+
+import models.fit_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_fit_cache(tmp_path, monkeypatch):
+    """
+    Keeps tests from reading or filling the project's fit cache.
+    """
+
+    cache = models.fit_cache.FitCache(root=str(tmp_path / "fit_cache"))
+    monkeypatch.setattr(models.fit_cache, "FIT_CACHE", cache)
+    return cache
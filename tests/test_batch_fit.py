@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from models.batch_fit import fit_universe
+from models.model_comparison import compare_models
+from model_switching.registry import fit_model
+from tests.test_garch_batch import simulate_garch
+
+
+@pytest.fixture
+def series_by_ticker():
+    return {
+        "BBB": simulate_garch(600, 0.05, 0.08, 0.90, seed=21),
+        "AAA": simulate_garch(700, 0.10, 0.12, 0.80, seed=22),
+    }
+
+
+def test_long_table_matches_single_fits(series_by_ticker):
+    long_df = fit_universe(
+        series_by_ticker,
+        models=["GARCH", "GJR"],
+        max_workers=1,
+        progress=False
+    )
+
+    assert list(long_df[["Ticker", "Model"]].itertuples(index=False, name=None)) == [
+        ("AAA", "GARCH"), ("AAA", "GJR"), ("BBB", "GARCH"), ("BBB", "GJR")
+    ]
+
+    for row in long_df.itertuples():
+        result = fit_model(series_by_ticker[row.Ticker], row.Model)
+        assert row.AIC == pytest.approx(result.aic)
+        assert row.BIC == pytest.approx(result.bic)
+
+
+def test_process_pool_gives_same_table(series_by_ticker):
+    serial = fit_universe(
+        series_by_ticker, models=["GARCH", "EGARCH"],
+        max_workers=1, progress=False
+    )
+    parallel = fit_universe(
+        series_by_ticker, models=["GARCH", "EGARCH"],
+        max_workers=2, progress=False
+    )
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_comparison_picks_lowest_criteria():
+    long_df = pd.DataFrame({
+        "Ticker": ["A", "A", "B", "B"],
+        "Model": ["GARCH", "GJR", "GARCH", "GJR"],
+        "AIC": [-10.0, -12.0, -30.0, -20.0],
+        "BIC": [-9.0, -8.0, -25.0, -26.0],
+    })
+
+    compare_df = compare_models(long_df).set_index("Ticker")
+
+    assert list(compare_df.columns[:4]) == [
+        "AIC_GARCH", "BIC_GARCH", "AIC_GJR", "BIC_GJR"
+    ]
+    assert compare_df["Best_Model"].to_dict() == {"A": "GJR", "B": "GARCH"}
+    assert compare_df["Best_Model_BIC"].to_dict() == {"A": "GARCH", "B": "GJR"}
+
+
+def test_comparison_skips_model_that_failed_everywhere():
+    long_df = pd.DataFrame({
+        "Ticker": ["A", "A", "A", "B", "B", "B"],
+        "Model": ["GARCH", "FIGARCH", "GJR"] * 2,
+        "AIC": [-10.0, None, -12.0, -30.0, None, -20.0],
+        "BIC": [-9.0, None, -8.0, -25.0, None, -26.0],
+    })
+
+    compare_df = compare_models(long_df).set_index("Ticker")
+
+    assert list(compare_df.columns[:4]) == [
+        "AIC_GARCH", "BIC_GARCH", "AIC_GJR", "BIC_GJR"
+    ]
+    assert compare_df["Best_Model"].to_dict() == {"A": "GJR", "B": "GARCH"}
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from models.figarch import FIGARCH_SPEC, figarch_model
+from tests.test_garch_batch import simulate_garch
+
+
+@pytest.fixture
+def series():
+    return simulate_garch(800, 0.05, 0.08, 0.90, seed=7)
+
+
+@pytest.mark.parametrize("truncation", [50, 800, 1000])
+def test_fft_filter_matches_recursion(series, truncation):
+    spec = dict(FIGARCH_SPEC, truncation=truncation)
+
+    recursive = figarch_model(series, **dict(spec, variance_filter="recursive"))
+    fast = figarch_model(series, **spec)
+
+    params = recursive.fit(disp="off").params
+
+    np.testing.assert_allclose(
+        fast.fix(params).conditional_volatility,
+        recursive.fix(params).conditional_volatility,
+        rtol=1e-12
+    )
+
+
+def test_fft_fit_matches_recursive_fit(series):
+    recursive = figarch_model(
+        series, **dict(FIGARCH_SPEC, variance_filter="recursive")
+    ).fit(disp="off")
+    fast = figarch_model(series, **FIGARCH_SPEC).fit(disp="off")
+
+    np.testing.assert_allclose(fast.params, recursive.params, rtol=1e-6)
+    assert fast.loglikelihood == pytest.approx(recursive.loglikelihood)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from arch.univariate.base import ARCHModelResult
+
+from models.fit_cache import FIT_CACHE_MESSAGE, FitCache
+from models.egarch import fit_egarch
+from model_switching.registry import fit_model
+from tests.test_garch_batch import simulate_garch
+
+
+def from_cache(result):
+    return result.optimization_result.message == FIT_CACHE_MESSAGE
+
+
+@pytest.fixture
+def series():
+    return simulate_garch(800, 0.05, 0.08, 0.90, seed=11)
+
+
+def test_second_fit_is_served_from_cache(series, isolated_fit_cache):
+    first = fit_model(series, "GJR")
+    second = fit_model(series, "GJR")
+
+    assert not from_cache(first)
+    assert from_cache(second)
+
+    pd.testing.assert_series_equal(second.params, first.params)
+    np.testing.assert_array_equal(
+        second.conditional_volatility, first.conditional_volatility
+    )
+    assert second.loglikelihood == first.loglikelihood
+    assert second.aic == first.aic
+    assert second.bic == first.bic
+    assert second.convergence_flag == first.convergence_flag
+
+    # a hit is the same arch result type, not a reduced stand-in
+    assert type(second) is type(first) is ARCHModelResult
+    np.testing.assert_array_equal(second.std_resid, first.std_resid)
+    pd.testing.assert_frame_equal(
+        second.forecast(horizon=5).variance,
+        first.forecast(horizon=5).variance
+    )
+
+    # models.* and fit_model share entries for the same spec
+    assert not from_cache(fit_egarch(series))
+    assert from_cache(fit_model(series, "EGARCH"))
+
+
+def test_changed_data_or_start_is_a_miss(series):
+    fit_model(series, "GARCH")
+
+    changed = series.copy()
+    changed[-1] += 1e-9
+
+    assert not from_cache(fit_model(changed, "GARCH"))
+    assert not from_cache(
+        fit_model(series, "GARCH", starting_values=[0.05, 0.05, 0.08, 0.9])
+    )
+
+
+def test_series_input_keeps_its_index(series):
+    s = pd.Series(series, index=pd.date_range("2020-01-01", periods=len(series)))
+
+    first = fit_model(s, "GARCH")
+    second = fit_model(s, "GARCH")
+
+    pd.testing.assert_series_equal(
+        second.conditional_volatility, first.conditional_volatility
+    )
+
+
+def test_lru_eviction_keeps_recently_used_entries(series, tmp_path, monkeypatch):
+    import models.fit_cache
+
+    cache = FitCache(root=str(tmp_path / "small"), max_bytes=10 ** 9)
+    monkeypatch.setattr(models.fit_cache, "FIT_CACHE", cache)
+
+    fits = [series[i:i + 500] for i in range(3)]
+    for s in fits:
+        fit_model(s, "GARCH")
+
+    entry_size = cache.size() / 3
+
+    # touch the oldest entry, then shrink the budget to two entries
+    assert from_cache(fit_model(fits[0], "GARCH"))
+    cache.max_bytes = int(2.5 * entry_size)
+    cache._evict()
+
+    assert cache.size() <= cache.max_bytes
+    assert from_cache(fit_model(fits[0], "GARCH"))
+    assert from_cache(fit_model(fits[2], "GARCH"))
+    assert not from_cache(fit_model(fits[1], "GARCH"))
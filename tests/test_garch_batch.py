@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_switching.registry import MODEL_SPECS, fit_model
+from models.fit_cache import build_model
+from models.garch import fit_garch, extract_garch_params
+from models.gjr_garch import fit_gjr_garch, extract_gjr_params
+from models.garch_batch import fit_garch_batch
+
+
+def simulate_garch(n, omega, alpha, beta, mu=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal(n)
+
+    eps = np.empty(n)
+    sigma2 = omega / (1 - alpha - beta)
+
+    for t in range(n):
+        eps[t] = np.sqrt(sigma2) * z[t]
+        sigma2 = omega + alpha * eps[t] ** 2 + beta * sigma2
+
+    return mu + eps
+
+
+@pytest.fixture
+def panel():
+    # percent-scale returns, where arch's own optimiser converges well
+    columns = {
+        "A": simulate_garch(2000, 0.05, 0.08, 0.90, seed=1),
+        "B": simulate_garch(2000, 0.20, 0.15, 0.70, seed=2),
+        "C": simulate_garch(2000, 0.02, 0.05, 0.93, seed=3),
+    }
+    df = pd.DataFrame(columns)
+    df.loc[:299, "C"] = np.nan      # late listing
+    return df
+
+
+def test_matches_arch_per_ticker(panel):
+    batch = fit_garch_batch(panel).set_index("Ticker")
+
+    assert batch["Converged"].all()
+
+    for ticker in panel.columns:
+        result = fit_garch(panel[ticker].dropna().to_numpy())
+        expected = extract_garch_params(result)
+
+        row = batch.loc[ticker]
+
+        assert row["loglik"] >= result.loglikelihood - 1e-4
+        assert row["AIC"] == pytest.approx(expected["AIC"], abs=1e-2)
+        assert row["BIC"] == pytest.approx(expected["BIC"], abs=1e-2)
+
+        for name in ("alpha", "beta", "persistence"):
+            assert row[name] == pytest.approx(expected[name], abs=5e-3)
+
+
+def test_missing_values_fit_like_a_standalone_series(panel):
+    batch = fit_garch_batch(panel).set_index("Ticker")
+    alone = fit_garch_batch(panel[["C"]].dropna()).set_index("Ticker")
+
+    assert batch.loc["C", "nobs"] == 1700
+
+    for name in ("omega", "alpha", "beta", "loglik"):
+        assert batch.loc["C", name] == pytest.approx(
+            alone.loc["C", name], rel=1e-8
+        )
+
+
+def test_short_columns_fail_alone(panel):
+    panel = panel.assign(D=np.nan, E=np.nan)
+    panel.loc[1999, "E"] = 0.3          # one observation
+
+    batch = fit_garch_batch(panel).set_index("Ticker")
+    full = fit_garch_batch(panel[["A", "B", "C"]]).set_index("Ticker")
+
+    short = batch.loc[["D", "E"]]
+    assert not short["Converged"].any()
+    assert short[["omega", "alpha", "beta", "AIC"]].isna().all().all()
+    assert short["nobs"].tolist() == [0, 1]
+
+    pd.testing.assert_frame_equal(batch.loc[["A", "B", "C"]], full)
+
+
+def test_batch_rows_report_short_tickers(panel):
+    from models.batch_fit import fit_universe
+
+    series = {t: panel[t].dropna().to_numpy() for t in panel.columns}
+    series["D"] = np.array([0.3])
+
+    long_df = fit_universe(
+        series, models=["GARCH"], batch_garch=True, progress=False
+    ).set_index("Ticker")
+
+    assert long_df.loc[["A", "B", "C"], "Error"].isna().all()
+    assert long_df.loc["D", "Error"].startswith("ValueError")
+    assert not long_df.loc["D", "Converged"]
+
+
+def test_gjr_matches_arch(panel):
+    batch = fit_garch_batch(panel, o=1).set_index("Ticker")
+
+    assert batch["Converged"].all()
+
+    for ticker in panel.columns:
+        result = fit_gjr_garch(panel[ticker].dropna().to_numpy())
+        expected = extract_gjr_params(result)
+
+        row = batch.loc[ticker]
+
+        assert row["loglik"] >= result.loglikelihood - 1e-4
+        for name in ("alpha", "gamma", "beta", "persistence"):
+            assert row[name] == pytest.approx(expected[name], abs=5e-3)
+
+
+@pytest.mark.parametrize("model", ["GARCH", "GJR"])
+def test_analytic_backend_matches_arch(panel, model):
+    series = panel["A"].to_numpy()
+
+    expected = fit_model(series, model, backend="arch")
+    result = fit_model(series, model, backend="analytic")
+
+    assert list(result.params.index) == list(expected.params.index)
+    np.testing.assert_allclose(result.params, expected.params, atol=1e-3)
+    assert result.loglikelihood >= expected.loglikelihood - 1e-4
+    assert result.optimization_result.nfev < expected.optimization_result.nfev
+
+    # conditional volatility is arch's at the analytic estimates
+    fixed = build_model(series, MODEL_SPECS[model]).fix(result.params)
+    np.testing.assert_allclose(
+        result.conditional_volatility, fixed.conditional_volatility, rtol=1e-8
+    )
+
+
+def test_unknown_backend_is_rejected(panel):
+    with pytest.raises(ValueError):
+        fit_model(panel["A"].to_numpy(), "GARCH", backend="numba")
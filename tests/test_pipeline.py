@@ -0,0 +1,191 @@
+import os
+import threading
+
+import pytest
+
+from run.pipeline import Stage, Pipeline
+
+
+def test_pipeline_passes_outputs_and_runs_independent_stages_together():
+    """
+    Downstream stages receive upstream outputs in memory;
+    stages with no dependency between them overlap.
+    """
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def load():
+        return {"x": 2}
+
+    def left(x):
+        barrier.wait()          # deadlocks unless right runs concurrently
+        return {"left": x + 1}
+
+    def right(x):
+        barrier.wait()
+        return {"right": x * 10}
+
+    def combine(left, right):
+        return {"total": left + right}
+
+    pipeline = Pipeline([
+        Stage("combine", combine, inputs=("left", "right"), outputs=("total",)),
+        Stage("left", left, inputs=("x",), outputs=("left",)),
+        Stage("right", right, inputs=("x",), outputs=("right",)),
+        Stage("load", load, outputs=("x",)),
+    ])
+
+    context = pipeline.run(max_workers=4)
+
+    assert context["total"] == 23
+    assert set(pipeline.timings) == {"load", "left", "right", "combine"}
+
+
+def test_pipeline_rejects_bad_graphs_and_reports_failures():
+
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", lambda y: None, inputs=("y",))])
+
+    with pytest.raises(ValueError):
+        Pipeline([
+            Stage("a", lambda b: {"a": 1}, inputs=("b",), outputs=("a",)),
+            Stage("b", lambda a: {"b": 1}, inputs=("a",), outputs=("b",)),
+        ])
+
+    def boom():
+        raise ZeroDivisionError
+
+    with pytest.raises(RuntimeError, match="FAILED: Boom"):
+        Pipeline([Stage("boom", boom, title="Boom")]).run()
+
+
+def test_stage_cache_skips_unchanged_stages(tmp_path, monkeypatch):
+    """
+    Second run is served from cache; changing an input file
+    recomputes that stage and everything downstream of it.
+    """
+
+    from run.pipeline import StageCache
+
+    monkeypatch.chdir(tmp_path)
+
+    with open("prices.txt", "w") as f:
+        f.write("1 2 3")
+
+    calls = []
+
+    def load():
+        calls.append("load")
+        with open("prices.txt") as f:
+            values = [float(v) for v in f.read().split()]
+        with open("loaded.txt", "w") as f:
+            f.write(str(len(values)))
+        return {"values": values}
+
+    def total(values):
+        calls.append("total")
+        return {"total": sum(values)}
+
+    def other():
+        calls.append("other")
+        return {"other": 1}
+
+    def build():
+        return Pipeline([
+            Stage(
+                "load", load,
+                outputs=("values",),
+                files=("prices.txt",),
+                artifacts=("loaded.txt",)
+            ),
+            Stage("total", total, inputs=("values",), outputs=("total",)),
+            Stage("other", other, outputs=("other",)),
+        ], cache=StageCache("cache"))
+
+    assert build().run()["total"] == 6
+    assert sorted(calls) == ["load", "other", "total"]
+
+    # Unchanged → nothing runs, artifacts restored
+    calls.clear()
+    os.remove("loaded.txt")
+
+    pipeline = build()
+    assert pipeline.run()["total"] == 6
+    assert calls == []
+    assert sorted(pipeline.cached) == ["load", "other", "total"]
+    assert os.path.exists("loaded.txt")
+
+    # Input change → load + downstream recompute, independent stage cached
+    with open("prices.txt", "w") as f:
+        f.write("1 2 3 4")
+
+    assert build().run()["total"] == 10
+    assert sorted(calls) == ["load", "total"]
+
+    # Explicit invalidation / force
+    calls.clear()
+    build().run(invalidate=("other",))
+    assert calls == ["other"]
+
+    calls.clear()
+    build().run(force=True)
+    assert sorted(calls) == ["load", "other", "total"]
+
+
+def test_stage_key_follows_indirect_imports(tmp_path, monkeypatch):
+    """
+    Editing a module the stage only reaches through another
+    module's (lazy) import must change the stage key.
+    """
+
+    import run.pipeline as pipeline
+    from run.pipeline import StageCache, stage_modules
+
+    package = tmp_path / "stagepkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "outer.py").write_text(
+        "def run():\n"
+        "    from stagepkg import inner\n"
+        "    return inner.VALUE\n"
+    )
+    (package / "inner.py").write_text("VALUE = 1\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(pipeline, "SOURCE_ROOT", str(tmp_path))
+
+    def stage_func():
+        from stagepkg.outer import run
+        return {"value": run()}
+
+    stage = Stage("s", stage_func, outputs=("value",))
+    cache = StageCache(str(tmp_path / "cache"))
+
+    assert stage_modules(stage) == [
+        "stagepkg", "stagepkg.inner", "stagepkg.outer"
+    ]
+
+    before = cache.key(stage, {})
+    assert cache.key(stage, {}) == before
+
+    (package / "inner.py").write_text("VALUE = 2\n")
+    assert cache.key(stage, {}) != before
+
+
+def test_pipeline_stages_fingerprint_their_imports():
+    from run.pipeline import stage_modules
+    from run.run_full_pipeline import build_pipeline
+
+    stages = {stage.name: stage for stage in build_pipeline().stages}
+
+    assert {
+        "models.fit_cache", "models.fit_summary", "models.garch",
+        "models.gjr_garch", "models.egarch", "models.figarch",
+        "models.garch_batch", "walkforward.checkpoint",
+        "scripts.returns_universe"
+    } <= set(stage_modules(stages["walkforward"]))
+
+    assert "models.fit_cache" in stage_modules(stages["fit_egarch"])
+
+    for name in ("var", "es", "single_asset"):
+        assert "scripts.returns_universe" in stage_modules(stages[name])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.portfolio_regime import _daily_portfolio_returns
+
+
+def daily_returns_loop(ret_df, weights):
+    """
+    The original per-date STEP 5 loop, as reference.
+    """
+
+    portfolio_returns = []
+
+    for date in ret_df.index:
+        returns_today = ret_df.loc[date]
+        weights_today = weights.loc[date]
+
+        valid = (~returns_today.isna()) & (~weights_today.isna())
+
+        if valid.sum() >= 2:
+            w = weights_today[valid]
+            w = w / w.sum()
+            port_ret = (w * returns_today[valid]).sum()
+        else:
+            r = returns_today.dropna()
+            if len(r) == 0:
+                continue
+            port_ret = r.mean()
+
+        portfolio_returns.append((date, port_ret))
+
+    return pd.Series(dict(portfolio_returns)).sort_index()
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2015-01-01", periods=400, tz="Asia/Kolkata")
+    shape = (len(dates), 12)
+
+    ret_df = pd.DataFrame(rng.normal(0, 0.01, shape), index=dates)
+    ret_df = ret_df.mask(rng.random(shape) < 0.3)
+    ret_df.iloc[10] = np.nan                    # no returns: dropped
+
+    weights = pd.DataFrame(rng.random(shape), index=dates)
+    weights = weights.mask(rng.random(shape) < 0.6)
+    weights.iloc[20:30] = np.nan                # equal-weight fallback
+
+    return ret_df, weights
+
+
+def test_daily_returns_match_loop(panel):
+    ret_df, weights = panel
+
+    expected = daily_returns_loop(ret_df, weights)
+    result = _daily_portfolio_returns(ret_df, weights)
+
+    assert ret_df.index[10] not in result.index
+    pd.testing.assert_series_equal(result, expected, rtol=1e-12)
+
+
+def test_dates_without_weights_fall_back_to_equal_weight(panel):
+    ret_df, weights = panel
+    weights = weights * np.nan
+
+    result = _daily_portfolio_returns(ret_df, weights)
+
+    pd.testing.assert_series_equal(
+        result,
+        ret_df.mean(axis=1).dropna().rename_axis(None),
+        rtol=1e-12
+    )
@@ -0,0 +1,128 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from model_switching.refit_models import (
+    fit_warm,
+    refit_all_models,
+    previous_params
+)
+from tests.test_garch_batch import simulate_garch
+
+
+@pytest.fixture
+def series():
+    return simulate_garch(1200, 0.05, 0.08, 0.90, seed=7)
+
+
+def test_warm_start_reuses_previous_window(series):
+    first = refit_all_models(series[:1000])
+    second = refit_all_models(
+        series[200:],
+        starting_values=previous_params(first)
+    )
+
+    assert (first["Start"] == "cold").all()
+    assert set(second["Start"]) <= {"warm", "cold_fallback"}
+
+    cold = refit_all_models(series[200:]).set_index("Model")
+    warm = second.set_index("Model")
+
+    assert warm.loc["GARCH", "Start"] == "warm"
+    assert warm.loc["GARCH", "Result"].loglikelihood == pytest.approx(
+        cold.loc["GARCH", "Result"].loglikelihood, abs=1e-3
+    )
+
+
+def test_invalid_starting_values_fall_back_to_cold_start(series):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        res, start = fit_warm(series, "GARCH", np.array([0.0, -1.0, 2.0, 2.0]))
+
+    assert start == "cold_fallback"
+    assert res.convergence_flag == 0
+
+
+def test_executor_mode_matches_serial_and_reports_failures(
+    series, isolated_fit_cache, monkeypatch
+):
+    import models.fit_cache
+    from walkforward.run_walkforward import _refit_executor
+
+    # workers start from the test's (empty) cache, not outputs/
+    with _refit_executor(2) as pool:
+        parallel = refit_all_models(series, executor=pool, timeout=60)
+        timed_out = refit_all_models(series, executor=pool, timeout=0)
+
+    assert len(isolated_fit_cache._entries()) == len(parallel)
+
+    # fresh serial fits to compare against
+    monkeypatch.setattr(models.fit_cache, "FIT_CACHE", None)
+    serial = refit_all_models(series)
+
+    assert list(parallel["Model"]) == list(serial["Model"])
+    assert parallel["Error"].isna().all()
+    assert parallel["AIC"].tolist() == pytest.approx(serial["AIC"].tolist())
+
+    # every candidate still gets a row; select_best_model skips them
+    assert list(timed_out["Model"]) == list(serial["Model"])
+    failed = timed_out[timed_out["Result"].isna()]
+    assert len(failed) > 0
+    assert failed["Error"].str.startswith("TimeoutError").all()
+
+
+def test_timeout_counts_from_fit_start_with_fewer_workers_than_models(series):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from model_switching.refit_models import MODELS
+    from models.fit_cache import fit_cache_settings, use_fit_cache
+
+    # one fresh spawn worker: worker start-up plus the fits queued
+    # behind each other take well over a second, each fit far less
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=use_fit_cache,
+        initargs=(fit_cache_settings(),)
+    ) as pool:
+        first = refit_all_models(series, executor=pool, timeout=1.0)
+
+        # timed-out fits are interrupted and free the worker again
+        timed_out = refit_all_models(series, executor=pool, timeout=0)
+        after = refit_all_models(series, executor=pool, timeout=1.0)
+
+    assert list(first["Model"]) == MODELS
+    assert first["Error"].isna().all()
+
+    assert timed_out["Error"].str.startswith("TimeoutError").all()
+    assert after["Error"].isna().all()
+
+
+def test_selector_skips_failed_candidates(series):
+    from model_switching.selector import select_best_model
+
+    model_df = refit_all_models(series)
+    model_df.loc[0, ["AIC", "Result", "Error"]] = [-1e12, None, "boom"]
+
+    name, result = select_best_model(model_df)
+
+    assert name != model_df.loc[0, "Model"]
+    assert result is not None
+
+
+def test_results_are_compact_and_only_selected_volatility_is_kept(series):
+    import pandas as pd
+    from models.fit_summary import FitSummary
+    from walkforward.run_walkforward import evaluate_window
+
+    test_df = pd.DataFrame({"log_return": series[1000:]})
+    test_df, model_df = evaluate_window(0, series[:1000], test_df)
+
+    summaries = model_df["Result"].tolist()
+    assert all(isinstance(s, FitSummary) for s in summaries)
+
+    kept = [s for s in summaries if s.conditional_volatility is not None]
+    assert [s.model for s in kept] == [test_df["Selected_Model"].iloc[0]]
+    assert kept[0].conditional_volatility.dtype == np.float32
+    assert len(kept[0].conditional_volatility) == 1000
@@ -0,0 +1,303 @@
+import numpy as np
+import pandas as pd
+
+import scripts.preprocess as preprocess
+import scripts.returns_panel as returns_panel
+
+
+def _synthetic_returns():
+    dates = pd.date_range("2020-01-01", periods=30, freq="B")
+    frames = []
+
+    for i, ticker in enumerate(["AAA.NS", "BBB.NS", "M&M.NS"]):
+        price = 100 + np.cumsum(np.random.normal(0, 1, len(dates)))
+        frames.append(pd.DataFrame({
+            "Date": dates,
+            "Ticker": ticker,
+            "Adj Close": price,
+            "Volume": np.arange(len(dates)) + i,
+            "log_return": np.log(price / np.roll(price, 1))
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_returns_store_matches_csv(tmp_path, monkeypatch):
+    """
+    Store reads must match the CSV reads they replace,
+    including ticker / date / column filters.
+    """
+
+    np.random.seed(42)
+    df = _synthetic_returns()
+
+    csv_path = tmp_path / "returns.csv"
+    store_path = tmp_path / "store"
+    df.to_csv(csv_path, index=False)
+
+    monkeypatch.setattr(preprocess, "RAW_RETURNS_PATH", str(csv_path))
+    monkeypatch.setattr(preprocess, "RETURNS_STORE_PATH", str(store_path))
+
+    csv_df = preprocess.load_returns_data()
+
+    preprocess.write_returns_store(df, path=str(store_path))
+    store_df = preprocess.load_returns_data()
+
+    assert list(store_df.columns) == list(csv_df.columns)
+    assert len(store_df) == len(csv_df)
+    assert (store_df["Ticker"].values == csv_df["Ticker"].values).all()
+
+    # Slice read: one ticker, date bound, projected column
+    part = preprocess.load_returns_data(
+        tickers=["M&M.NS"],
+        start="2020-01-15",
+        columns=["log_return"]
+    )
+
+    expected = df[
+        (df["Ticker"] == "M&M.NS") & (df["Date"] >= "2020-01-15")
+    ]
+
+    assert list(part.columns) == ["Date", "Ticker", "log_return"]
+    assert len(part) == len(expected)
+    assert np.allclose(part["log_return"], expected["log_return"])
+
+
+def test_incremental_preprocess_matches_full_rebuild(tmp_path, monkeypatch):
+    """
+    Appending new days must give the same returns as
+    reprocessing the whole history.
+    """
+
+    np.random.seed(7)
+    prices = _synthetic_returns().drop(columns=["log_return"])
+
+    paths = {
+        "COMBINED_PATH": tmp_path / "combined.csv",
+        "RAW_RETURNS_PATH": tmp_path / "raw.csv",
+        "CLEAN_RETURNS_PATH": tmp_path / "clean.csv",
+        "RETURNS_STORE_PATH": tmp_path / "store",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(preprocess, name, str(path))
+
+    monkeypatch.setattr(
+        returns_panel, "RETURNS_PANEL_PATH", str(tmp_path / "panel")
+    )
+
+    # Initial history, then two more days (plus a brand new ticker)
+    cutoff = prices["Date"].unique()[-3]
+    prices[prices["Date"] <= cutoff].to_csv(paths["COMBINED_PATH"], index=False)
+    preprocess.preprocess_data()
+
+    new_ticker = prices[prices["Ticker"] == "AAA.NS"].assign(Ticker="CCC.NS")
+    pd.concat([prices, new_ticker]).to_csv(paths["COMBINED_PATH"], index=False)
+
+    appended = preprocess.preprocess_incremental()
+    assert appended["Ticker"].value_counts()["AAA.NS"] == 2
+
+    incremental_df = preprocess.load_returns_data()
+    incremental_clean = pd.read_csv(paths["CLEAN_RETURNS_PATH"])
+
+    # CSV fallback (no store): appended rows come back in order
+    monkeypatch.setattr(
+        preprocess, "RETURNS_STORE_PATH", str(tmp_path / "no_store")
+    )
+    incremental_csv = preprocess.load_returns_data()
+    monkeypatch.setattr(
+        preprocess, "RETURNS_STORE_PATH", str(paths["RETURNS_STORE_PATH"])
+    )
+
+    # Full rebuild from scratch
+    preprocess.preprocess_data()
+    full_df = preprocess.load_returns_data()
+    full_clean = pd.read_csv(paths["CLEAN_RETURNS_PATH"])
+
+    assert len(incremental_df) == len(full_df)
+    assert np.allclose(
+        incremental_df["log_return"],
+        full_df["log_return"],
+        equal_nan=True
+    )
+
+    assert (incremental_csv["Ticker"].values == full_df["Ticker"].values).all()
+    assert (
+        incremental_csv["Date"].values == full_df["Date"].values
+    ).all()
+    assert np.allclose(
+        incremental_csv["log_return"],
+        full_df["log_return"],
+        equal_nan=True
+    )
+
+    sort_cols = ["Ticker", "Date"]
+    assert np.allclose(
+        incremental_clean.sort_values(sort_cols)["log_return"],
+        full_clean.sort_values(sort_cols)["log_return"]
+    )
+
+    # Nothing new → no-op
+    assert preprocess.preprocess_incremental().empty
+
+
+def test_returns_panel_matches_pivot(tmp_path):
+    """
+    Memmap panel must equal the pivot it replaces.
+    """
+
+    from scripts.returns_panel import (
+        build_returns_panel,
+        load_returns_panel,
+        return_matrix
+    )
+
+    np.random.seed(3)
+    df = _synthetic_returns()
+    # Ticker with a gap → NaN in the panel, False in the mask
+    df = df.drop(index=df[df["Ticker"] == "BBB.NS"].index[5:8])
+
+    build_returns_panel(df, path=str(tmp_path))
+
+    panel, mask = load_returns_panel(path=str(tmp_path), with_mask=True)
+    expected = return_matrix(df, df["Ticker"].unique())
+
+    assert list(panel.columns) == list(expected.columns)
+    assert (panel.index == expected.index).all()
+    assert np.allclose(panel.values, expected.values, equal_nan=True)
+    assert (mask.values == expected.notna().values).all()
+
+    # Columns in the requested order, not the panel's
+    subset, subset_mask = load_returns_panel(
+        tickers=["M&M.NS", "AAA.NS"], path=str(tmp_path), with_mask=True
+    )
+    assert list(subset.columns) == ["M&M.NS", "AAA.NS"]
+    assert list(subset_mask.columns) == ["M&M.NS", "AAA.NS"]
+    pd.testing.assert_frame_equal(subset, panel[["M&M.NS", "AAA.NS"]])
+    assert return_matrix(panel, ["AAA.NS"]).equals(panel[["AAA.NS"]])
+
+
+
+def test_appended_returns_panel_matches_full_build(tmp_path, monkeypatch):
+    """
+    Growing the panel in place (new dates, a new ticker, a lagging
+    ticker catching up) must give the panel a full build gives.
+    """
+
+    from scripts.returns_panel import (
+        append_returns_panel,
+        build_returns_panel,
+        load_returns_panel
+    )
+
+    np.random.seed(5)
+    df = _synthetic_returns()
+    df = pd.concat([
+        df,
+        df[df["Ticker"] == "AAA.NS"].assign(Ticker="CCC.NS")
+    ], ignore_index=True)
+
+    dates = df["Date"].unique()
+    lagging = (df["Ticker"] == "BBB.NS") & (df["Date"] > dates[-6])
+    first = (df["Date"] <= dates[-4]) & (df["Ticker"] != "CCC.NS") & ~lagging
+
+    # Headroom smaller than the append: reallocates once
+    monkeypatch.setattr(returns_panel, "PANEL_ROW_HEADROOM", 2)
+
+    path = str(tmp_path / "panel")
+    build_returns_panel(df[first], path=path)
+
+    for day in dates[-4:]:
+        batch = df[~first & (df["Date"] <= day)]
+        first |= df["Date"] <= day
+
+        append_returns_panel(batch, path=path)
+
+    panel, mask = load_returns_panel(path=path, with_mask=True)
+
+    build_returns_panel(df, path=str(tmp_path / "full"))
+    full, full_mask = load_returns_panel(
+        path=str(tmp_path / "full"), with_mask=True
+    )
+
+    # New tickers are appended after the existing columns
+    assert list(panel.columns) == ["AAA.NS", "BBB.NS", "M&M.NS", "CCC.NS"]
+
+    pd.testing.assert_frame_equal(panel[full.columns], full)
+    pd.testing.assert_frame_equal(mask[full.columns], full_mask)
+
+    subset = load_returns_panel(tickers=["CCC.NS"], path=path)
+    pd.testing.assert_frame_equal(subset, full[["CCC.NS"]])
+
+def test_returns_universe_slices_match_boolean_filter():
+    """
+    Per-ticker views must equal the boolean-mask lookups they replace,
+    also when the input rows are not grouped by ticker.
+    """
+
+    from scripts.returns_universe import ReturnsUniverse, ticker_frame
+
+    np.random.seed(11)
+    df = _synthetic_returns()
+    shuffled = df.sort_values("Date", kind="stable").reset_index(drop=True)
+
+    for data in (df, shuffled):
+        universe = ReturnsUniverse(data)
+
+        assert universe.tickers == sorted(df["Ticker"].unique())
+
+        for ticker in universe:
+            expected = data[data["Ticker"] == ticker]
+
+            assert np.allclose(
+                universe.returns(ticker),
+                expected["log_return"].values,
+                equal_nan=True
+            )
+            assert (universe.dates(ticker) == expected["Date"].values).all()
+            assert len(ticker_frame(universe, ticker)) == len(expected)
+
+    # Already-grouped input is sliced without copying
+    universe = ReturnsUniverse(df)
+    assert np.shares_memory(
+        universe.returns("AAA.NS"),
+        universe.returns("BBB.NS").base
+    )
+
+
+def test_portfolio_risk_accepts_returns_universe():
+    """
+    A ReturnsUniverse gives the same return matrix and portfolio
+    risk as the long frame it was built from.
+    """
+
+    from risk.portfolio_risk import compute_portfolio_risk
+    from scripts.returns_panel import return_matrix
+    from scripts.returns_universe import ReturnsUniverse
+
+    np.random.seed(13)
+    df = _synthetic_returns()
+    df = df.drop(index=df[df["Ticker"] == "BBB.NS"].index[3:6])
+    universe = ReturnsUniverse(df)
+
+    tickers = ["M&M.NS", "AAA.NS", "BBB.NS"]
+
+    pd.testing.assert_frame_equal(
+        return_matrix(universe, tickers),
+        return_matrix(df, tickers),
+        check_freq=False
+    )
+
+    expected = compute_portfolio_risk(df, tickers)
+    result = compute_portfolio_risk(universe, tickers)
+
+    pd.testing.assert_series_equal(
+        result["Portfolio_Returns"],
+        expected["Portfolio_Returns"],
+        check_freq=False
+    )
+    pd.testing.assert_frame_equal(
+        result["Risk_Metrics"], expected["Risk_Metrics"]
+    )
+    pd.testing.assert_frame_equal(
+        result["Diversification"], expected["Diversification"]
+    )
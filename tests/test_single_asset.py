@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.single_asset import (
+    PANEL_FIELDS,
+    compute_panel_metrics,
+    compute_performance_metrics,
+    run_single_asset_backtest,
+    run_single_asset_panel_backtest
+)
+
+
+@pytest.fixture
+def panel_inputs():
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range("2015-01-01", periods=900, tz="Asia/Kolkata")
+
+    returns = pd.DataFrame(
+        rng.normal(0, 0.012, (len(dates), 4)),
+        index=dates,
+        columns=["A.NS", "B.NS", "C.NS", "D.NS"]
+    )
+    returns.iloc[:200, 1] = np.nan          # listed later
+    returns.iloc[-100:, 2] = np.nan         # delisted
+    returns = returns.mask(rng.random(returns.shape) < 0.03)
+
+    forecasted_vol = np.sqrt((returns ** 2).ewm(span=30).mean())
+
+    return returns, forecasted_vol.where(returns.notna())
+
+
+def test_panel_backtest_matches_single_asset(panel_inputs):
+    returns, forecasted_vol = panel_inputs
+
+    panel = run_single_asset_panel_backtest(returns, forecasted_vol)
+    metrics = compute_panel_metrics(panel)
+
+    returns_df = (
+        returns.rename_axis(index="Date", columns="Ticker")
+        .stack()
+        .rename("log_return")
+        .reset_index()
+    )
+
+    for ticker in returns.columns:
+        result = SimpleNamespace(
+            conditional_volatility=forecasted_vol[ticker].dropna().values
+        )
+        expected = run_single_asset_backtest(returns_df, result, ticker)
+
+        kept = (
+            panel.xs(ticker, axis=1, level="Ticker")
+            .dropna(subset=["log_return"])
+        )
+
+        assert list(kept.index) == list(expected["Date"])
+
+        for field in PANEL_FIELDS:
+            if field == "Vol_Regime":
+                assert list(kept[field]) == list(expected[field])
+            else:
+                np.testing.assert_array_equal(
+                    kept[field].to_numpy(dtype=np.float64),
+                    expected[field].to_numpy(dtype=np.float64)
+                )
+
+        single = (
+            compute_performance_metrics(expected)
+            .set_index("Metric")["Strategy"]
+        )
+        np.testing.assert_allclose(
+            metrics.loc[ticker].to_numpy(),
+            single[metrics.columns].to_numpy(),
+            rtol=1e-12
+        )
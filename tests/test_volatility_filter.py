@@ -0,0 +1,52 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from model_switching.registry import MODEL_SPECS, fit_model
+from models.fit_cache import build_model
+from models.volatility_filter import VolatilityFilter
+from tests.test_garch_batch import simulate_garch
+
+
+@pytest.fixture
+def series():
+    return simulate_garch(1500, 0.05, 0.08, 0.90, seed=5)
+
+
+@pytest.mark.parametrize("model", ["GARCH", "GJR", "EGARCH"])
+def test_streaming_matches_fixed_parameter_arch(series, model):
+    train, live = series[:1200], series[1200:]
+
+    result = fit_model(train, model)
+    vol_filter = VolatilityFilter.from_result(result, model, train)
+
+    forecast = result.forecast(horizon=1, reindex=False).variance.iloc[-1, 0]
+    assert vol_filter.forecast_variance() == pytest.approx(forecast, rel=1e-10)
+
+    streamed = vol_filter.update_many(live)
+
+    fixed = build_model(series, MODEL_SPECS[model]).fix(result.params)
+    expected = np.asarray(fixed.conditional_volatility)[1200:] ** 2
+
+    np.testing.assert_allclose(streamed, expected, rtol=1e-10)
+    assert vol_filter.nobs == len(series)
+
+
+def test_filter_round_trips(series, tmp_path):
+    result = fit_model(series[:1000], "GJR")
+    vol_filter = VolatilityFilter.from_result(result, "GJR", series[:1000])
+    vol_filter.update_many(series[1000:1100])
+
+    path = tmp_path / "filter.json"
+    vol_filter.save(path)
+
+    state = vol_filter.to_dict()
+    expected = vol_filter.update(series[1100])
+
+    for restored in (
+        VolatilityFilter.load(path),
+        pickle.loads(pickle.dumps(VolatilityFilter.from_dict(state)))
+    ):
+        assert restored.to_dict() == state
+        assert restored.update(series[1100]) == expected
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from regime.volatility_regime import (
+    REGIME_LABELS,
+    detect_volatility_regime,
+    detect_volatility_regime_panel
+)
+
+
+def regimes_loop(vol, window=60):
+    """
+    The original per-element classifier, as reference.
+    """
+
+    vol = pd.Series(vol).reset_index(drop=True)
+
+    low_q = vol.rolling(window).quantile(0.33)
+    high_q = vol.rolling(window).quantile(0.66)
+
+    regimes = []
+
+    for v, l, h in zip(vol, low_q, high_q):
+        if pd.isna(l) or pd.isna(h):
+            regimes.append("MEDIUM")
+        elif v < l:
+            regimes.append("LOW")
+        elif v < h:
+            regimes.append("MEDIUM")
+        else:
+            regimes.append("HIGH")
+
+    return regimes
+
+
+@pytest.fixture
+def vol_df():
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2015-01-01", periods=600)
+
+    vol_df = pd.DataFrame(
+        np.abs(rng.normal(0.01, 0.005, (len(dates), 6))),
+        index=dates,
+        columns=[f"T{i}" for i in range(6)]
+    )
+
+    return vol_df.mask(rng.random(vol_df.shape) < 0.02)
+
+
+def test_panel_regimes_match_per_series_loop(vol_df):
+    codes = detect_volatility_regime_panel(vol_df)
+
+    assert codes.index.equals(vol_df.index)
+    assert (codes.dtypes == np.int8).all()
+
+    for ticker in vol_df.columns:
+        expected = regimes_loop(vol_df[ticker])
+
+        assert list(REGIME_LABELS[codes[ticker].to_numpy()]) == expected
+        assert list(detect_volatility_regime(vol_df[ticker])) == expected
+
+
+def test_rolling_quantiles_match_pandas(vol_df):
+    from regime.rolling_quantile import RollingQuantiles, rolling_quantiles
+
+    quantiles = (0.0, 0.33, 0.5, 0.66, 1.0)
+
+    for window in (1, 8, 60, 250):
+        panel = rolling_quantiles(vol_df.to_numpy(), window, quantiles)
+        stream = RollingQuantiles(window, quantiles).update_many(
+            vol_df["T0"]
+        )
+
+        for i, q in enumerate(quantiles):
+            expected = vol_df.rolling(window).quantile(q).to_numpy()
+
+            np.testing.assert_array_equal(panel[i], expected)
+            np.testing.assert_array_equal(stream[:, i], expected[:, 0])
+
+
+def test_tracker_matches_batch_regimes(vol_df):
+    from regime.volatility_regime import VolatilityRegimeTracker
+
+    tracker = VolatilityRegimeTracker()
+    live = [tracker.push(v) for v in vol_df["T1"]]
+
+    assert live == detect_volatility_regime_panel(vol_df)["T1"].tolist()
+
+
+def test_regime_multiplier_lookup_matches_rule(vol_df):
+    from regime.regime_rules import (
+        regime_multiplier,
+        regime_position_multiplier
+    )
+
+    regimes = detect_volatility_regime(vol_df["T2"])
+    expected = [regime_position_multiplier(r) for r in regimes]
+
+    assert regimes.cat.codes.dtype == np.int8
+    np.testing.assert_array_equal(regime_multiplier(regimes), expected)
+    np.testing.assert_array_equal(
+        regime_multiplier(regimes.cat.codes.to_numpy()), expected
+    )
+
+    assert regime_position_multiplier("UNKNOWN") == 0.0
+    assert regime_multiplier(np.array([-1], dtype=np.int8))[0] == 0.0
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_switching.registry import MODEL_SPECS, fit_model
+from models.fit_cache import build_model
+from walkforward.forecast import forecast_test_volatility
+from walkforward.rolling_windows import (
+    generate_rolling_windows,
+    generate_window_offsets
+)
+from walkforward.run_walkforward import run_walkforward
+from walkforward.scheduler import run_universe_walkforward
+from tests.test_garch_batch import simulate_garch
+
+
+@pytest.fixture
+def returns_df():
+    dates = pd.bdate_range("2015-01-01", "2018-09-30")
+    returns = simulate_garch(len(dates), 0.05, 0.08, 0.90, seed=4)
+
+    return pd.DataFrame({
+        "Date": dates,
+        "Ticker": "INFY.NS",
+        "log_return": returns
+    })
+
+
+def test_window_parallel_matches_serial(returns_df):
+    serial = run_walkforward(returns_df, refit_workers=1)
+    parallel = run_walkforward(returns_df, window_workers=2)
+
+    assert serial["Window_ID"].nunique() > 1
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert parallel.attrs == serial.attrs
+
+
+def test_window_parallel_rejects_warm_start(returns_df):
+    with pytest.raises(ValueError):
+        run_walkforward(returns_df, warm_start=True, window_workers=2)
+
+
+@pytest.mark.parametrize("model", ["GARCH", "FIGARCH"])
+def test_test_window_volatility_is_out_of_sample(model):
+    series = simulate_garch(1060, 0.05, 0.08, 0.90, seed=6)
+    train, test = series[:1000], series[1000:]
+
+    result = fit_model(train, model)
+    vol = forecast_test_volatility(train, test, model, result)
+
+    fixed = build_model(series, MODEL_SPECS[model]).fix(result.params)
+    np.testing.assert_allclose(
+        vol, np.asarray(fixed.conditional_volatility)[1000:], rtol=1e-8
+    )
+
+    # a shock on test day k only moves the volatility of later days
+    shocked = test.copy()
+    shocked[30] = 10.0
+    moved = forecast_test_volatility(train, shocked, model, result)
+
+    np.testing.assert_allclose(moved[:31], vol[:31], rtol=1e-12)
+    assert moved[31] > vol[31]
+
+
+def test_window_offsets_match_calendar_masks():
+    dates = pd.Series(
+        pd.bdate_range("2015-01-01", "2019-12-31", tz="Asia/Kolkata")
+    )
+
+    windows = generate_rolling_windows(dates, 3, 3)
+    offsets = generate_window_offsets(dates, 3, 3)
+
+    assert len(offsets) == len(windows)
+
+    for (tr_start, tr_end, te_start, te_end), row in zip(windows, offsets):
+        train = np.flatnonzero((dates >= tr_start) & (dates < tr_end))
+        test = np.flatnonzero((dates >= te_start) & (dates < te_end))
+
+        assert list(row) == [train[0], train[-1] + 1, test[0], test[-1] + 1]
+
+
+def test_trading_day_and_expanding_offsets():
+    dates = pd.bdate_range("2015-01-01", periods=1000)
+
+    offsets = generate_window_offsets(dates, train_days=500, test_days=100)
+    assert offsets.tolist() == [
+        [start, start + 500, start + 500, start + 600]
+        for start in range(0, 401, 100)
+    ]
+
+    expanding = generate_window_offsets(
+        dates, train_days=500, test_days=100, expanding=True
+    )
+    assert (expanding[:, 0] == 0).all()
+    assert (expanding[:, 1:] == offsets[:, 1:]).all()
+
+
+def test_window_offsets_reject_incomplete_layouts():
+    dates = pd.bdate_range("2015-01-01", periods=1000)
+
+    with pytest.raises(ValueError):
+        generate_window_offsets(dates, train_days=500)
+
+    with pytest.raises(ValueError):
+        generate_window_offsets(dates, test_days=100)
+
+    with pytest.raises(ValueError):
+        generate_window_offsets(dates, train_days=0, test_days=100)
+
+    with pytest.raises(ValueError):
+        generate_window_offsets(dates, train_years=2)
+
+
+def test_universe_scheduler_matches_per_ticker_runs(returns_df, tmp_path):
+    other = returns_df.assign(
+        Ticker="TCS.NS",
+        log_return=simulate_garch(len(returns_df), 0.1, 0.1, 0.85, seed=8)
+    )
+    universe_df = pd.concat([returns_df, other], ignore_index=True)
+
+    summary = run_universe_walkforward(
+        universe_df, max_workers=1, output_dir=str(tmp_path), progress=False
+    )
+
+    assert summary["Windows"].gt(0).all()
+    assert summary.attrs["windows_per_sec"] > 0
+    assert (tmp_path / "_timings.csv").exists()
+
+    for ticker in ("INFY.NS", "TCS.NS"):
+        expected = run_walkforward(universe_df, stock=ticker)
+        expected.to_csv(tmp_path / "expected.csv", index=False)
+
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / f"{ticker}.csv"),
+            pd.read_csv(tmp_path / "expected.csv")
+        )
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_checkpointed_run_resumes_missing_windows(returns_df, tmp_path,
+                                                  monkeypatch, warm_start):
+    import walkforward.run_walkforward as wf
+
+    expected = run_walkforward(returns_df, warm_start=warm_start)
+    first = run_walkforward(
+        returns_df, warm_start=warm_start, checkpoint_dir=str(tmp_path)
+    )
+    pd.testing.assert_frame_equal(first, expected)
+
+    # lose the last window, as if the run had crashed there
+    stock_dir = tmp_path / "INFY.NS"
+    last = sorted(stock_dir.glob("window_*[0-9].parquet"))[-1]
+    last.unlink()
+
+    calls = []
+    evaluate = wf.evaluate_window
+    monkeypatch.setattr(
+        wf, "evaluate_window",
+        lambda window_id, *args, **kwargs: (
+            calls.append(window_id) or evaluate(window_id, *args, **kwargs)
+        )
+    )
+
+    resumed = run_walkforward(
+        returns_df, warm_start=warm_start, checkpoint_dir=str(tmp_path)
+    )
+
+    assert calls == [expected["Window_ID"].iloc[-1]]
+    pd.testing.assert_frame_equal(resumed, expected)
+    assert resumed.attrs == expected.attrs
@@ -0,0 +1,169 @@
+import os
+import json
+import uuid
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# WALK-FORWARD CHECKPOINTS
+# -------------------------------------------------
+#
+# <root>/<stock>/
+#   _manifest.json              fingerprint of data, windows, settings
+#   window_0007.parquet         the window's result rows
+#   window_0007.models.parquet  its candidate models (Model, Start,
+#                               Iterations, AIC, Selected, Params)
+#   window_0008.skipped         window skipped (training too short)
+#
+# Each window is written as soon as it completes (write-then-rename;
+# the results file is written last and marks the window as done), so
+# results stream to disk and a rerun after a crash only computes the
+# missing windows. A checkpoint whose fingerprint does not match the
+# current run is cleared.
+
+CHECKPOINT_FILES = (".parquet", ".skipped", ".json", ".tmp")
+
+
+class WalkforwardCheckpoint:
+    """
+    Per-window results of one stock's walk-forward on disk.
+    """
+
+    def __init__(self, root, stock, stock_df, windows, settings):
+        self.path = os.path.join(root, stock)
+        self.dtypes = stock_df.dtypes
+
+        fingerprint = self.fingerprint(stock_df, windows, settings)
+
+        os.makedirs(self.path, exist_ok=True)
+
+        manifest = os.path.join(self.path, "_manifest.json")
+        if _read_json(manifest).get("fingerprint") != fingerprint:
+            self.clear()
+            _write_atomic(
+                manifest,
+                lambda tmp: _write_json(tmp, {
+                    "stock": stock,
+                    "fingerprint": fingerprint,
+                    "windows": len(windows)
+                })
+            )
+
+    @staticmethod
+    def fingerprint(stock_df, windows, settings):
+        h = hashlib.sha256()
+
+        h.update(stock_df["log_return"].to_numpy(dtype=np.float64).tobytes())
+        h.update(pd.DatetimeIndex(stock_df["Date"]).asi8.tobytes())
+        h.update(np.asarray(windows, dtype=np.int64).tobytes())
+        h.update(repr(sorted(settings.items())).encode())
+
+        return h.hexdigest()
+
+    def _file(self, window_id, suffix):
+        return os.path.join(self.path, f"window_{window_id:04d}{suffix}")
+
+    # -----------------------------------
+    # Writing
+    # -----------------------------------
+
+    def save(self, window_id, test_df, model_log):
+        """
+        Records a finished window (test_df None: skipped).
+        """
+
+        if test_df is None:
+            _write_atomic(
+                self._file(window_id, ".skipped"),
+                lambda tmp: open(tmp, "w").close()
+            )
+            return
+
+        _write_atomic(
+            self._file(window_id, ".models.parquet"),
+            lambda tmp: model_log.to_parquet(tmp, index=False)
+        )
+        _write_atomic(
+            self._file(window_id, ".parquet"),
+            lambda tmp: test_df.to_parquet(tmp, index=False)
+        )
+
+    def clear(self):
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(CHECKPOINT_FILES):
+                os.remove(entry.path)
+
+    # -----------------------------------
+    # Reading
+    # -----------------------------------
+
+    def done(self, window_id):
+        return (
+            os.path.exists(self._file(window_id, ".parquet"))
+            or os.path.exists(self._file(window_id, ".skipped"))
+        )
+
+    def model_log(self, window_id):
+        """
+        The window's candidate models, or None if it was skipped.
+        """
+
+        path = self._file(window_id, ".models.parquet")
+        if not os.path.exists(path):
+            return None
+
+        return pd.read_parquet(path)
+
+    def results(self, window_id):
+        path = self._file(window_id, ".parquet")
+        if not os.path.exists(path):
+            return None
+
+        df = pd.read_parquet(path)
+
+        # parquet round-trips e.g. pytz offsets as plain offsets
+        shared = [c for c in df.columns if c in self.dtypes.index]
+        return df.astype(self.dtypes[shared].to_dict())
+
+    def load(self, window_ids):
+        """
+        (results, model logs) of the given windows, in that order.
+        """
+
+        all_results = []
+        refit_log = []
+
+        for window_id in window_ids:
+            df = self.results(window_id)
+            if df is None:
+                continue
+
+            all_results.append(df)
+            refit_log.append(self.model_log(window_id))
+
+        return all_results, refit_log
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
@@ -12,3 +12,36 @@ STOCK = "INFY.NS"
 MODEL_TYPE = "EGARCH"   # fixed for now (NO switching yet)
 
 TRADING_DAYS = 252
+
+# Start each window's refits from the previous window's parameters.
+# Off by default: on INFY.NS it changes SLSQP iteration counts by only
+# a few percent and can settle FIGARCH in a different local optimum.
+WARM_START = False
+
+# Candidate models fitted concurrently per window
+# (None → one process per model, capped at the CPU count; 1 = serial)
+REFIT_WORKERS = None
+
+# Seconds a candidate fit may run (from when a worker starts it)
+# when fitted concurrently
+REFIT_TIMEOUT = 120
+
+# Windows evaluated concurrently (walkforward.window_pool); windows
+# are independent only without warm starts. 1 = serial
+WINDOW_WORKERS = 1
+
+# Window layout (walkforward.rolling_windows.generate_window_offsets):
+# trading-day counts instead of TRAIN_YEARS / TEST_MONTHS when set,
+# and expanding (anchored) instead of rolling train windows
+TRAIN_DAYS = None
+TEST_DAYS = None
+EXPANDING = False
+
+# Universe-wide walk-forward (walkforward.scheduler)
+# (None → one worker process per CPU)
+UNIVERSE_WORKERS = None
+UNIVERSE_OUTPUT_DIR = "outputs/walkforward"
+
+# Write each finished window under <dir>/<STOCK>/ and skip windows
+# already there on a rerun (walkforward.checkpoint); None = off
+CHECKPOINT_DIR = None
@@ -100,13 +100,29 @@ def plot_walkforward_equity(df):
 
 
 
-if __name__ == "__main__":
+def main(returns_df=None, wf_df=None):
+    """
+    Walk-forward evaluation: metrics CSV + equity plot.
+    Either the returns or finished walk-forward results can be passed in.
+    """
     from walkforward.run_walkforward import run_walkforward
-    from scripts.preprocess import load_returns_data
+    from scripts.returns_universe import ReturnsUniverse
+    from walkforward.config import STOCK
 
-    returns_df = load_returns_data()
-    wf_df = run_walkforward(returns_df)
+    if wf_df is None:
+        if returns_df is None:
+            returns_df = ReturnsUniverse.from_returns_data(
+                tickers=[STOCK],
+                columns=["log_return"]
+            )
+        wf_df = run_walkforward(returns_df)
 
     metrics = evaluate_walkforward(wf_df)
     print(metrics)
     plot_walkforward_equity(wf_df)
+
+    return metrics
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from model_switching.registry import MODEL_SPECS
+from models.fit_cache import build_model
+from models.volatility_filter import FILTER_MODELS, VolatilityFilter
+
+# -------------------------------------------------
+# OUT-OF-SAMPLE VOLATILITY FOR A TEST WINDOW
+# -------------------------------------------------
+#
+# The model fitted on the train window is run forward over the test
+# returns with its parameters fixed: the volatility for each test day
+# uses returns up to the day before only, with no refitting.
+
+
+def forecast_test_volatility(train_series, test_returns, model_name, result):
+    """
+    One-step-ahead conditional volatility for every test day.
+
+    Parameters
+    ----------
+    train_series : array
+        Returns the model was fitted on.
+    test_returns : array
+        Returns of the days that follow; missing days count as
+        a zero residual.
+    model_name : str
+        model_switching.registry name of the fitted model.
+    result : arch result
+    """
+
+    params = result.params
+    test_returns = np.asarray(test_returns, dtype=np.float64)
+    test_returns = np.where(np.isfinite(test_returns), test_returns, params["mu"])
+
+    # -----------------------------------
+    # O(1)-per-day streaming filter
+    # -----------------------------------
+    if model_name in FILTER_MODELS:
+        vol_filter = VolatilityFilter.from_result(
+            result, model_name, train_series
+        )
+        return np.sqrt(vol_filter.update_many(test_returns))
+
+    # -----------------------------------
+    # Others (FIGARCH): one fixed-parameter arch pass
+    # -----------------------------------
+    series = np.concatenate([np.asarray(train_series), test_returns])
+    fixed = build_model(series, MODEL_SPECS[model_name]).fix(params)
+
+    return np.asarray(fixed.conditional_volatility)[len(train_series):]
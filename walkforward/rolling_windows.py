@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
@@ -30,3 +31,59 @@ def generate_rolling_windows(dates, train_years, test_months):
         train_start = train_start + relativedelta(months=test_months)
 
     return windows
+
+
+def generate_window_offsets(dates, train_years=None, test_months=None,
+                            train_days=None, test_days=None,
+                            expanding=False):
+    """
+    Generates integer (train_start, train_stop, test_start, test_stop)
+    row offsets into `dates` (sorted ascending), one row per window,
+    so train/test sets are plain slices.
+
+    - calendar windows (train_years / test_months, as in
+      generate_rolling_windows): bounds located by searchsorted
+    - trading-day windows (train_days / test_days): fixed row counts,
+      rolled forward by test_days
+    - expanding=True: every train window starts at the first row
+    """
+
+    trading_days = train_days is not None or test_days is not None
+
+    if trading_days:
+        if train_days is None or test_days is None:
+            raise ValueError(
+                "train_days and test_days must be given together"
+            )
+        if train_days < 1 or test_days < 1:
+            raise ValueError("train_days and test_days must be positive")
+
+    elif train_years is None or test_months is None:
+        raise ValueError(
+            "Give train_years and test_months (calendar windows) "
+            "or train_days and test_days (trading-day windows)"
+        )
+
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+
+    if trading_days:
+        starts = np.arange(0, len(dates) - train_days - test_days + 1, test_days)
+        offsets = np.stack([
+            starts,
+            starts + train_days,
+            starts + train_days,
+            starts + train_days + test_days
+        ], axis=1)
+
+    else:
+        windows = generate_rolling_windows(dates, train_years, test_months)
+        if not windows:
+            return np.empty((0, 4), dtype=int)
+
+        bounds = pd.DatetimeIndex([b for window in windows for b in window])
+        offsets = dates.searchsorted(bounds, side="left").reshape(-1, 4)
+
+    if expanding:
+        offsets[:, 0] = 0
+
+    return offsets
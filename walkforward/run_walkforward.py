@@ -1,3 +1,7 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
@@ -5,145 +9,404 @@ from walkforward.config import (
     STOCK,
     TRAIN_YEARS,
     TEST_MONTHS,
-    TARGET_VOL
+    TARGET_VOL,
+    WARM_START,
+    REFIT_WORKERS,
+    REFIT_TIMEOUT,
+    WINDOW_WORKERS,
+    TRAIN_DAYS,
+    TEST_DAYS,
+    EXPANDING,
+    CHECKPOINT_DIR
 )
 
-from walkforward.rolling_windows import generate_rolling_windows
+from walkforward.rolling_windows import generate_window_offsets
+from models.fit_cache import fit_cache_settings, use_fit_cache
+from walkforward.forecast import forecast_test_volatility
 
-from model_switching.refit_models import refit_all_models
+from model_switching.refit_models import (
+    MODELS,
+    refit_all_models,
+    previous_params
+)
+from model_switching import registry
 from model_switching.selector import select_best_model
+from scripts.returns_universe import ticker_frame
 
 
-def run_walkforward(returns_df):
+def run_walkforward(returns_df, warm_start=WARM_START,
+                    refit_workers=REFIT_WORKERS, refit_timeout=REFIT_TIMEOUT,
+                    window_workers=WINDOW_WORKERS, stock=STOCK,
+                    checkpoint_dir=CHECKPOINT_DIR):
     """
     TRUE Rolling Walk-Forward with:
     - re-fitting every window
     - dynamic volatility model selection
     - NO look-ahead bias
+    - out-of-sample volatility: the selected model is run forward
+      over each test window with its fitted parameters
+
+    returns_df may also be a ReturnsUniverse. Every ticker at once:
+    walkforward.scheduler.run_universe_walkforward.
+
+    warm_start=True starts each model's fit from its parameters in
+    the previous window (cold start if that fit does not converge).
+    Refit statistics end up in result.attrs["refit_stats"].
+
+    refit_workers > 1 fits each window's candidate models in
+    parallel worker processes (see refit_all_models), each
+    bounded by refit_timeout seconds.
+
+    window_workers > 1 runs whole windows in parallel instead
+    (walkforward.window_pool); needs warm_start=False. The result
+    is identical to the serial run.
+
+    checkpoint_dir: write every finished window there
+    (walkforward.checkpoint) instead of keeping it in memory; a
+    rerun skips windows already on disk.
+    """
+
+    stock_df, windows = stock_windows(returns_df, stock)
+    slices = window_slices(windows)
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        from walkforward.checkpoint import WalkforwardCheckpoint
+
+        checkpoint = WalkforwardCheckpoint(
+            checkpoint_dir, stock, stock_df, windows,
+            settings={
+                "warm_start": warm_start,
+                "target_vol": TARGET_VOL,
+                "models": MODELS,
+                "backend": registry.FIT_BACKEND
+            }
+        )
+
+    if window_workers is not None and window_workers > 1:
+        if warm_start:
+            raise ValueError(
+                "Window-parallel walk-forward needs warm_start=False "
+                "(warm starts chain each window to the previous one)"
+            )
+
+        from walkforward.window_pool import run_windows_parallel
+
+        all_results, refit_log = run_windows_parallel(
+            stock_df, slices, window_workers, checkpoint
+        )
+
+    else:
+        all_results, refit_log = _run_windows_serial(
+            stock_df, slices, warm_start, refit_workers, refit_timeout,
+            checkpoint
+        )
+
+    # -----------------------------------
+    # Combine all windows
+    # -----------------------------------
+    if len(all_results) == 0:
+        raise ValueError("No valid walk-forward windows generated")
+
+    results = pd.concat(all_results, ignore_index=True)
+    results.attrs["refit_stats"] = refit_summary(refit_log)
+
+    return results
+
+
+def stock_windows(returns_df, stock):
+    """
+    (stock_df sorted by date, window row offsets) for one ticker.
     """
 
     # -----------------------------------
     # Filter single stock
     # -----------------------------------
-    stock_df = returns_df[
-        returns_df["Ticker"] == STOCK
-    ].copy()
+    stock_df = ticker_frame(returns_df, stock).copy()
 
     stock_df["Date"] = pd.to_datetime(stock_df["Date"])
 
+    if not stock_df["Date"].is_monotonic_increasing:
+        stock_df = stock_df.sort_values("Date", kind="stable")
+
     # -----------------------------------
     # Generate rolling windows
+    # (row offsets: train/test are slices)
     # -----------------------------------
-    windows = generate_rolling_windows(
+    windows = generate_window_offsets(
         dates=stock_df["Date"],
         train_years=TRAIN_YEARS,
-        test_months=TEST_MONTHS
+        test_months=TEST_MONTHS,
+        train_days=TRAIN_DAYS,
+        test_days=TEST_DAYS,
+        expanding=EXPANDING
     )
 
+    return stock_df, windows
+
+
+def window_slices(windows):
+    """
+    (window_id, train row slice, test row slice) for every window
+    offset row passing the size guards, in window order.
+    """
+
+    slices = []
+
+    for window_id, (tr_start, tr_stop, te_start, te_stop) in enumerate(windows):
+
+        # Safety guards
+        if tr_stop - tr_start < 500 or te_stop - te_start < 20:
+            continue
+
+        slices.append((
+            window_id,
+            slice(int(tr_start), int(tr_stop)),
+            slice(int(te_start), int(te_stop))
+        ))
+
+    return slices
+
+
+def _run_windows_serial(stock_df, slices, warm_start, refit_workers,
+                        refit_timeout, checkpoint=None):
+
     all_results = []
+    refit_log = []
+    warm_params = {}
 
     # -----------------------------------
     # Walk-forward loop
     # -----------------------------------
-    for window_id, (tr_start, tr_end, te_start, te_end) in enumerate(windows):
-
-        # -------------------------------
-        # Train / Test split
-        # -------------------------------
-        train_df = stock_df[
-            (stock_df["Date"] >= tr_start) &
-            (stock_df["Date"] < tr_end)
-        ]
+    executor = _refit_executor(refit_workers)
+
+    try:
+        for window_id, train_pos, test_pos in slices:
+
+            # -------------------------------
+            # Finished in an earlier run
+            # -------------------------------
+            if checkpoint is not None and checkpoint.done(window_id):
+                log = checkpoint.model_log(window_id)
+                if log is not None:
+                    warm_params = logged_params(log)
+                continue
+
+            # -------------------------------
+            # Train / Test split
+            # -------------------------------
+            train_df = stock_df.iloc[train_pos]
+            test_df = stock_df.iloc[test_pos]
+
+            test_df, model_df = evaluate_window(
+                window_id,
+                train_df["log_return"].values,
+                test_df,
+                starting_values=warm_params if warm_start else None,
+                executor=executor,
+                timeout=refit_timeout
+            )
+
+            if model_df is None:
+                if checkpoint is not None:
+                    checkpoint.save(window_id, None, None)
+                continue
+
+            warm_params = previous_params(model_df)
+
+            if checkpoint is not None:
+                checkpoint.save(window_id, test_df, model_log(model_df))
+            else:
+                refit_log.append(model_log(model_df))
+                all_results.append(test_df)
+
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if checkpoint is not None:
+        return checkpoint.load(window_id for window_id, _, _ in slices)
+
+    return all_results, refit_log
 
-        test_df = stock_df[
-            (stock_df["Date"] >= te_start) &
-            (stock_df["Date"] < te_end)
+
+def evaluate_window(window_id, train_returns, test_df, starting_values=None,
+                    executor=None, timeout=None):
+    """
+    Refits on one train window and trades its test window.
+
+    test_df needs a log_return column. Returns (test_df with the
+    strategy columns added, model_df), or (None, None) when the
+    cleaned training series is too short.
+    """
+
+    # -------------------------------
+    # CLEAN TRAINING SERIES
+    # -------------------------------
+    train_series = (
+        pd.Series(train_returns)
+        .replace([np.inf, -np.inf], np.nan)
+        .dropna()
+        .values
+    )
+
+    if len(train_series) < 300:
+        return None, None
+
+    # ==================================================
+    # STEP–3: REFIT ALL MODELS ON TRAIN WINDOW
+    # ==================================================
+    model_df = refit_all_models(
+        train_series,
+        starting_values=starting_values,
+        executor=executor,
+        timeout=timeout
+    )
+
+    best_model_name, best_model_result = select_best_model(model_df)
+    model_df["Selected"] = model_df["Model"] == best_model_name
+
+    # only the selected model's volatility is needed from here on
+    for summary in model_df["Result"].dropna():
+        if summary is not best_model_result:
+            summary.drop_volatility()
+
+    # -------------------------------
+    # Out-of-sample volatility
+    # (fitted model run over the test returns)
+    # -------------------------------
+    vol_series = forecast_test_volatility(
+        train_series,
+        test_df["log_return"].values,
+        best_model_name,
+        best_model_result
+    )
+
+    test_df = test_df.copy()
+    test_df["Forecasted_Volatility"] = vol_series
+    test_df["Selected_Model"] = best_model_name
+
+    # -------------------------------
+    # Position sizing (STEP–2 )
+    # -------------------------------
+    test_df["Position_Size"] = (
+        TARGET_VOL / test_df["Forecasted_Volatility"]
+    ).clip(0.1, 2.0)
+
+    # -------------------------------
+    # Trading signal (simple momentum)
+    # -------------------------------
+    test_df["Signal"] = np.where(
+        test_df["log_return"].shift(1) > 0, 1, 0
+    )
+
+    # -------------------------------
+    # Final safety cleaning
+    # -------------------------------
+    test_df = test_df.replace([np.inf, -np.inf], np.nan)
+    test_df = test_df.dropna(
+        subset=[
+            "log_return",
+            "Forecasted_Volatility",
+            "Position_Size",
+            "Signal"
         ]
+    )
 
-        # Safety guards
-        if len(train_df) < 500 or len(test_df) < 20:
-            continue
+    # -------------------------------
+    # Strategy return
+    # -------------------------------
+    test_df["Strategy_Return"] = (
+        test_df["Signal"]
+        * test_df["Position_Size"]
+        * test_df["log_return"]
+    )
 
-        # -------------------------------
-        # CLEAN TRAINING SERIES
-        # -------------------------------
-        train_series = (
-            train_df["log_return"]
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .values
-        )
+    test_df["Window_ID"] = window_id
 
-        if len(train_series) < 300:
-            continue
+    return test_df, model_df
 
-        # ==================================================
-        # STEP–3: REFIT ALL MODELS ON TRAIN WINDOW
-        # ==================================================
-        model_df = refit_all_models(train_series)
 
-        best_model_name, best_model_result = select_best_model(model_df)
+def model_log(model_df):
+    """
+    What is kept of a window's candidate fits: Model, Start,
+    Iterations, AIC, Selected and the fitted Params (None if the
+    fit failed).
+    """
 
-        # -------------------------------
-        # Extract conditional volatility
-        # -------------------------------
-        vol_series = (
-            pd.Series(best_model_result.conditional_volatility)
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-        )
+    log = model_df[["Model", "Start", "Iterations", "AIC", "Selected"]].copy()
+    log["Params"] = [
+        None if summary is None else summary.param_values.tolist()
+        for summary in model_df["Result"]
+    ]
 
-        # Align volatility with test window
-        vol_series = vol_series.iloc[-len(test_df):].values
-
-        test_df = test_df.copy()
-        test_df["Forecasted_Volatility"] = vol_series
-        test_df["Selected_Model"] = best_model_name
-
-        # -------------------------------
-        # Position sizing (STEP–2 )
-        # -------------------------------
-        test_df["Position_Size"] = (
-            TARGET_VOL / test_df["Forecasted_Volatility"]
-        ).clip(0.1, 2.0)
-
-        # -------------------------------
-        # Trading signal (simple momentum)
-        # -------------------------------
-        test_df["Signal"] = np.where(
-            test_df["log_return"].shift(1) > 0, 1, 0
-        )
+    return log
 
-        # -------------------------------
-        # Final safety cleaning
-        # -------------------------------
-        test_df = test_df.replace([np.inf, -np.inf], np.nan)
-        test_df = test_df.dropna(
-            subset=[
-                "log_return",
-                "Forecasted_Volatility",
-                "Position_Size",
-                "Signal"
-            ]
-        )
 
-        # -------------------------------
-        # Strategy return
-        # -------------------------------
-        test_df["Strategy_Return"] = (
-            test_df["Signal"]
-            * test_df["Position_Size"]
-            * test_df["log_return"]
-        )
+def logged_params(log):
+    """
+    previous_params from a model_log (e.g. read from a checkpoint).
+    """
 
-        test_df["Window_ID"] = window_id
+    return {
+        model: np.asarray(params)
+        for model, params in zip(log["Model"], log["Params"])
+        if params is not None
+    }
 
-        all_results.append(test_df)
 
-    # -----------------------------------
-    # Combine all windows
-    # -----------------------------------
-    if len(all_results) == 0:
-        raise ValueError("No valid walk-forward windows generated")
+def _refit_executor(refit_workers):
+    """
+    Process pool for concurrent candidate fits (None when serial).
+    """
+
+    if refit_workers is None:
+        refit_workers = min(len(MODELS), os.cpu_count() or 1)
+
+    if refit_workers <= 1:
+        return None
+
+    # spawn, not fork: run_walkforward may be called from a pipeline
+    # thread, and forking a multi-threaded process is unsafe
+    return ProcessPoolExecutor(
+        max_workers=refit_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=use_fit_cache,
+        initargs=(fit_cache_settings(),)
+    )
+
+
+def refit_summary(refit_log):
+    """
+    Optimiser iterations of warm vs cold refits.
+
+    Iterations saved are estimated per model as
+    (mean cold iterations - warm iterations) summed over warm fits.
+    """
+
+    log = pd.concat(refit_log, ignore_index=True)
+
+    warm = log[log["Start"] == "warm"]
+    cold = log[log["Start"] != "warm"]
+
+    cold_mean = cold.groupby("Model")["Iterations"].mean()
+    saved = (
+        warm["Model"].map(cold_mean) - warm["Iterations"]
+    ).sum()
+
+    stats = {
+        "fits": len(log),
+        "warm_fits": len(warm),
+        "cold_fallbacks": int((log["Start"] == "cold_fallback").sum()),
+        "iterations": int(log["Iterations"].sum()),
+        "iterations_saved": float(saved)
+    }
+
+    if stats["warm_fits"]:
+        print(
+            f" Warm-started refits: {stats['warm_fits']}/{stats['fits']} "
+            f"({stats['cold_fallbacks']} cold fallbacks), "
+            f"~{stats['iterations_saved']:.0f} optimiser iterations saved"
+        )
 
-    return pd.concat(all_results, ignore_index=True)
+    return stats
@@ -0,0 +1,230 @@
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from walkforward.config import UNIVERSE_WORKERS, UNIVERSE_OUTPUT_DIR
+from walkforward.run_walkforward import stock_windows, window_slices
+from walkforward.window_pool import run_window_jobs, attach_columns
+
+# -------------------------------------------------
+# UNIVERSE-WIDE WALK-FORWARD
+# -------------------------------------------------
+#
+# Every ticker's windows become (ticker, window) jobs for one process
+# pool (walkforward.window_pool, all tickers' returns in one shared
+# block). Tickers are submitted longest-first: by their run time in
+# the previous run's timings file if there is one (FIGARCH-heavy
+# names), else by total training rows. As soon as all windows of a
+# ticker are done its results are written to <output_dir>/<ticker>.csv.
+
+TIMINGS_FILE = "_timings.csv"
+
+
+def _previous_timings(output_dir):
+    path = os.path.join(output_dir, TIMINGS_FILE)
+
+    if not os.path.exists(path):
+        return {}
+
+    timings = pd.read_csv(path)
+    return dict(zip(timings["Ticker"], timings["Seconds"]))
+
+
+def _estimated_cost(slices, seconds=None):
+    if seconds is not None and np.isfinite(seconds):
+        return seconds
+
+    # fit time grows ~linearly with the training window
+    return sum(train.stop - train.start for _, train, _ in slices) * 1e-4
+
+
+def ticker_output_path(output_dir, ticker):
+    return os.path.join(output_dir, f"{ticker}.csv")
+
+
+def run_universe_walkforward(returns_data, tickers=None,
+                             max_workers=UNIVERSE_WORKERS,
+                             output_dir=UNIVERSE_OUTPUT_DIR, progress=True):
+    """
+    Walk-forward (as run_walkforward, without warm starts) for
+    every ticker.
+
+    Parameters
+    ----------
+    returns_data : ReturnsUniverse or long returns DataFrame
+    tickers : list of str, optional
+        Default: every ticker in returns_data.
+    max_workers : int, optional
+        Worker processes (default: CPU count). 1 runs in-process.
+    output_dir : str
+        Per-ticker results are written here as they complete.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per ticker: Windows, Rows, Seconds (worker time),
+        Path. attrs hold elapsed seconds and windows_per_sec.
+    """
+
+    if tickers is None:
+        tickers = (
+            returns_data.tickers if hasattr(returns_data, "tickers")
+            else sorted(returns_data["Ticker"].unique())
+        )
+
+    max_workers = max_workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    timings = _previous_timings(output_dir)
+
+    # -----------------------------------
+    # Jobs over one concatenated returns array
+    # -----------------------------------
+    frames = {}
+    slices = {}
+    returns = []
+    base = 0
+
+    for ticker in tickers:
+        stock_df, windows = stock_windows(returns_data, ticker)
+
+        frames[ticker] = (stock_df, base)
+        slices[ticker] = [
+            (window_id, slice(base + tr.start, base + tr.stop),
+             slice(base + te.start, base + te.stop))
+            for window_id, tr, te in window_slices(windows)
+        ]
+
+        returns.append(stock_df["log_return"].to_numpy(dtype=np.float64))
+        base += len(stock_df)
+
+    order = sorted(
+        tickers,
+        key=lambda t: _estimated_cost(slices[t], timings.get(t)),
+        reverse=True
+    )
+
+    jobs = [
+        ((ticker, window_id), window_id, train, test)
+        for ticker in order
+        for window_id, train, test in slices[ticker]
+    ]
+
+    # -----------------------------------
+    # Run; write each ticker once complete
+    # -----------------------------------
+    pending = {ticker: len(slices[ticker]) for ticker in tickers}
+    done = {ticker: [] for ticker in tickers}
+    summary = {
+        ticker: {"Ticker": ticker, "Windows": 0, "Rows": 0,
+                 "Seconds": 0.0, "Path": None}
+        for ticker in tickers
+    }
+
+    start = time.perf_counter()
+
+    bar = tqdm(total=len(jobs), unit="window", disable=not progress)
+
+    for (ticker, window_id), added, log, seconds in run_window_jobs(
+        np.concatenate(returns) if returns else np.empty(0),
+        jobs,
+        max_workers
+    ):
+        done[ticker].append((window_id, added, log))
+        summary[ticker]["Seconds"] += seconds
+        pending[ticker] -= 1
+
+        bar.update()
+        bar.set_postfix(
+            windows_per_sec=f"{bar.n / (time.perf_counter() - start):.2f}"
+        )
+
+        if pending[ticker] == 0:
+            summary[ticker].update(_write_ticker(
+                ticker, frames[ticker], done.pop(ticker), output_dir
+            ))
+
+    bar.close()
+
+    elapsed = time.perf_counter() - start
+
+    summary_df = pd.DataFrame([summary[ticker] for ticker in tickers])
+    summary_df.attrs["elapsed"] = elapsed
+    summary_df.attrs["windows_per_sec"] = len(jobs) / elapsed if elapsed else np.nan
+
+    # timings for the next run's longest-first ordering
+    summary_df[["Ticker", "Windows", "Seconds"]].to_csv(
+        os.path.join(output_dir, TIMINGS_FILE), index=False
+    )
+
+    print(
+        f"\n Walk-forward: {len(jobs)} windows, {len(tickers)} tickers "
+        f"in {elapsed:.1f}s ({summary_df.attrs['windows_per_sec']:.2f} "
+        f"windows/sec, {max_workers} workers)"
+    )
+
+    return summary_df
+
+
+def _write_ticker(ticker, frame, done, output_dir):
+    """
+    Reassembles one ticker's windows in window order and writes them.
+    """
+
+    stock_df, base = frame
+
+    all_results = [
+        attach_columns(stock_df, added, offset=base)
+        for _, added, _ in sorted(done, key=lambda job: job[0])
+        if added is not None
+    ]
+
+    if not all_results:
+        return {}
+
+    results = pd.concat(all_results, ignore_index=True)
+    path = ticker_output_path(output_dir, ticker)
+    results.to_csv(path, index=False)
+
+    return {
+        "Windows": len(all_results),
+        "Rows": len(results),
+        "Path": path
+    }
+
+
+def main(tickers=None, max_workers=UNIVERSE_WORKERS):
+    from scripts.returns_universe import ReturnsUniverse
+
+    universe = ReturnsUniverse.from_returns_data(
+        tickers=tickers,
+        columns=["log_return"]
+    )
+
+    summary = run_universe_walkforward(universe, max_workers=max_workers)
+    print(summary.to_string(index=False))
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--tickers",
+        nargs="+",
+        default=None,
+        help="Stocks to run (default: all)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=UNIVERSE_WORKERS,
+        help="Worker processes (default: CPU count)"
+    )
+    args = parser.parse_args()
+
+    main(tickers=args.tickers, max_workers=args.workers)
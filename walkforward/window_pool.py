@@ -0,0 +1,202 @@
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# WINDOW-PARALLEL WALK-FORWARD
+# -------------------------------------------------
+#
+# Without warm starts every window is independent, so whole windows
+# run as (key, window_id, train slice, test slice) jobs on a process
+# pool. The log returns (one stock, or several stocks back to back)
+# are copied once into a shared-memory block that every worker maps
+# read-only; jobs only carry row offsets into it.
+#
+# Workers return the columns they add to the test window; the parent
+# reattaches them to its own rows (attach_columns) and reassembles
+# windows in window order, so the result is the serial run's.
+
+# Set in each worker by _attach (which also points the worker at
+# the parent's fit cache)
+_SHARED = {}
+
+
+def _attach(name, length, cache_settings):
+    from models.fit_cache import use_fit_cache
+
+    use_fit_cache(cache_settings)
+
+    block = shared_memory.SharedMemory(name=name)
+
+    _SHARED["block"] = block
+    _SHARED["returns"] = np.ndarray(
+        (length,), dtype=np.float64, buffer=block.buf
+    )
+
+
+def _window_job(key, window_id, train_rows, test_rows):
+    """
+    Worker: refit on one train window, trade its test window.
+
+    Returns (key, added columns indexed by row offset, refit log,
+    seconds), with added / refit log None for a skipped window.
+    """
+    from walkforward.run_walkforward import evaluate_window, model_log
+
+    start = time.perf_counter()
+    returns = _SHARED["returns"]
+
+    test_df = pd.DataFrame(
+        {"log_return": returns[test_rows]},
+        index=np.arange(test_rows.start, test_rows.stop)
+    )
+
+    test_df, model_df = evaluate_window(
+        window_id,
+        returns[train_rows],
+        test_df
+    )
+
+    seconds = time.perf_counter() - start
+
+    if model_df is None:
+        return key, None, None, seconds
+
+    return (
+        key,
+        test_df.drop(columns="log_return"),
+        model_log(model_df),
+        seconds
+    )
+
+
+def run_window_jobs(returns, jobs, max_workers):
+    """
+    Runs (key, window_id, train slice, test slice) jobs over
+    `returns`; yields (key, added, refit log, seconds) as they
+    finish.
+
+    Jobs are submitted in the given order. max_workers=1 runs
+    them in-process.
+    """
+
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+
+    if max_workers == 1:
+        _SHARED["returns"] = returns
+        try:
+            for job in jobs:
+                yield _window_job(*job)
+        finally:
+            _SHARED.clear()
+        return
+
+    from models.fit_cache import fit_cache_settings
+
+    block = shared_memory.SharedMemory(
+        create=True, size=max(returns.nbytes, 1)
+    )
+
+    try:
+        np.ndarray(returns.shape, dtype=np.float64, buffer=block.buf)[:] = returns
+
+        # spawn, as for refit workers: callers may be multi-threaded
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach,
+            initargs=(block.name, len(returns), fit_cache_settings())
+        ) as pool:
+            futures = [pool.submit(_window_job, *job) for job in jobs]
+
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    finally:
+        block.close()
+        block.unlink()
+
+
+def attach_columns(stock_df, added, offset=0):
+    """
+    Test-window rows of stock_df with a worker's added columns
+    (added is indexed by row offset + `offset`).
+    """
+
+    test_df = (
+        stock_df.iloc[added.index - offset]
+        .replace([np.inf, -np.inf], np.nan)
+    )
+
+    for column in added.columns:
+        test_df[column] = added[column].values
+
+    return test_df
+
+
+def run_windows_parallel(stock_df, slices, max_workers, checkpoint=None):
+    """
+    Evaluates one stock's walk-forward windows on max_workers
+    processes.
+
+    Parameters
+    ----------
+    stock_df : pd.DataFrame
+        One stock's rows (Date, log_return, ...).
+    slices : list
+        (window_id, train slice, test slice), as from
+        walkforward.run_walkforward.window_slices.
+    checkpoint : walkforward.checkpoint.WalkforwardCheckpoint, optional
+        Windows already in it are skipped, new ones are written to
+        it as they finish (and read back at the end).
+
+    Returns
+    -------
+    (list of test-window DataFrames, list of refit logs), both in
+    window order.
+    """
+
+    # key = window_id
+    jobs = [(window_id, window_id, train, test)
+            for window_id, train, test in slices
+            if checkpoint is None or not checkpoint.done(window_id)]
+
+    done = []
+
+    for window_id, added, log, seconds in run_window_jobs(
+        stock_df["log_return"].to_numpy(dtype=np.float64),
+        jobs,
+        max_workers
+    ):
+        if checkpoint is None:
+            done.append((window_id, added, log, seconds))
+        elif added is None:
+            checkpoint.save(window_id, None, None)
+        else:
+            checkpoint.save(window_id, attach_columns(stock_df, added), log)
+
+    if checkpoint is not None:
+        return checkpoint.load(window_id for window_id, _, _ in slices)
+
+    # -----------------------------------
+    # Reassemble in window order
+    # -----------------------------------
+    all_results = []
+    refit_log = []
+
+    for window_id, added, log, _ in sorted(done, key=lambda job: job[0]):
+        if added is None:
+            continue
+
+        all_results.append(attach_columns(stock_df, added))
+        refit_log.append(log)
+
+    return all_results, refit_log